@@ -0,0 +1,7 @@
+"""
+Benchmarks of coloredstrings.
+
+`python -m benchmarks` (or `make bench`) runs the whole suite and compares it with
+the baseline stored by `make bench-baseline`. Every `bench_*` module can also be run
+on its own, e.g. `python -m benchmarks.bench_minify`.
+"""
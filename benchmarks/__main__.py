@@ -0,0 +1,128 @@
+"""
+Runs the benchmark suite and compares it with a stored baseline.
+
+    python -m benchmarks                  # run and compare with the baseline, if any
+    python -m benchmarks --save           # run and store the results as the baseline
+    python -m benchmarks -k render        # only workloads whose name contains "render"
+
+Exits with status 1 when a workload got slower than the baseline by more than
+the threshold (25% by default).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import platform
+import sys
+import typing
+
+from .suite import BENCHMARKS
+
+DEFAULT_BASELINE = pathlib.Path(__file__).with_name("baseline.json")
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def run(names: typing.Iterable[str]) -> typing.Dict[str, float]:
+    results = {}
+    for name in names:
+        results[name] = BENCHMARKS[name]()
+        print(f"{name:<40} {_format_time(results[name]):>12}", flush=True)
+    return results
+
+
+def compare(
+    results: typing.Mapping[str, float],
+    baseline: typing.Mapping[str, float],
+    threshold: float,
+) -> typing.List[str]:
+    """Prints the change of every workload, returning names of the regressed ones."""
+    regressions = []
+    print(f"\n{'workload':<40} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, seconds in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        change = seconds / before - 1
+        mark = ""
+        if change > threshold:
+            regressions.append(name)
+            mark = "  <- regression"
+        print(
+            f"{name:<40} {_format_time(before):>12} {_format_time(seconds):>12} "
+            f"{change:>+8.1%}{mark}"
+        )
+    return regressions
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "-k",
+        dest="pattern",
+        default="",
+        help="run only workloads whose name contains this text",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=pathlib.Path,
+        default=DEFAULT_BASELINE,
+        help=f"baseline file (default: {DEFAULT_BASELINE.name} next to the suite)",
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="store the results as the new baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="largest accepted slowdown, as a fraction (default: 0.25)",
+    )
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if args.pattern in name]
+    print(f"Python {platform.python_version()} ({platform.python_implementation()})")
+    results = run(names)
+
+    if args.save:
+        baseline = {}
+        if args.baseline.exists() and args.pattern:
+            # Keep results of the workloads which were not run
+            baseline = json.loads(args.baseline.read_text())["results"]
+        baseline.update(results)
+        args.baseline.write_text(
+            json.dumps(
+                {"python": platform.python_version(), "results": baseline}, indent=2
+            )
+            + "\n"
+        )
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; store one with --save")
+        return 0
+
+    stored = json.loads(args.baseline.read_text())
+    if stored.get("python") != platform.python_version():
+        print(
+            f"\nWarning: the baseline was recorded with Python {stored.get('python')}"
+        )
+    regressions = compare(results, stored["results"], args.threshold)
+    if regressions:
+        print(
+            f"\n{len(regressions)} workload(s) slower than the baseline by more than {args.threshold:.0%}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Compares rendering a line of code highlighted by ranges with `annotate` and by
+slicing the line and calling a builder per range.
+
+Run with `python -m benchmarks.bench_annotate`.
+"""
+
+from __future__ import annotations
+
+import re
+import timeit
+import typing
+
+from coloredstrings import ColorMode, StyleBuilder
+from coloredstrings.annotation import Range, annotate
+
+style = StyleBuilder(mode=ColorMode.TRUE_COLOR)
+STYLES = {
+    "keyword": style.rgb(198, 120, 221).bold,
+    "name": style.rgb(97, 175, 239),
+    "number": style.rgb(209, 154, 102),
+    "punctuation": style.rgb(171, 178, 191),
+}
+
+LINE = (
+    "    result = compute(values[index] + 42, scale=1.5, offset=-3) if ready else None"
+)
+
+
+def ranges(line: str) -> typing.List[Range]:
+    """Ranges a simple tokenizer would produce for `line`, without overlaps."""
+    found = []
+    for m in re.finditer(r"(if|else|None)\b|(\w+)|([\d.]+)|([^\w\s]+)", line):
+        kind = ("keyword", "name", "number", "punctuation")[m.lastindex - 1]  # type: ignore[operator]
+        found.append((m.start(), m.end(), STYLES[kind]))
+    return found
+
+
+def sliced(line: str, spans: typing.List[Range]) -> str:
+    parts = []
+    pos = 0
+    for start, end, builder in spans:
+        parts.append(line[pos:start])
+        parts.append(builder(line[start:end]))
+        pos = end
+    parts.append(line[pos:])
+    return "".join(parts)
+
+
+def main() -> None:
+    spans = ranges(LINE)
+    # A background over the whole line, below the tokens
+    layered = [(0, len(LINE), style.on.rgb(40, 44, 52)), *spans]
+    cases = {
+        "slice and call builders": lambda: sliced(LINE, spans),
+        "annotate": lambda: annotate(LINE, spans, ColorMode.TRUE_COLOR),
+        "annotate with background": lambda: annotate(
+            LINE, layered, ColorMode.TRUE_COLOR
+        ),
+    }
+    print(f"{len(spans)} ranges on a {len(LINE)} characters line")
+    print(f"{'method':<26} {'us/line':>8} {'bytes':>6}")
+    for name, render in cases.items():
+        timer = timeit.Timer(render)
+        number, _ = timer.autorange()
+        best = min(timer.repeat(5, number)) / number
+        print(f"{name:<26} {best * 1e6:>8.1f} {len(render()):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Compares coloring a column of numbers with a `Colormap` and with a builder
+created per value.
+
+Run with `python -m benchmarks.bench_colormap`.
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+
+from coloredstrings import ColorMode, StyleBuilder
+from coloredstrings.colormap import Colormap
+
+rng = random.Random(0)
+VALUES = [rng.random() * 1000 for _ in range(10_000)]
+
+gradient = Colormap.gradient(["green", "yellow", "red"], 0, 1000)
+style = StyleBuilder()
+
+
+def per_value(mode: ColorMode) -> list:
+    out = []
+    for value in VALUES:
+        t = value / 1000
+        builder = style.rgb(round(255 * t), round(255 * (1 - t)), 0)
+        out.append(builder(f"{value:8.1f}", mode=mode))
+    return out
+
+
+def main() -> None:
+    print(f"{len(VALUES)} values")
+    print(f"{'mode':<14} {'colormap (ms)':>14} {'per value (ms)':>15}")
+    for mode in ColorMode:
+        times = []
+        for render in (
+            lambda: gradient.render(VALUES, "{:8.1f}", mode=mode),
+            lambda: per_value(mode),
+        ):
+            timer = timeit.Timer(render)
+            number, _ = timer.autorange()
+            times.append(min(timer.repeat(3, number)) / number * 1e3)
+        print(f"{mode.name:<14} {times[0]:>14.2f} {times[1]:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
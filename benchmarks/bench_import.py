@@ -0,0 +1,65 @@
+"""
+Reports the cost of `import coloredstrings` as measured by `python -X importtime`,
+the modules it loads, and the time until the first styled text is rendered.
+
+Run with `python -m benchmarks.bench_import`.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import typing
+
+RUNS = 10
+
+FIRST_RENDER = (
+    "import time; start = time.perf_counter(); import coloredstrings; "
+    "coloredstrings.red('text'); print(time.perf_counter() - start)"
+)
+
+
+def import_times() -> typing.Dict[str, typing.Tuple[int, int]]:
+    """Returns the best `(self, cumulative)` import time of every module, in microseconds."""
+    best: typing.Dict[str, typing.Tuple[int, int]] = {}
+    for _ in range(RUNS):
+        stderr = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import coloredstrings"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stderr
+        for line in stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            self_us, cumulative_us, module = line[len("import time:") :].split("|")
+            if not self_us.strip().isdigit():
+                # The header line
+                continue
+            name = module.strip()
+            times = (int(self_us), int(cumulative_us))
+            best[name] = min(best.get(name, times), times, key=lambda t: t[1])
+    return best
+
+
+def first_render() -> float:
+    return min(
+        float(subprocess.check_output([sys.executable, "-c", FIRST_RENDER]))
+        for _ in range(RUNS)
+    )
+
+
+def main() -> None:
+    times = import_times()
+    own = {name: t for name, t in times.items() if name.startswith("coloredstrings")}
+    print(f"import coloredstrings: {times['coloredstrings'][1] / 1000:.1f} ms")
+    print(f"import and first render: {first_render() * 1000:.1f} ms")
+    print(f"\n{'module':<32} {'self, ms':>9} {'cumulative, ms':>15}")
+    for name, (self_us, cumulative_us) in sorted(
+        own.items(), key=lambda item: -item[1][1]
+    ):
+        print(f"{name:<32} {self_us / 1000:>9.2f} {cumulative_us / 1000:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Compares highlighting thousands of literal keywords with `KeywordHighlighter`
+and with a regular expression alternation of the same keywords.
+
+Run with `python -m benchmarks.bench_keywords`.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import time
+import typing
+
+from coloredstrings import ColorMode
+from coloredstrings.highlight import KeywordHighlighter
+
+# One line out of ten mentions a keyword
+LINES = 20_000
+
+
+def keywords(count: int) -> typing.Dict[str, str]:
+    rng = random.Random(count)
+    hosts = {f"host-{i:05d}.example.com": "cyan" for i in range(count // 2)}
+    users = {f"user{rng.randrange(10**6)}": "bold yellow" for _ in range(count // 2)}
+    return {**hosts, **users}
+
+
+def log(terms: typing.Sequence[str]) -> str:
+    rng = random.Random(0)
+    return "".join(
+        f"2025-01-01 12:00:00 login of {rng.choice(terms)} accepted\n"
+        if i % 10 == 0
+        else "2025-01-01 12:00:00 worker started, waiting for requests\n"
+        for i in range(LINES)
+    )
+
+
+def main() -> None:
+    print(f"{'keywords':>8} {'method':<12} {'build (ms)':>10} {'MB/s':>8}")
+    for count in (100, 1_000, 10_000):
+        terms = keywords(count)
+        text = log(list(terms))
+
+        start = time.perf_counter()
+        highlighter = KeywordHighlighter(terms, mode=ColorMode.TRUE_COLOR)
+        built = time.perf_counter()
+        highlighter.highlight(text)
+        done = time.perf_counter()
+        print(
+            f"{count:>8} {'automaton':<12} {(built - start) * 1e3:>10.1f} "
+            f"{len(text) / (done - built) / 1e6:>8.1f}"
+        )
+
+        start = time.perf_counter()
+        pattern = re.compile(
+            "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+        )
+        built = time.perf_counter()
+        pattern.sub(lambda m: f"\x1b[36m{m.group()}\x1b[39m", text)
+        done = time.perf_counter()
+        print(
+            f"{count:>8} {'regex':<12} {(built - start) * 1e3:>10.1f} "
+            f"{len(text) / (done - built) / 1e6:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Reports how many log records per second `ColoredFormatter` formats, with colors
+enabled and disabled, next to the plain `logging.Formatter` and to a formatter
+styling the level name on every record.
+
+Run with `python -m benchmarks.bench_logging`.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+import typing
+
+from coloredstrings import ColorMode, StyleBuilder
+from coloredstrings.log_formatter import ColoredFormatter
+
+FMT = "%(asctime)s %(levelname)-8s %(name)s: %(message)s"
+RECORDS = 100_000
+
+style = StyleBuilder(mode=ColorMode.TRUE_COLOR)
+
+
+class PerRecordFormatter(logging.Formatter):
+    """The usual hand-written formatter: styles `levelname` on every call."""
+
+    LEVELS = {
+        logging.DEBUG: style.dim,
+        logging.INFO: style.green,
+        logging.WARNING: style.yellow,
+        logging.ERROR: style.red,
+    }
+
+    def format(self, record: logging.LogRecord) -> str:
+        record.levelname = self.LEVELS[record.levelno](record.levelname)
+        return super().format(record)
+
+
+def records(n: int) -> typing.List[logging.LogRecord]:
+    levels = [logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR]
+    return [
+        logging.LogRecord(
+            f"worker-{i % 8}", levels[i % 4], __file__, i, "request %d done", (i,), None
+        )
+        for i in range(n)
+    ]
+
+
+FORMATTERS: typing.Dict[str, typing.Callable[[], logging.Formatter]] = {
+    "logging.Formatter": lambda: logging.Formatter(FMT),
+    "per-record styling": lambda: PerRecordFormatter(FMT),
+    "colored, TRUE_COLOR": lambda: ColoredFormatter(
+        FMT,
+        mode=ColorMode.TRUE_COLOR,
+        field_styles={"asctime": style.dim, "name": style.cyan},
+    ),
+    "colored, NO_COLOR": lambda: ColoredFormatter(FMT, mode=ColorMode.NO_COLOR),
+}
+
+
+def main() -> None:
+    print(f"{'formatter':<22} {'records/s':>12}")
+    for name, factory in FORMATTERS.items():
+        formatter = factory()
+        # Fresh records: formatters cache `message`/`asctime` on them
+        batch = records(RECORDS)
+        start = time.perf_counter()
+        for record in batch:
+            formatter.format(record)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22} {RECORDS / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
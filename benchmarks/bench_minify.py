@@ -0,0 +1,82 @@
+"""
+Reports how many bytes the SGR minifier saves on typical styled logs, and how fast it is.
+
+Run with `python -m benchmarks.bench_minify`.
+"""
+
+from __future__ import annotations
+
+import time
+import typing
+
+from coloredstrings import ColorMode, StyleBuilder
+from coloredstrings.minify import minify
+
+style = StyleBuilder(mode=ColorMode.TRUE_COLOR)
+
+LEVELS = [
+    ("INFO", style.blue.bold),
+    ("WARNING", style.yellow.bold),
+    ("ERROR", style.red.bold.underline),
+]
+
+
+def log_lines(n: int) -> str:
+    lines = []
+    for i in range(n):
+        label, level_style = LEVELS[i % len(LEVELS)]
+        lines.append(
+            style.dim(f"2025-01-01 12:00:{i % 60:02d}")
+            + " "
+            + level_style(f"[{label}]")
+            + " "
+            + style.cyan(f"worker-{i % 8}")
+            + ": request "
+            + style.rgb(255, 105, 180)(f"#{i}")
+            + " finished\n"
+        )
+    return "".join(lines)
+
+
+def nested(n: int) -> str:
+    return "\n".join(
+        style.red(
+            f"outer {i} "
+            + style.yellow("middle " + style.green.bold("inner") + " middle")
+            + " outer"
+        )
+        for i in range(n)
+    )
+
+
+def multiline_block(n: int) -> str:
+    return style.on.rgb(30, 30, 30).white(
+        "\n".join(f"line {i} of a highlighted block" for i in range(n))
+    )
+
+
+WORKLOADS: typing.Dict[str, typing.Callable[[], str]] = {
+    "log lines": lambda: log_lines(10_000),
+    "nested styles": lambda: nested(10_000),
+    "multi-line block": lambda: multiline_block(10_000),
+}
+
+
+def main() -> None:
+    print(f"{'workload':<18} {'in':>10} {'out':>10} {'saved':>7} {'MB/s':>7}")
+    for name, workload in WORKLOADS.items():
+        text = workload()
+        start = time.perf_counter()
+        result = minify(text)
+        elapsed = time.perf_counter() - start
+
+        size_in = len(text.encode())
+        size_out = len(result.encode())
+        print(
+            f"{name:<18} {size_in:>10} {size_out:>10} "
+            f"{1 - size_out / size_in:>7.1%} {size_in / elapsed / 1e6:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
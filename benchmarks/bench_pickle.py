@@ -0,0 +1,58 @@
+"""
+Reports the pickled size of builders and the time of a pickle round trip,
+next to pickling the same fields as a plain dictionary.
+
+Run with `python -m benchmarks.bench_pickle`.
+"""
+
+from __future__ import annotations
+
+import pickle
+import time
+import typing
+
+from coloredstrings import ColorMode, StyleBuilder
+
+ROUND_TRIPS = 20_000
+
+style = StyleBuilder(mode=ColorMode.TRUE_COLOR)
+themed = style.extend(
+    primary="royalblue",
+    secondary=(169, 169, 169),
+    success=style.green.bold,
+    danger=style.red.bold.underline,
+)
+
+PAYLOADS: typing.Dict[str, typing.Any] = {
+    "plain builder": style,
+    "styled builder": style.rgb(255, 105, 180).on.color256(236).bold.italic,
+    "extended builder": themed.primary.bold,
+    "100 themed builders": [themed.rgb(i, i, i) for i in range(100)],
+}
+
+
+def fields(payload: typing.Any) -> typing.Any:
+    """The fields a builder consists of, as the default dataclass pickling sees them."""
+    if isinstance(payload, list):
+        return [fields(p) for p in payload]
+    return (StyleBuilder, dict(vars(payload)))
+
+
+def round_trip(payload: typing.Any) -> typing.Tuple[int, float]:
+    data = pickle.dumps(payload)
+    start = time.perf_counter()
+    for _ in range(ROUND_TRIPS):
+        pickle.loads(pickle.dumps(payload))
+    return len(data), (time.perf_counter() - start) / ROUND_TRIPS * 1e6
+
+
+def main() -> None:
+    print(f"{'payload':<20} {'bytes':>7} {'field dict':>10} {'round trip, us':>15}")
+    for name, payload in PAYLOADS.items():
+        size, elapsed = round_trip(payload)
+        baseline = len(pickle.dumps(fields(payload)))
+        print(f"{name:<20} {size:>7} {baseline:>10} {elapsed:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Compares the bytes sent per frame of a live dashboard when reprinting the whole
+screen and when rendering the changes of a `Screen`.
+
+Run with `python -m benchmarks.bench_screen`.
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+import typing
+
+from coloredstrings import ColorMode, StyleBuilder
+from coloredstrings.screen import Screen
+
+WIDTH = 120
+HEIGHT = 40
+ROWS = 30
+FRAMES = 100
+
+style = StyleBuilder()
+
+
+class Dashboard:
+    """A table of services whose figures change a little every tick, with a clock and a progress bar."""
+
+    def __init__(self, seed: int = 0) -> None:
+        self.rng = random.Random(seed)
+        self.tick = 0
+        self.values = [
+            [self.rng.uniform(0, 1000) for _ in range(4)] for _ in range(ROWS)
+        ]
+
+    def update(self) -> None:
+        self.tick += 1
+        # A tenth of the figures change on every tick
+        for _ in range(ROWS * 4 // 10):
+            row = self.values[self.rng.randrange(ROWS)]
+            column = self.rng.randrange(4)
+            row[column] = max(0.0, row[column] + self.rng.uniform(-50, 50))
+
+    def lines(self, mode: ColorMode) -> typing.List[str]:
+        """The dashboard as styled lines, the way a reprinting program builds it."""
+        header = style.bold.white.on.blue
+        lines = [
+            header(f" services  tick {self.tick:>6}".ljust(WIDTH), mode=mode),
+            style.dim(
+                f"{'name':<20}{'rps':>12}{'p50 ms':>12}{'p99 ms':>12}{'errors':>12}",
+                mode=mode,
+            ),
+        ]
+        for i, values in enumerate(self.values):
+            cells = [f"{v:>12.1f}" for v in values]
+            p99 = style.red if values[2] > 800 else style.green
+            lines.append(
+                f"{f'service-{i:02}':<20}{cells[0]}{cells[1]}"
+                f"{p99(cells[2], mode=mode)}{cells[3]}"
+            )
+        done = self.tick % 100 * (WIDTH - 2) // 100
+        lines.append(
+            "[" + style.green("#" * done, mode=mode) + " " * (WIDTH - 2 - done) + "]"
+        )
+        return lines
+
+    def reprint(self, mode: ColorMode) -> str:
+        lines = self.lines(mode)
+        return "\x1b[H" + "\n".join(line + "\x1b[K" for line in lines)
+
+    def draw(self, screen: Screen) -> None:
+        """The dashboard drawn on a screen, every cell of it on every tick."""
+        header = screen.style(style.bold.white.on.blue)
+        dim = screen.style(style.dim)
+        red, green = screen.style(style.red), screen.style(style.green)
+        screen.put(0, 0, f" services  tick {self.tick:>6}".ljust(WIDTH), header)
+        screen.put(
+            0,
+            1,
+            f"{'name':<20}{'rps':>12}{'p50 ms':>12}{'p99 ms':>12}{'errors':>12}",
+            dim,
+        )
+        for i, values in enumerate(self.values):
+            y = i + 2
+            screen.put(0, y, f"service-{i:02}".ljust(20))
+            screen.put(20, y, f"{values[0]:>12.1f}{values[1]:>12.1f}")
+            screen.put(44, y, f"{values[2]:>12.1f}", red if values[2] > 800 else green)
+            screen.put(56, y, f"{values[3]:>12.1f}")
+        done = self.tick % 100 * (WIDTH - 2) // 100
+        y = ROWS + 2
+        screen.put(0, y, "[")
+        screen.put(1, y, "#" * done, green)
+        screen.put(1 + done, y, " " * (WIDTH - 2 - done) + "]")
+
+
+def frames(mode: ColorMode) -> typing.Tuple[float, float]:
+    """Returns the average bytes per frame when reprinting and when diffing."""
+    reprinted = diffed = 0
+    dashboard = Dashboard()
+    screen = Screen(WIDTH, HEIGHT, mode)
+    screen.render()
+    for _ in range(FRAMES):
+        dashboard.update()
+        reprinted += len(dashboard.reprint(mode).encode())
+        dashboard.draw(screen)
+        diffed += len(screen.render().encode())
+    return reprinted / FRAMES, diffed / FRAMES
+
+
+def main() -> None:
+    print(f"{WIDTH}x{HEIGHT} dashboard, {FRAMES} frames")
+    print(
+        f"{'mode':<14} {'reprint (B)':>12} {'screen (B)':>11} "
+        f"{'reprint (us)':>13} {'screen (us)':>12}"
+    )
+    for mode in ColorMode:
+        reprinted, diffed = frames(mode)
+        dashboard = Dashboard()
+        screen = Screen(WIDTH, HEIGHT, mode)
+
+        def draw() -> None:
+            dashboard.update()
+            dashboard.draw(screen)
+            screen.render()
+
+        times = []
+        for render in (lambda: dashboard.reprint(mode), draw):
+            timer = timeit.Timer(render)
+            number, _ = timer.autorange()
+            times.append(min(timer.repeat(3, number)) / number * 1e6)
+        print(
+            f"{mode.name:<14} {reprinted:>12.0f} {diffed:>11.0f} "
+            f"{times[0]:>13.0f} {times[1]:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
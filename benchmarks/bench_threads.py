@@ -0,0 +1,67 @@
+"""
+Reports rendering throughput with 1, 4 and 16 threads styling text at once.
+
+On a free-threaded interpreter (for example `python3.13t`) throughput should grow
+with the number of threads, since shared caches are read without a lock.
+With the GIL it stays flat: the numbers show the overhead of contention only.
+
+Run with `python -m benchmarks.bench_threads`.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import typing
+
+from coloredstrings import ColorMode, StyleBuilder
+
+RENDERS_PER_THREAD = 20_000
+THREADS = (1, 4, 16)
+
+
+def gil_status() -> str:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    if is_gil_enabled is None:
+        return "enabled (no free-threading support)"
+    return "enabled" if is_gil_enabled() else "disabled"
+
+
+def render(n: int) -> None:
+    styles = [
+        StyleBuilder(mode=mode)
+        for mode in (ColorMode.ANSI_16, ColorMode.EXTENDED_256, ColorMode.TRUE_COLOR)
+    ]
+    for i in range(n):
+        style = styles[i % len(styles)]
+        style.rgb(i % 256, 128, 255 - i % 256).bold(f"line {i}")
+        style.red.on.blue(style.underline("nested"), "text")
+
+
+def run(threads: int) -> float:
+    workers = [
+        threading.Thread(target=render, args=(RENDERS_PER_THREAD,))
+        for _ in range(threads)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    return threads * RENDERS_PER_THREAD / elapsed
+
+
+def main() -> None:
+    print(f"Python {sys.version.split()[0]}, GIL {gil_status()}")
+    print(f"{'threads':>7} {'renders/s':>12} {'scaling':>8}")
+    base: typing.Optional[float] = None
+    for threads in THREADS:
+        rate = run(threads)
+        base = base or rate
+        print(f"{threads:>7} {rate:>12,.0f} {rate / base:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
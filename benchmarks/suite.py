@@ -0,0 +1,264 @@
+"""
+Workloads of the benchmark suite run by `python -m benchmarks`.
+
+Every workload returns the best time of a single operation, in seconds.
+"""
+
+from __future__ import annotations
+
+import logging
+import pickle
+import subprocess
+import sys
+import timeit
+import typing
+
+from coloredstrings import (
+    ColorMode,
+    Formatter,
+    StyleBuilder,
+    ansi_conversions,
+    strip_ansi,
+    wrap,
+)
+from coloredstrings.annotation import annotate
+from coloredstrings.ansi_html import to_html
+from coloredstrings.colormap import Colormap
+from coloredstrings.downsample import downsample
+from coloredstrings.highlight import KeywordHighlighter
+from coloredstrings.log_formatter import ColoredFormatter
+from coloredstrings.minify import minify
+from coloredstrings.screen import Screen
+
+from .bench_annotate import LINE, ranges
+from .bench_keywords import keywords, log
+from .bench_minify import log_lines, nested
+from .bench_screen import HEIGHT, WIDTH, Dashboard
+
+BENCHMARKS: typing.Dict[str, typing.Callable[[], float]] = {}
+
+# Number of timing runs; the fastest one is reported, as it is the least disturbed.
+REPEAT = 5
+
+_F = typing.TypeVar("_F", bound=typing.Callable[[], float])
+
+
+def benchmark(name: str) -> typing.Callable[[_F], _F]:
+    def register(workload: _F) -> _F:
+        BENCHMARKS[name] = workload
+        return workload
+
+    return register
+
+
+def best_time(operation: typing.Callable[[], object]) -> float:
+    timer = timeit.Timer(operation)
+    number, _ = timer.autorange()
+    return min(timer.repeat(REPEAT, number)) / number
+
+
+MODES = {
+    "16": ColorMode.ANSI_16,
+    "256": ColorMode.EXTENDED_256,
+    "truecolor": ColorMode.TRUE_COLOR,
+    "no color": ColorMode.NO_COLOR,
+}
+
+LABEL = "OK"
+MULTILINE = "\n".join(
+    f"{i:>4} | the quick brown fox jumps over the lazy dog" for i in range(100)
+)
+NESTED = nested(50)
+LOG = log_lines(200)
+
+
+def _register_rendering(label: str, mode: ColorMode) -> None:
+    style = StyleBuilder(mode=mode)
+    styled = style.rgb(255, 105, 180).on.color256(236).bold
+
+    @benchmark(f"render label, {label}")
+    def render_label() -> float:
+        return best_time(lambda: styled(LABEL))
+
+    @benchmark(f"render multi-line text, {label}")
+    def render_multiline() -> float:
+        return best_time(lambda: styled(MULTILINE))
+
+    @benchmark(f"render nested text, {label}")
+    def render_nested() -> float:
+        return best_time(
+            lambda: style.red(
+                "outer " + style.blue("inner " + style.bold("x")) + " outer"
+            )
+        )
+
+
+for _label, _mode in MODES.items():
+    _register_rendering(_label, _mode)
+
+
+@benchmark("render label for 3 modes")
+def render_modes() -> float:
+    styled = StyleBuilder().rgb(255, 105, 180).on.color256(236).bold
+    modes = [ColorMode.ANSI_16, ColorMode.EXTENDED_256, ColorMode.TRUE_COLOR]
+    return best_time(lambda: [styled(LABEL, mode=mode) for mode in modes])
+
+
+@benchmark("chain 16 colors and attributes")
+def chain_ansi16() -> float:
+    style = StyleBuilder(mode=ColorMode.ANSI_16)
+    return best_time(lambda: style.red.on.white.bold.underline)
+
+
+@benchmark("chain named color")
+def chain_named() -> float:
+    style = StyleBuilder(mode=ColorMode.TRUE_COLOR)
+    return best_time(lambda: style.mediumaquamarine.on.rgb("navy"))
+
+
+@benchmark("chain hex color")
+def chain_hex() -> float:
+    style = StyleBuilder(mode=ColorMode.TRUE_COLOR)
+    return best_time(lambda: style.rgb("#ff69b4").on.rgb("#1e1e1e"))
+
+
+@benchmark("extend 200 styles one by one")
+def extend_incrementally() -> float:
+    def build() -> StyleBuilder:
+        theme = StyleBuilder(mode=ColorMode.TRUE_COLOR)
+        for i in range(200):
+            theme = theme.extend(**{f"style{i}": (i, 255 - i, 128)})
+        return theme
+
+    return best_time(build)
+
+
+@benchmark("lookup extension")
+def lookup_extension() -> float:
+    theme = StyleBuilder(mode=ColorMode.TRUE_COLOR)
+    for i in range(200):
+        theme = theme.extend(**{f"style{i}": "#ff69b4"})
+    return best_time(lambda: theme.style0)
+
+
+@benchmark("strip_ansi, styled log")
+def strip_log() -> float:
+    return best_time(lambda: strip_ansi(LOG))
+
+
+@benchmark("strip_ansi, plain text")
+def strip_plain() -> float:
+    return best_time(lambda: strip_ansi(MULTILINE))
+
+
+@benchmark("convert rgb to 256")
+def convert_rgb() -> float:
+    colors = [(r, g, 128) for r in range(0, 256, 16) for g in range(0, 256, 16)]
+    return best_time(
+        lambda: [ansi_conversions.rgb_to_ansi_256(r, g, b) for r, g, b in colors]
+    )
+
+
+@benchmark("convert 256 to 16")
+def convert_256() -> float:
+    return best_time(
+        lambda: [ansi_conversions.ansi_256_to_ansi_16(i) for i in range(256)]
+    )
+
+
+@benchmark("wrap styled log")
+def wrap_log() -> float:
+    return best_time(lambda: wrap(LOG, 40))
+
+
+@benchmark("minify styled log")
+def minify_log() -> float:
+    return best_time(lambda: minify(LOG))
+
+
+@benchmark("downsample styled log to 16")
+def downsample_log() -> float:
+    return best_time(lambda: downsample(LOG, ColorMode.ANSI_16))
+
+
+@benchmark("convert styled log to html")
+def html_log() -> float:
+    return best_time(lambda: to_html(LOG))
+
+
+@benchmark("render markup template")
+def render_markup() -> float:
+    style = StyleBuilder(mode=ColorMode.TRUE_COLOR)
+    return best_time(
+        lambda: style.markup("[bold red]ERROR[/] [dim]{path}[/]", path="/etc/hosts")
+    )
+
+
+@benchmark("render styled format string")
+def render_format() -> float:
+    formatter = Formatter(StyleBuilder(mode=ColorMode.TRUE_COLOR))
+    return best_time(
+        lambda: formatter.format("{user:red.bold} {n:>8:green}", user="bob", n=3)
+    )
+
+
+@benchmark("color column of 1000 numbers")
+def color_column() -> float:
+    gradient = Colormap.gradient(["green", "yellow", "red"], 0, 1000)
+    values = [i * 7 % 1000 for i in range(1000)]
+    return best_time(lambda: gradient.render(values, "{:>8}", ColorMode.TRUE_COLOR))
+
+
+@benchmark("draw and render dashboard frame")
+def render_screen() -> float:
+    dashboard = Dashboard()
+    screen = Screen(WIDTH, HEIGHT, ColorMode.TRUE_COLOR)
+
+    def frame() -> str:
+        dashboard.update()
+        dashboard.draw(screen)
+        return screen.render()
+
+    return best_time(frame)
+
+
+@benchmark("annotate line of code")
+def annotate_line() -> float:
+    spans = ranges(LINE)
+    return best_time(lambda: annotate(LINE, spans, ColorMode.TRUE_COLOR))
+
+
+@benchmark("highlight 1000 keywords")
+def highlight_keywords() -> float:
+    terms = keywords(1_000)
+    highlighter = KeywordHighlighter(terms, mode=ColorMode.TRUE_COLOR)
+    text = log(list(terms))[:100_000]
+    return best_time(lambda: highlighter.highlight(text))
+
+
+@benchmark("format log record")
+def format_record() -> float:
+    formatter = ColoredFormatter(
+        "%(levelname)s %(name)s: %(message)s", mode=ColorMode.TRUE_COLOR
+    )
+    record = logging.LogRecord("app", logging.INFO, __file__, 1, "done", None, None)
+    return best_time(lambda: formatter.format(record))
+
+
+@benchmark("pickle round trip")
+def pickle_round_trip() -> float:
+    builder = StyleBuilder(mode=ColorMode.TRUE_COLOR).rgb(1, 2, 3).bold
+    return best_time(lambda: pickle.loads(pickle.dumps(builder)))
+
+
+@benchmark("import coloredstrings")
+def import_time() -> float:
+    # A fresh interpreter for every run: only the first import does any work
+    code = (
+        "import time; start = time.perf_counter(); import coloredstrings; "
+        "print(time.perf_counter() - start)"
+    )
+    return min(
+        float(subprocess.check_output([sys.executable, "-c", code]))
+        for _ in range(REPEAT)
+    )
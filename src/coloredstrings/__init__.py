@@ -1,62 +1,106 @@
+import importlib
+import typing
+
+from . import utils
 from .style_builder import StyleBuilder
 from .types import ColorMode
-from .utils import strip_ansi
+from .utils import nearest_named_color, strip_ansi
+
+# Module-level builders and helpers are created on first access (PEP 562), so that
+# importing the package neither detects the color mode nor builds dozens of builders.
+# Each name maps to the attribute of `style` it stands for.
+_STYLE_ATTRIBUTES = {
+    "on": "on",
+    "black": "black",
+    "red": "red",
+    "green": "green",
+    "yellow": "yellow",
+    "blue": "blue",
+    "magenta": "magenta",
+    "cyan": "cyan",
+    "white": "white",
+    "bright_black": "bright_black",
+    "gray": "bright_black",
+    "grey": "bright_black",
+    "bright_red": "bright_red",
+    "bright_green": "bright_green",
+    "bright_yellow": "bright_yellow",
+    "bright_blue": "bright_blue",
+    "bright_magenta": "bright_magenta",
+    "bright_cyan": "bright_cyan",
+    "bright_white": "bright_white",
+    "reset": "reset",
+    "bold": "bold",
+    "dim": "dim",
+    "faint": "faint",
+    "dark": "dark",
+    "italic": "italic",
+    "underline": "underline",
+    "blink": "blink",
+    "slow_blink": "slow_blink",
+    "rapid_blink": "rapid_blink",
+    "inverse": "inverse",
+    "reverse": "reverse",
+    "hidden": "hidden",
+    "concealed": "concealed",
+    "strike": "strike",
+    "strikethrough": "strikethrough",
+    "framed": "framed",
+    "encircle": "encircle",
+    "circle": "circle",
+    "overline": "overline",
+    "double_underline": "double_underline",
+    "visible": "visible",
+    "color_mode": "color_mode",
+    "color256": "color256",
+    "rgb": "rgb",
+    "extend": "extend",
+    "markup": "markup",
+}
 
-style = StyleBuilder()
+# Public names defined by submodules which are imported on first access
+_LAZY_IMPORTS = {
+    "AnsiWrapper": "ansi_wrap",
+    "Formatter": "templates",
+    "annotate": "annotation",
+    "fill": "ansi_wrap",
+    "wrap": "ansi_wrap",
+}
 
-on = style.on
+# Submodules found (or not) by `__getattr__`
+_submodules: typing.Dict[str, bool] = {}
 
-black = style.black
-red = style.red
-green = style.green
-yellow = style.yellow
-blue = style.blue
-magenta = style.magenta
-cyan = style.cyan
-white = style.white
-bright_black = style.bright_black
-gray = bright_black
-grey = bright_black
-bright_red = style.bright_red
-bright_green = style.bright_green
-bright_yellow = style.bright_yellow
-bright_blue = style.bright_blue
-bright_magenta = style.bright_magenta
-bright_cyan = style.bright_cyan
-bright_white = style.bright_white
 
-reset = style.reset
-bold = style.bold
-dim = style.dim
-faint = style.faint
-dark = style.dark
-italic = style.italic
-underline = style.underline
-blink = style.blink
-slow_blink = style.slow_blink
-rapid_blink = style.rapid_blink
-inverse = style.inverse
-reverse = style.reverse
-hidden = style.hidden
-concealed = style.concealed
-strike = style.strike
-strikethrough = style.strikethrough
-framed = style.framed
-encircle = style.encircle
-circle = style.circle
-overline = style.overline
-double_underline = style.double_underline
-visible = style.visible
+def __getattr__(name: str) -> typing.Any:
+    if name == "style":
+        value: typing.Any = StyleBuilder()
+    elif name in _STYLE_ATTRIBUTES:
+        value = getattr(__getattr__("style"), _STYLE_ATTRIBUTES[name])
+    elif name in _LAZY_IMPORTS:
+        module = importlib.import_module(f".{_LAZY_IMPORTS[name]}", __name__)
+        value = getattr(module, name)
+    elif _is_submodule(name):
+        # `from coloredstrings import minify` probes the package for the name first
+        return importlib.import_module(f".{name}", __name__)
+    else:
+        # Anything else is a color or an extension, like `coloredstrings.pink`
+        return getattr(__getattr__("style"), name)
 
-color_mode = style.color_mode
-color256 = style.color256
-rgb = style.rgb
+    globals()[name] = value
+    return value
 
-extend = style.extend
 
+def _is_submodule(name: str) -> bool:
+    found = _submodules.get(name)
+    if found is None:
+        import importlib.util
 
-def __getattr__(name: str) -> StyleBuilder:
-    return style.__getattr__(name)
+        found = _submodules[name] = (
+            not name.startswith("_")
+            and utils._named_colors().get(name) is None
+            and importlib.util.find_spec(f".{name}", __name__) is not None
+        )
+    return found
 
 
 def __dir__() -> list[str]:
@@ -64,8 +108,11 @@ def __dir__() -> list[str]:
 
 
 __all__ = [
+    "AnsiWrapper",
     "ColorMode",
+    "Formatter",
     "StyleBuilder",
+    "annotate",
     "black",
     "blink",
     "blue",
@@ -88,6 +135,7 @@ __all__ = [
     "double_underline",
     "encircle",
     "faint",
+    "fill",
     "framed",
     "gray",
     "green",
@@ -96,6 +144,8 @@ __all__ = [
     "inverse",
     "italic",
     "magenta",
+    "markup",
+    "nearest_named_color",
     "on",
     "overline",
     "rapid_blink",
@@ -111,5 +161,6 @@ __all__ = [
     "underline",
     "visible",
     "white",
+    "wrap",
     "yellow",
 ]
@@ -0,0 +1,112 @@
+"""
+Rendering of a string with styles applied to ranges of it, as computed by syntax
+highlighters and diff viewers.
+
+Rather than slicing the string and calling a builder per range, which nests and
+concatenates many small strings, ranges are resolved into runs of text sharing the
+same style, each one preceded by the shortest sequence switching to its style.
+"""
+
+from __future__ import annotations
+
+import bisect
+import typing
+
+from coloredstrings import color_support, sgr, types, utils
+from coloredstrings.style_builder import StyleBuilder
+
+Range = typing.Tuple[int, int, StyleBuilder]
+"""Start and end indices of a part of a string, and its style."""
+
+# States of overlapping ranges, by the states of the ranges, lowest first
+_stacks: utils._ConcurrentCache[typing.Tuple[sgr.SgrState, ...], sgr.SgrState] = (
+    utils._ConcurrentCache("annotation.stack", maxsize=4096)
+)
+
+
+def annotate(
+    text: str,
+    ranges: typing.Iterable[Range],
+    mode: typing.Optional[types.ColorMode] = None,
+) -> str:
+    """
+    Renders `text` with every `(start, end, style)` range styled, in a single pass.
+
+    Ranges may overlap: later ranges are drawn over earlier ones, so their colors
+    win where they set one, and attributes combine. Indices out of the text are
+    clipped to it, and empty ranges are ignored. The styles must be the only ones
+    in `text`, which is expected to contain no escape sequences.
+
+    Parameters
+    ----------
+    text : str
+        The text to render.
+    ranges : Iterable[Range]
+        Parts of the text to style, lowest layer first.
+    mode : Optional[types.ColorMode]
+        Color mode to render in; when `None`, it is detected.
+    """
+    if mode is None:
+        mode = color_support.detected_color_mode()
+    if mode == types.ColorMode.NO_COLOR:
+        return text
+
+    # Terminal state set by each range, computed once per builder
+    states: typing.Dict[StyleBuilder, sgr.SgrState] = {}
+    layers: typing.List[sgr.SgrState] = []
+    # Positions where a range opens (`layer`) or closes (`~layer`)
+    events: typing.List[typing.Tuple[int, int]] = []
+    length = len(text)
+    for start, end, style in ranges:
+        start = max(start, 0)
+        end = min(end, length)
+        if start >= end:
+            continue
+        state = states.get(style)
+        if state is None:
+            state = states[style] = sgr.state_after(style.code_pair(mode).start)
+        events.append((start, len(layers)))
+        events.append((end, ~len(layers)))
+        layers.append(state)
+
+    if not events:
+        return text
+    events.sort()
+
+    out = []
+    active: typing.List[int] = []
+    # State text is rendered in from `pos`, and the one the output leaves the terminal in
+    state = emitted = sgr.DEFAULT_STATE
+    pos = 0
+    for at, layer in events:
+        if at > pos:
+            if state is not emitted:
+                out.append(sgr.transition(emitted, state))
+                emitted = state
+            out.append(text[pos:at])
+            pos = at
+
+        if layer >= 0:
+            bisect.insort(active, layer)
+        else:
+            active.remove(~layer)
+        if len(active) == 1:
+            state = layers[active[0]]
+        elif active:
+            state = _layered(tuple(layers[layer] for layer in active))
+        else:
+            state = sgr.DEFAULT_STATE
+
+    out.append(sgr.transition(emitted, sgr.DEFAULT_STATE))
+    out.append(text[pos:])
+    return "".join(out)
+
+
+def _layered(stack: typing.Tuple[sgr.SgrState, ...]) -> sgr.SgrState:
+    state = _stacks.get(stack)
+    if state is None:
+        state = sgr.DEFAULT_STATE
+        for above in stack:
+            state = state.layer(above)
+        state = _stacks.put(stack, state)
+    return state
@@ -1,4 +1,5 @@
 import math
+import typing
 
 
 def rgb_to_ansi_256(r: int, g: int, b: int) -> int:
@@ -69,3 +70,43 @@ def ansi_256_to_ansi_16(code: int, eps: float = 1e-9) -> int:
 
 def rgb_to_ansi_16(r: int, g: int, b: int) -> int:
     return ansi_256_to_ansi_16(rgb_to_ansi_256(r, g, b))
+
+
+# xterm's default palette for the 16 basic colors, indexed like 256-color codes 0-15.
+ANSI_16_RGB: typing.Tuple[typing.Tuple[int, int, int], ...] = (
+    (0, 0, 0),
+    (205, 0, 0),
+    (0, 205, 0),
+    (205, 205, 0),
+    (0, 0, 238),
+    (205, 0, 205),
+    (0, 205, 205),
+    (229, 229, 229),
+    (127, 127, 127),
+    (255, 0, 0),
+    (0, 255, 0),
+    (255, 255, 0),
+    (92, 92, 255),
+    (255, 0, 255),
+    (0, 255, 255),
+    (255, 255, 255),
+)
+
+_CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+
+
+def ansi_256_to_rgb(code: int) -> typing.Tuple[int, int, int]:
+    if code < 16:
+        return ANSI_16_RGB[code]
+
+    if code >= 232:
+        v = (code - 232) * 10 + 8
+        return (v, v, v)
+
+    t = code - 16
+    return (_CUBE_LEVELS[t // 36], _CUBE_LEVELS[(t // 6) % 6], _CUBE_LEVELS[t % 6])
+
+
+def ansi_16_to_rgb(code: int) -> typing.Tuple[int, int, int]:
+    """Converts a foreground code (30-37, 90-97) into an RGB triple of xterm's palette."""
+    return ANSI_16_RGB[code - 30 if code < 90 else code - 90 + 8]
@@ -0,0 +1,195 @@
+"""
+Conversion of ANSI-styled text into HTML.
+
+Text is parsed with `sgr.SgrTokenizer`, so arbitrarily large inputs can be converted
+chunk by chunk with constant memory.
+"""
+
+from __future__ import annotations
+
+import html
+import typing
+
+from coloredstrings import ansi_conversions, sgr, types
+
+_DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Upper bound for the cache of inline `style` attributes: logs with many distinct RGB
+# colors must not make the converter grow without limit.
+_MAX_CACHED_STYLES = 4096
+
+
+class AnsiToHtml:
+    """
+    Streaming converter of styled text into HTML fragments.
+
+    With `inline=True` every styled span carries a `style` attribute.
+    Otherwise spans reference CSS classes, one per distinct style, and the class table
+    is available from `stylesheet` once the input has been converted.
+    """
+
+    def __init__(self, inline: bool = True, class_prefix: str = "cs") -> None:
+        self.inline = inline
+        self.class_prefix = class_prefix
+        self._tokenizer = sgr.SgrTokenizer()
+        self._styles: typing.Dict[sgr.SgrState, str] = {}
+        self._classes: typing.Dict[sgr.SgrState, str] = {}
+        # Style of the `<span>` left open by the previous chunk, if any
+        self._open = sgr.DEFAULT_STATE
+
+    def feed(self, chunk: str) -> str:
+        """Converts the next chunk of text, returning the HTML it completes."""
+        return self._render(self._tokenizer.feed(chunk))
+
+    def close(self) -> str:
+        """Flushes the end of the input, closing the last open element."""
+        out = self._render(self._tokenizer.close())
+        if not self._open.is_default:
+            out += "</span>"
+            self._open = sgr.DEFAULT_STATE
+        return out
+
+    def stylesheet(self) -> str:
+        """Returns CSS rules for every class referenced so far."""
+        return "\n".join(
+            f".{name} {{ {css(state)} }}" for state, name in self._classes.items()
+        )
+
+    def _render(self, spans: typing.Iterable[sgr.Span]) -> str:
+        out = []
+        for span in spans:
+            state = span.state
+            if state is not self._open and state != self._open:
+                if not self._open.is_default:
+                    out.append("</span>")
+                if not state.is_default:
+                    out.append(f"<span {self._attribute(state)}>")
+                self._open = state
+            out.append(html.escape(span.text, quote=False))
+        return "".join(out)
+
+    def _attribute(self, state: sgr.SgrState) -> str:
+        if not self.inline:
+            name = self._classes.get(state)
+            if name is None:
+                name = self._classes[state] = f"{self.class_prefix}{len(self._classes)}"
+            return f'class="{name}"'
+
+        attribute = self._styles.get(state)
+        if attribute is None:
+            if len(self._styles) >= _MAX_CACHED_STYLES:
+                self._styles.clear()
+            attribute = self._styles[state] = f'style="{css(state)}"'
+        return attribute
+
+
+def css(state: sgr.SgrState) -> str:
+    """Returns CSS declarations rendering text the way a terminal in `state` would."""
+    fg = None if state.fg is None else color_to_hex(state.fg)
+    bg = None if state.bg is None else color_to_hex(state.bg)
+    attrs = state.attrs
+
+    if types.Attribute.INVERSE in attrs:
+        fg, bg = bg or "Canvas", fg or "CanvasText"
+
+    declarations = []
+    if fg is not None:
+        declarations.append(f"color: {fg}")
+    if bg is not None:
+        declarations.append(f"background-color: {bg}")
+    if types.Attribute.BOLD in attrs:
+        declarations.append("font-weight: bold")
+    if types.Attribute.DIM in attrs:
+        declarations.append("opacity: 0.5")
+    if types.Attribute.ITALIC in attrs:
+        declarations.append("font-style: italic")
+    if types.Attribute.HIDDEN in attrs:
+        declarations.append("visibility: hidden")
+
+    decorations = []
+    if attrs & {types.Attribute.UNDERLINE, types.Attribute.DOUBLE_UNDERLINE}:
+        decorations.append("underline")
+    if types.Attribute.OVERLINE in attrs:
+        decorations.append("overline")
+    if types.Attribute.STRIKE in attrs:
+        decorations.append("line-through")
+    if attrs & {types.Attribute.SLOW_BLINK, types.Attribute.RAPID_BLINK}:
+        decorations.append("blink")
+    if decorations:
+        declarations.append(f"text-decoration: {' '.join(decorations)}")
+    if types.Attribute.DOUBLE_UNDERLINE in attrs:
+        declarations.append("text-decoration-style: double")
+
+    if attrs & {types.Attribute.FRAMED, types.Attribute.ENCIRCLE}:
+        declarations.append("border: 1px solid")
+    if types.Attribute.ENCIRCLE in attrs:
+        declarations.append("border-radius: 50%")
+
+    return "; ".join(declarations)
+
+
+def color_to_hex(color: types.Color) -> str:
+    if isinstance(color, types.Ansi16Color):
+        r, g, b = ansi_conversions.ansi_16_to_rgb(color.value.start)
+    elif isinstance(color, types.Extended256):
+        r, g, b = ansi_conversions.ansi_256_to_rgb(color.index)
+    else:
+        r, g, b = color.r, color.g, color.b
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def to_html(text: str, inline: bool = True) -> str:
+    """
+    Converts styled text into an HTML fragment.
+    With `inline=False`, the class table is prepended as a `<style>` element.
+    """
+    converter = AnsiToHtml(inline=inline)
+    body = converter.feed(text) + converter.close()
+    if inline:
+        return body
+    return f"<style>\n{converter.stylesheet()}\n</style>\n{body}"
+
+
+def convert_stream(
+    chunks: typing.Iterable[str], converter: typing.Optional[AnsiToHtml] = None
+) -> typing.Iterator[str]:
+    """Lazily converts a stream of text chunks, yielding HTML fragments."""
+    if converter is None:
+        converter = AnsiToHtml()
+    for chunk in chunks:
+        out = converter.feed(chunk)
+        if out:
+            yield out
+    out = converter.close()
+    if out:
+        yield out
+
+
+def convert_file(
+    src: typing.TextIO,
+    dst: typing.TextIO,
+    inline: bool = True,
+    title: str = "",
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+) -> None:
+    """
+    Writes a standalone HTML document rendering the styled text read from `src`.
+
+    The input is read in chunks of `chunk_size` characters, so memory stays constant
+    regardless of its size. With `inline=False` the class table is written at the end
+    of the document, once every style has been seen.
+    """
+    converter = AnsiToHtml(inline=inline)
+    dst.write(
+        "<!DOCTYPE html>\n"
+        '<html>\n<head>\n<meta charset="utf-8">\n'
+        f"<title>{html.escape(title)}</title>\n"
+        "</head>\n<body>\n<pre>"
+    )
+    chunks = iter(lambda: src.read(chunk_size), "")
+    for out in convert_stream(chunks, converter):
+        dst.write(out)
+    dst.write("</pre>\n")
+    if not inline:
+        dst.write(f"<style>\n{converter.stylesheet()}\n</style>\n")
+    dst.write("</body>\n</html>\n")
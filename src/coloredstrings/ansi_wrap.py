@@ -0,0 +1,180 @@
+"""
+Word wrapping of already styled text.
+
+Unlike `textwrap`, escape sequences are treated as zero-width, and the SGR state active
+at a line break is closed at the end of the line and reopened at the start of the next one,
+so every produced line can be printed on its own.
+"""
+
+from __future__ import annotations
+
+import re
+import typing
+
+from coloredstrings import sgr, utils
+
+_TOKEN = re.compile(
+    rf"""
+    (?P<escape>{utils._ANSI_ESCAPE.pattern})
+    | (?P<space>\s+)
+    | (?P<text>[^\s\x1b]+|\x1b)
+    """,
+    re.VERBOSE,
+)
+
+
+class AnsiWrapper:
+    """
+    Wraps styled text to a given visible width.
+
+    The SGR state left active at the end of a `wrap` call is carried into the next call,
+    which allows wrapping a stream of paragraphs incrementally with a single wrapper.
+    """
+
+    def __init__(
+        self,
+        width: int = 70,
+        initial_indent: str = "",
+        subsequent_indent: str = "",
+        break_long_words: bool = True,
+    ) -> None:
+        if width <= 0:
+            raise ValueError(f"invalid width {width!r} (must be > 0)")
+
+        self.width = width
+        self.initial_indent = initial_indent
+        self.subsequent_indent = subsequent_indent
+        self.break_long_words = break_long_words
+        self.state = sgr.DEFAULT_STATE
+        """SGR state active after the last wrapped text."""
+
+    def wrap(self, text: str) -> typing.List[str]:
+        """
+        Wraps `text` into lines no longer than `width` visible characters.
+        Runs of whitespace are collapsed like `textwrap.wrap` does.
+        """
+        lines: typing.List[str] = []
+        line: typing.List[str] = []
+        line_width = 0
+        has_words = False
+        state = self.state
+
+        word: typing.List[typing.Tuple[bool, str]] = []
+        word_width = 0
+
+        def break_line() -> None:
+            nonlocal line, line_width, has_words
+            if not state.is_default:
+                line.append(sgr.SGR_RESET)
+            lines.append("".join(line))
+            indent = self.subsequent_indent
+            line = [indent, state.sequence()]
+            line_width = len(indent)
+            has_words = False
+
+        def place_word() -> None:
+            nonlocal state, line_width, has_words, word_width
+
+            if word_width == 0:
+                # Only escape sequences: attach them without a separating space
+                for _, piece in word:
+                    state = _apply(state, piece)
+                    line.append(piece)
+                return
+
+            if has_words and line_width + 1 + word_width > self.width:
+                fits_on_own_line = word_width <= self.width - len(
+                    self.subsequent_indent
+                )
+                if (
+                    fits_on_own_line
+                    or not self.break_long_words
+                    or line_width + 1 >= self.width
+                ):
+                    break_line()
+            if has_words:
+                line.append(" ")
+                line_width += 1
+
+            for is_escape, piece in word:
+                if is_escape:
+                    state = _apply(state, piece)
+                    line.append(piece)
+                    continue
+
+                while piece:
+                    room = self.width - line_width
+                    if len(piece) <= room or not self.break_long_words:
+                        line.append(piece)
+                        line_width += len(piece)
+                        break
+                    # Always make progress, even if the indent alone exceeds the width
+                    room = max(room, 1)
+                    line.append(piece[:room])
+                    piece = piece[room:]
+                    break_line()
+
+            has_words = True
+            word_width = 0
+
+        line = [self.initial_indent, state.sequence()]
+        line_width = len(self.initial_indent)
+
+        for m in _TOKEN.finditer(text):
+            kind = m.lastgroup
+            if kind == "space":
+                if word:
+                    place_word()
+                    word = []
+                continue
+
+            word.append((kind == "escape", m.group()))
+            if kind == "text":
+                word_width += len(m.group())
+
+        if word:
+            place_word()
+
+        if has_words or line[2:]:
+            if not state.is_default:
+                line.append(sgr.SGR_RESET)
+            lines.append("".join(line))
+
+        self.state = state
+        return lines
+
+    def fill(self, text: str) -> str:
+        """Wraps `text` and returns a single string with lines separated by newlines."""
+        return "\n".join(self.wrap(text))
+
+
+def wrap(text: str, width: int = 70, **kwargs: typing.Any) -> typing.List[str]:
+    """
+    Wraps styled `text` into lines of at most `width` visible characters.
+    Accepts the same keyword arguments as `AnsiWrapper`.
+    """
+    return AnsiWrapper(width=width, **kwargs).wrap(text)
+
+
+def fill(text: str, width: int = 70, **kwargs: typing.Any) -> str:
+    """Like `wrap`, but returns a single string with lines separated by newlines."""
+    return AnsiWrapper(width=width, **kwargs).fill(text)
+
+
+def wrap_stream(
+    paragraphs: typing.Iterable[str], width: int = 70, **kwargs: typing.Any
+) -> typing.Iterator[str]:
+    """
+    Lazily wraps a stream of paragraphs, yielding lines one paragraph at a time.
+    Styling left open at the end of a paragraph is carried over into the next one.
+    """
+    wrapper = AnsiWrapper(width=width, **kwargs)
+    for paragraph in paragraphs:
+        yield from wrapper.wrap(paragraph)
+
+
+def _apply(state: sgr.SgrState, escape: str) -> sgr.SgrState:
+    m = sgr.SGR.fullmatch(escape)
+    if m is None:
+        return state
+    return state.apply(m.group(1))
@@ -0,0 +1,411 @@
+"""
+Command line interface: `python -m coloredstrings [command]`.
+
+Without a command, prints a demo of the available styles.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import mmap
+import os
+import stat
+import sys
+import time
+import typing
+
+from coloredstrings import color_support, sgr, types, utils
+
+# Size of the blocks filters read and convert at once
+_BLOCK_SIZE = 1 << 20
+
+_MODES = {
+    "none": types.ColorMode.NO_COLOR,
+    "16": types.ColorMode.ANSI_16,
+    "256": types.ColorMode.EXTENDED_256,
+    "truecolor": types.ColorMode.TRUE_COLOR,
+}
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    try:
+        return args.run(args)  # type: ignore[no-any-return]
+    except BrokenPipeError:
+        # The reader went away, like `head` does: stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"{parser.prog}: error: {e}\n")
+    except KeyboardInterrupt:
+        return 130
+
+
+def _parser() -> argparse.ArgumentParser:
+    # Options accepted both before and after the command; they are only stored
+    # when given, so that the command's parser does not reset them.
+    common = argparse.ArgumentParser(add_help=False, argument_default=argparse.SUPPRESS)
+    colors = common.add_mutually_exclusive_group()
+    colors.add_argument(
+        "--mode",
+        choices=_MODES,
+        help="color mode of the output (default: detected on stdout)",
+    )
+    colors.add_argument(
+        "--color",
+        dest="mode",
+        action="store_const",
+        const="16",
+        help="force 16 colors",
+    )
+    colors.add_argument(
+        "--no-color",
+        dest="mode",
+        action="store_const",
+        const="none",
+        help="disable colors",
+    )
+
+    parser = argparse.ArgumentParser(
+        prog="python -m coloredstrings",
+        description="Colorize Different.",
+        parents=[common],
+    )
+    parser.set_defaults(run=demo)
+    commands = parser.add_subparsers(metavar="command")
+
+    demo_parser = commands.add_parser(
+        "demo", parents=[common], help="print a demo of the available styles"
+    )
+    demo_parser.set_defaults(run=demo)
+
+    strip_parser = commands.add_parser(
+        "strip",
+        parents=[common],
+        help="remove escape sequences",
+        description="Copies input files to stdout without escape sequences.",
+    )
+    _add_filter_arguments(strip_parser)
+    strip_parser.set_defaults(run=strip)
+
+    downsample_parser = commands.add_parser(
+        "downsample",
+        parents=[common],
+        help="re-encode colors for fewer colors",
+        description="Copies input files to stdout, re-encoding colors for the "
+        "color mode given by --mode (by default, 16 colors). Use the strip "
+        "command to remove colors.",
+    )
+    _add_filter_arguments(downsample_parser)
+    downsample_parser.set_defaults(run=downsample)
+
+    minify_parser = commands.add_parser(
+        "minify",
+        parents=[common],
+        help="remove redundant style sequences",
+        description="Copies input files to stdout without the SGR sequences "
+        "which do not change how text is rendered.",
+    )
+    _add_filter_arguments(minify_parser)
+    minify_parser.set_defaults(run=minify)
+
+    highlight_parser = commands.add_parser(
+        "highlight",
+        parents=[common],
+        help="highlight text matching regular expression rules",
+        description="Copies input files (by default, stdin) to stdout, "
+        "styling matches of the rules.",
+    )
+    highlight_parser.add_argument(
+        "rules", help="JSON or TOML file with a list of pattern/style rules"
+    )
+    _add_filter_arguments(highlight_parser)
+    highlight_parser.add_argument(
+        "-i", "--ignore-case", action="store_true", help="match rules ignoring case"
+    )
+    highlight_parser.add_argument(
+        "--bench",
+        action="store_true",
+        help="measure throughput on generated logs instead of reading input",
+    )
+    highlight_parser.set_defaults(run=highlight)
+    return parser
+
+
+def _add_filter_arguments(parser: argparse.ArgumentParser) -> None:
+    # Arguments of the commands filtering input files into stdout
+    parser.add_argument("files", nargs="*", help="input files (default: stdin)")
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="report bytes read and written and throughput on stderr",
+    )
+
+
+def _mode(args: argparse.Namespace) -> typing.Optional[types.ColorMode]:
+    mode = getattr(args, "mode", None)
+    return None if mode is None else _MODES[mode]
+
+
+def _inputs(files: typing.Sequence[str]) -> typing.Iterator[typing.BinaryIO]:
+    if not files:
+        yield sys.stdin.buffer
+        return
+    for name in files:
+        if name == "-":
+            yield sys.stdin.buffer
+        else:
+            with open(name, "rb") as f:
+                yield f
+
+
+def highlight(args: argparse.Namespace) -> int:
+    from coloredstrings.highlight import Highlighter, load_rules
+
+    rules = load_rules(args.rules)
+    mode = types.ColorMode.TRUE_COLOR if args.bench else _mode(args)
+    if mode is None:
+        mode = color_support.detect_color_support(sys.stdout)
+    highlighter = Highlighter(rules, mode=mode, ignore_case=args.ignore_case)
+    if args.bench:
+        _bench_highlight(highlighter)
+        return 0
+
+    stats = _Stats(sys.stdout.buffer)
+    for src in _inputs(args.files):
+        counter = _Counter(src)
+        highlighter.highlight_file(
+            typing.cast(typing.BinaryIO, counter), typing.cast(typing.BinaryIO, stats)
+        )
+        stats.bytes_in += counter.count
+    stats.close(args.stats)
+    return 0
+
+
+def strip(args: argparse.Namespace) -> int:
+    return _filter(args, _Stripper())
+
+
+def downsample(args: argparse.Namespace) -> int:
+    from coloredstrings.downsample import Downsampler
+
+    # Not detected: the output of a filter is usually a pipe or a file
+    mode = _mode(args)
+    if mode is None:
+        mode = types.ColorMode.ANSI_16
+    return _filter(args, Downsampler(mode))
+
+
+def minify(args: argparse.Namespace) -> int:
+    from coloredstrings.minify import Minifier
+
+    return _filter(args, Minifier())
+
+
+class _Converter(typing.Protocol):
+    def feed(self, chunk: str) -> str: ...
+
+    def close(self) -> str: ...
+
+
+class _Stripper:
+    """Streaming `strip_ansi`."""
+
+    def __init__(self) -> None:
+        self._pending = ""
+
+    def feed(self, chunk: str) -> str:
+        data, self._pending = sgr.split_incomplete(self._pending + chunk)
+        return utils.strip_ansi(data) if "\x1b" in data else data
+
+    def close(self) -> str:
+        data = self._pending
+        self._pending = ""
+        return utils.strip_ansi(data)
+
+
+def _filter(args: argparse.Namespace, converter: _Converter) -> int:
+    # Escape sequences are made of ASCII characters, which encode to the same single
+    # bytes in UTF-8 (and any ASCII compatible encoding) while other characters only
+    # use bytes above 0x7f. Decoding as Latin-1, a mere copy, is thus enough to
+    # process them, whatever the encoding and even if bytes are not valid in it.
+    stats = _Stats(sys.stdout.buffer)
+    feed = converter.feed
+    for src in _inputs(args.files):
+        for block in _blocks(src):
+            stats.bytes_in += len(block)
+            out = feed(block.decode("latin-1"))
+            if out:
+                stats.write(out.encode("latin-1"))
+    stats.write(converter.close().encode("latin-1"))
+    stats.close(args.stats)
+    return 0
+
+
+def _blocks(src: typing.BinaryIO) -> typing.Iterator[bytes]:
+    """Reads `src` by blocks, through a memory map when it is a regular file."""
+    size = _BLOCK_SIZE
+    try:
+        fd = src.fileno()
+        regular = stat.S_ISREG(os.fstat(fd).st_mode)
+        offset = src.tell() if regular else 0
+    except (OSError, io.UnsupportedOperation):
+        regular = False
+
+    if regular and os.fstat(fd).st_size > offset:
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as data:
+            for start in range(offset, len(data), size):
+                yield data[start : start + size]
+        return
+
+    yield from iter(lambda: src.read(size), b"")
+
+
+class _Counter:
+    """Reader counting the bytes read from a file."""
+
+    def __init__(self, src: typing.BinaryIO) -> None:
+        self._src = src
+        self.count = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._src.read(size)
+        self.count += len(data)
+        return data
+
+
+class _Stats:
+    """Writer counting bytes written to `dst`, reporting throughput for `--stats`."""
+
+    def __init__(self, dst: typing.BinaryIO) -> None:
+        self._dst = dst
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._start = time.perf_counter()
+
+    def write(self, data: bytes) -> int:
+        self.bytes_out += len(data)
+        return self._dst.write(data)
+
+    def close(self, report: bool) -> None:
+        self._dst.flush()
+        if not report:
+            return
+        elapsed = time.perf_counter() - self._start
+        ratio = self.bytes_out / self.bytes_in if self.bytes_in else 1.0
+        print(
+            f"{self.bytes_in} bytes in, {self.bytes_out} bytes out ({ratio:.1%}), "
+            f"{elapsed:.3f} s, {self.bytes_in / max(elapsed, 1e-9) / 1e6:.1f} MB/s",
+            file=sys.stderr,
+        )
+
+
+def _bench_highlight(highlighter: typing.Any) -> None:
+    lines = {
+        "plain lines": "2025-01-01 12:00:00 worker started, waiting for requests\n",
+        "matching lines": "2025-01-01 12:00:00 ERROR 127.0.0.1 GET /index.html 500\n",
+    }
+    size = 32 << 20
+    print(f"{'input':<16} {'MB/s':>8}")
+    for name, line in lines.items():
+        data = (line * (size // len(line))).encode()
+        src = io.BytesIO(data)
+        start = time.perf_counter()
+        highlighter.highlight_file(src, typing.cast(typing.BinaryIO, _Discard()))
+        elapsed = time.perf_counter() - start
+        print(f"{name:<16} {len(data) / elapsed / 1e6:>8.1f}")
+
+
+class _Discard:
+    def write(self, data: bytes) -> int:
+        return len(data)
+
+
+def demo(args: argparse.Namespace) -> int:
+    from coloredstrings import StyleBuilder
+
+    style = StyleBuilder(mode=_mode(args))
+
+    print(f"Current terminal type: {os.getenv('TERM')}")
+
+    print("-" * 78)
+
+    print("Test basic colors:")
+    print(style.black("Black color"))
+    print(style.red("Red color"))
+    print(style.green("Green color"))
+    print(style.yellow("Yellow color"))
+    print(style.blue("Blue color"))
+    print(style.magenta("Magenta color"))
+    print(style.cyan("Cyan color"))
+    print(style.white("White color"))
+    print(style.gray("Gray color (light black color)"))
+    print(style.bright_red("Light red color"))
+    print(style.bright_green("Light green color"))
+    print(style.bright_yellow("Light yellow color"))
+    print(style.bright_blue("Light blue color"))
+    print(style.bright_magenta("Light magenta color"))
+    print(style.bright_cyan("Light cyan color"))
+
+    print("-" * 78)
+
+    print("Test highlights:")
+    print(style.on.black("On black color"))
+    print(style.on.red("On red color"))
+    print(style.on.green("On green color"))
+    print(style.on.yellow("On yellow color"))
+    print(style.on.blue("On blue color"))
+    print(style.on.magenta("On magenta color"))
+    print(style.on.cyan("On cyan color"))
+    print(style.black.on.white("On white color"))
+    print(style.on.gray("On gray color (on light black color)"))
+    print(style.on.bright_red("On light red color"))
+    print(style.on.bright_green("On light green color"))
+    print(style.on.bright_yellow("On light yellow color"))
+    print(style.on.bright_blue("On light blue color"))
+    print(style.on.bright_magenta("On light magenta color"))
+    print(style.on.bright_cyan("On light cyan color"))
+
+    print("-" * 78)
+
+    print("Test attributes:")
+    print(style.black.bold("Bold black color"))
+    print(style.red.dim("Dim red color"))  # 'dark' mapped to dim()
+    print(style.green.underline("Underline green color"))
+    print(style.blue.inverse("Reversed blue color"))
+    print(style.cyan.bold.underline.inverse("Bold underline inverse cyan color"))
+    print(style.white.dim("Dim white color"))
+    print("Hidden:", style.hidden("you can't see it, eh?"))
+    print(style.strike("Striked"))
+    print(style.blink.rgb(255, 105, 180)("Blink hot pink color"))
+    print(style.rapid_blink.rgb(255, 0, 255)("Rapid pure magenta color"))
+    print(style.double_underline("Double underlined text"))
+    print(style.circle("Encircled text"))
+    print(style.framed("Framed text"))
+
+    print("-" * 78)
+
+    print("Test mixing:")
+    print(style.red.on.black.underline("Underline red on black color"))
+    print(style.green.on.red.inverse("Reversed green on red color"))
+
+    print("-" * 78)
+
+    print("Test RGB (truecolor):")
+    print(style.rgb(255, 0, 0)("Pure red text (255, 0, 0)"))
+    print(style.red("Default red for comparison"))
+    print(style.rgb(0, 255, 0)("Pure green text (0, 255, 0)"))
+    print(style.green("Default green for comparison"))
+    print(style.rgb(0, 0, 255)("Pure blue text (0, 0, 255)"))
+    print(style.blue("Default blue for comparison"))
+    print(style.rgb(255, 255, 0)("Pure yellow text (255, 255, 0)"))
+    print(style.yellow("Default yellow for comparison"))
+    print(style.rgb(0, 255, 255)("Pure cyan text (0, 255, 255)"))
+    print(style.cyan("Default cyan for comparison"))
+    print(style.rgb(255, 0, 255)("Pure magenta text (255, 0, 255)"))
+    print(style.magenta("Default magenta for comparison"))
+    print(style.rgb(255, 182, 193)("Light pink (255, 182, 193)"))
+    print(style.rgb(255, 105, 180)("Hot pink (255, 105, 180)"))
+    return 0
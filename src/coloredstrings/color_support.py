@@ -1,11 +1,34 @@
 import os
-import platform
 import re
 import sys
 import typing
 
 from coloredstrings import types
 
+_detected_mode: typing.Optional[types.ColorMode] = None
+
+
+def detected_color_mode() -> types.ColorMode:
+    """
+    Returns the color mode of `sys.stdout`, detected on the first call only.
+    Used by builders created without an explicit mode.
+    """
+    global _detected_mode
+    mode = _detected_mode
+    if mode is None:
+        mode = _detected_mode = detect_color_support(sys.stdout)
+    return mode
+
+
+def reset_detected_mode() -> None:
+    """
+    Forgets the mode detected by `detected_color_mode`, so that it is detected again
+    on the next render. Call it after changing what detection depends on, such as
+    `FORCE_COLOR` and `NO_COLOR`, `sys.stdout` or `sys.argv`.
+    """
+    global _detected_mode
+    _detected_mode = None
+
 
 def detect_color_support(stream: typing.TextIO = sys.stdout) -> types.ColorMode:
     """
@@ -55,6 +78,10 @@ def detect_color_support(stream: typing.TextIO = sys.stdout) -> types.ColorMode:
         return types.ColorMode.NO_COLOR
 
     # 4) Windows heuristics
+    # Imported here: `platform` is slow to import, and detection is deferred
+    # until the first render
+    import platform
+
     if platform.system() == "Windows":
         # platform.version() may be something like "10.0.19041"
         try:
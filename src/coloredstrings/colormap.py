@@ -0,0 +1,178 @@
+"""
+Coloring of numbers by value, for columns of reports: threshold bins or gradients.
+
+A colormap is a palette of styles and the bounds of the bins of values each one
+covers. The escape sequences of the palette are compiled once per `ColorMode`, so
+coloring a value is a binary search and a concatenation. NumPy arrays are binned
+in a single `numpy.searchsorted` call; NumPy is not required otherwise.
+"""
+
+from __future__ import annotations
+
+import bisect
+import sys
+import typing
+
+from coloredstrings import color_support, themes, types, utils
+from coloredstrings.style_builder import StyleBuilder
+
+Color = typing.Union[str, typing.Tuple[int, int, int]]
+"""A color: hex code or CSS name, or RGB tuple."""
+
+
+class Colormap:
+    """
+    Maps numbers to styles: values below `bounds[0]` get `styles[0]`, values
+    from `bounds[i - 1]` up to `bounds[i]` (excluded) get `styles[i]`, and values
+    from the last bound on get the last style. NaN gets the last style too.
+
+    ```python
+    latency = Colormap([100, 500], ["green", "yellow", "bold red"])
+    print("\\n".join(latency.render([12, 250, 1200], "{:>6} ms")))
+    ```
+    """
+
+    def __init__(
+        self,
+        bounds: typing.Sequence[float],
+        styles: typing.Sequence[typing.Union[str, StyleBuilder]],
+        mode: typing.Optional[types.ColorMode] = None,
+    ) -> None:
+        if len(styles) != len(bounds) + 1:
+            raise ValueError(
+                f"A colormap needs one style more than bounds, "
+                f"got {len(styles)} styles for {len(bounds)} bounds"
+            )
+        if any(a > b for a, b in zip(bounds, bounds[1:])):
+            raise ValueError("Bounds of a colormap must be sorted")
+
+        self.bounds = list(bounds)
+        self.styles = [
+            themes.parse_style(s) if isinstance(s, str) else s for s in styles
+        ]
+        self.mode = mode
+        # Opening and closing sequences of each style, by mode
+        self._palettes: typing.Dict[
+            types.ColorMode, typing.List[typing.Tuple[str, str]]
+        ] = {}
+
+    @classmethod
+    def gradient(
+        cls,
+        colors: typing.Sequence[Color],
+        vmin: float,
+        vmax: float,
+        steps: int = 64,
+        base: typing.Optional[StyleBuilder] = None,
+        mode: typing.Optional[types.ColorMode] = None,
+    ) -> Colormap:
+        """
+        Returns a colormap interpolating linearly between `colors`, spread evenly
+        from `vmin` to `vmax`, in `steps` bins. Values out of the range get the
+        first or last color. Colors are applied on top of `base`, like `bold`.
+        """
+        if len(colors) < 2:
+            raise ValueError("A gradient needs at least two colors")
+        if steps < 2:
+            raise ValueError("A gradient needs at least two steps")
+        if not vmin < vmax:
+            raise ValueError("A gradient needs vmin < vmax")
+
+        stops = [_rgb(c) for c in colors]
+        if base is None:
+            base = StyleBuilder()
+        styles = []
+        for step in range(steps):
+            # Position of the bin along the stops
+            position = step / (steps - 1) * (len(stops) - 1)
+            i = min(int(position), len(stops) - 2)
+            t = position - i
+            (r1, g1, b1), (r2, g2, b2) = stops[i], stops[i + 1]
+            styles.append(
+                base.rgb(
+                    round(r1 + (r2 - r1) * t),
+                    round(g1 + (g2 - g1) * t),
+                    round(b1 + (b2 - b1) * t),
+                )
+            )
+        width = (vmax - vmin) / steps
+        bounds = [vmin + width * step for step in range(1, steps)]
+        return cls(bounds, styles, mode=mode)
+
+    def index(self, values: typing.Iterable[float]) -> typing.List[int]:
+        """Returns the index of the style of each value."""
+        numpy = sys.modules.get("numpy")
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            indices = numpy.searchsorted(self.bounds, values, side="right")
+            return indices.tolist()  # type: ignore[no-any-return]
+
+        bounds = self.bounds
+        return [bisect.bisect_right(bounds, value) for value in values]
+
+    def code_pair(
+        self, value: float, mode: typing.Optional[types.ColorMode] = None
+    ) -> types.CodePair:
+        """Returns the escape sequences which open and close the style of `value`."""
+        start, end = self._palette(mode)[bisect.bisect_right(self.bounds, value)]
+        return types.CodePair(start=start, end=end)
+
+    def __call__(
+        self,
+        value: float,
+        format_spec: str = "",
+        mode: typing.Optional[types.ColorMode] = None,
+    ) -> str:
+        """Renders `value`, formatted with `format_spec`, in its style."""
+        start, end = self._palette(mode)[bisect.bisect_right(self.bounds, value)]
+        return f"{start}{format(value, format_spec)}{end}"
+
+    def render(
+        self,
+        values: typing.Iterable[float],
+        template: str = "{}",
+        mode: typing.Optional[types.ColorMode] = None,
+    ) -> typing.List[str]:
+        """
+        Renders a whole column: each value formatted with `template` (a `str.format`
+        string with a single positional field, like `"{:>8.2f}"`), in its style.
+        """
+        if sys.modules.get("numpy") is not None and hasattr(values, "tolist"):
+            indices = self.index(values)
+            values = values.tolist()
+        else:
+            values = list(values)
+            indices = self.index(values)
+
+        mode = self._mode(mode)
+        fmt = template.format
+        if mode == types.ColorMode.NO_COLOR:
+            return [fmt(value) for value in values]
+        palette = self._palette(mode)
+        return [
+            f"{palette[i][0]}{fmt(value)}{palette[i][1]}"
+            for i, value in zip(indices, values)
+        ]
+
+    def _mode(self, mode: typing.Optional[types.ColorMode]) -> types.ColorMode:
+        if mode is None:
+            mode = self.mode
+            if mode is None:
+                return color_support.detected_color_mode()
+        return mode
+
+    def _palette(
+        self, mode: typing.Optional[types.ColorMode]
+    ) -> typing.List[typing.Tuple[str, str]]:
+        mode = self._mode(mode)
+        palette = self._palettes.get(mode)
+        if palette is None:
+            pairs = [style.code_pair(mode) for style in self.styles]
+            palette = self._palettes[mode] = [(p.start, p.end) for p in pairs]
+        return palette
+
+
+def _rgb(color: Color) -> typing.Tuple[int, int, int]:
+    if isinstance(color, str):
+        rgb = utils.rgb_from_hex_or_named_color(color)
+        return (rgb.r, rgb.g, rgb.b)
+    return color
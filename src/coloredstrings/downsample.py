@@ -0,0 +1,113 @@
+"""
+Re-encoding of already styled text for terminals with fewer colors.
+
+Extended colors in SGR sequences (`38;2;r;g;b`, `48;5;n`, ...) are rewritten with the
+same conversions `stylize` uses, everything else is passed through unchanged.
+Underline colors (`58;2;r;g;b`) are rewritten as 256 colors, and removed for
+`ColorMode.ANSI_16`, which has no form of them. With `ColorMode.NO_COLOR`, SGR
+sequences are removed altogether.
+"""
+
+from __future__ import annotations
+
+import typing
+
+from coloredstrings import sgr, stylize, types, utils
+
+_DEFAULT_CHUNK_SIZE = 1 << 16
+
+_sequences: utils._ConcurrentCache[typing.Tuple[str, types.ColorMode], str] = (
+    utils._ConcurrentCache("downsample.sequence", maxsize=4096)
+)
+
+
+class Downsampler:
+    """Streaming re-encoder of styled text into a lower `ColorMode`."""
+
+    def __init__(self, mode: types.ColorMode) -> None:
+        self.mode = mode
+        self._pending = ""
+
+    def feed(self, chunk: str) -> str:
+        """Re-encodes the next chunk of text, keeping back a trailing incomplete escape sequence."""
+        data, self._pending = sgr.split_incomplete(self._pending + chunk)
+        return self._convert(data)
+
+    def close(self) -> str:
+        """Flushes text kept back at the end of the input."""
+        data = self._pending
+        self._pending = ""
+        return self._convert(data)
+
+    def _convert(self, data: str) -> str:
+        if "\x1b" not in data or self.mode == types.ColorMode.TRUE_COLOR:
+            return data
+
+        mode = self.mode
+        return sgr.SGR.sub(lambda m: _convert_sequence(m.group(1), mode), data)
+
+
+def _convert_sequence(params: str, mode: types.ColorMode) -> str:
+    key = (params, mode)
+    sequence = _sequences.get(key)
+    if sequence is None:
+        sequence = _sequences.put(key, _converted_sequence(params, mode))
+    return sequence
+
+
+def _converted_sequence(params: str, mode: types.ColorMode) -> str:
+    if mode == types.ColorMode.NO_COLOR:
+        return ""
+
+    converted = []
+    for raw, code, color in sgr.parse_params(params):
+        if color is None or mode == types.ColorMode.TRUE_COLOR:
+            converted.append(raw)
+        elif code == 58:
+            if mode == types.ColorMode.EXTENDED_256:
+                start = stylize.code_pair(color, is_bg=False, mode=mode).start
+                converted.append(f"58{start[4:-1]}")
+        else:
+            start = stylize.code_pair(color, is_bg=code == 48, mode=mode).start
+            converted.append(start[2:-1])
+    if not converted:
+        # An empty sequence would reset the terminal
+        return ""
+    return f"\x1b[{';'.join(converted)}m"
+
+
+def downsample(text: str, mode: types.ColorMode) -> str:
+    """Re-encodes colors of styled `text` for a terminal supporting `mode`."""
+    converter = Downsampler(mode)
+    return converter.feed(text) + converter.close()
+
+
+def downsample_stream(
+    chunks: typing.Iterable[str], mode: types.ColorMode
+) -> typing.Iterator[str]:
+    """Lazily re-encodes a stream of text chunks."""
+    converter = Downsampler(mode)
+    for chunk in chunks:
+        out = converter.feed(chunk)
+        if out:
+            yield out
+    out = converter.close()
+    if out:
+        yield out
+
+
+def downsample_file(
+    src: typing.TextIO,
+    dst: typing.TextIO,
+    mode: types.ColorMode,
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+) -> None:
+    """
+    Copies `src` into `dst`, re-encoding colors for `mode`.
+
+    The input is read in chunks of `chunk_size` characters, so this works as
+    a pipe filter on `sys.stdin`/`sys.stdout` with constant memory.
+    """
+    chunks = iter(lambda: src.read(chunk_size), "")
+    for out in downsample_stream(chunks, mode):
+        dst.write(out)
@@ -0,0 +1,140 @@
+"""
+Registry of the user-defined styles added by `StyleBuilder.extend`.
+"""
+
+from __future__ import annotations
+
+import typing
+
+from coloredstrings import types, utils
+
+if typing.TYPE_CHECKING:
+    from coloredstrings.style_builder import StyleBuilder
+
+Extension = typing.Union[str, typing.Tuple[int, int, int], "StyleBuilder"]
+
+# Upper bound for the lookups memoized by a registry: misses are memoized too,
+# and unknown names (colors like `pink`) are unbounded.
+_MAX_MEMOIZED = 4096
+
+_MISSING = object()
+
+
+class ExtensionRegistry(typing.Mapping[str, Extension]):
+    """
+    Immutable mapping of extension names to styles.
+
+    Extending a registry creates a child which only stores the new entries and
+    points to its parent, so `extend` costs the size of the extension rather than
+    of the whole registry, and every builder derived from the result shares it.
+    Colors given as strings or tuples are parsed once, when they are registered.
+    """
+
+    def __init__(
+        self,
+        entries: typing.Optional[typing.Mapping[str, Extension]] = None,
+        parent: typing.Optional[ExtensionRegistry] = None,
+    ) -> None:
+        if parent is not None and not parent._entries and parent._parent is None:
+            parent = None
+
+        self._parent: typing.Optional[ExtensionRegistry] = parent
+        # Registered values, and what they resolve to: an `Rgb` for colors,
+        # the value itself otherwise
+        self._entries: typing.Dict[str, typing.Tuple[Extension, typing.Any]] = {
+            name: (value, _resolve(value)) for name, value in (entries or {}).items()
+        }
+        # Results of `resolve`, including misses, so that a lookup walks the chain
+        # of parents once per name
+        self._memo: typing.Dict[str, typing.Any] = {}
+        self._len: typing.Optional[int] = None
+        self._hash: typing.Optional[int] = None
+
+    def extend(self, entries: typing.Mapping[str, Extension]) -> ExtensionRegistry:
+        """Returns a registry with `entries` added, overriding entries of the same name."""
+        if not entries:
+            return self
+        return ExtensionRegistry(entries, parent=self)
+
+    def resolve(self, name: str) -> typing.Optional[typing.Any]:
+        """
+        Returns the ready to use value of an extension: an `Rgb` for colors
+        given as strings or tuples, the registered value otherwise;
+        `None` if there is no such extension.
+        """
+        resolved = self._memo.get(name, _MISSING)
+        if resolved is _MISSING:
+            entry = self._entry(name)
+            resolved = None if entry is None else entry[1]
+            if len(self._memo) >= _MAX_MEMOIZED:
+                self._memo.clear()
+            self._memo[name] = resolved
+        return resolved
+
+    def _entry(self, name: str) -> typing.Optional[typing.Tuple[Extension, typing.Any]]:
+        registry: typing.Optional[ExtensionRegistry] = self
+        while registry is not None:
+            entry = registry._entries.get(name)
+            if entry is not None:
+                return entry
+            registry = registry._parent
+        return None
+
+    def _flatten(self) -> typing.Dict[str, Extension]:
+        chain = []
+        registry: typing.Optional[ExtensionRegistry] = self
+        while registry is not None:
+            chain.append(registry)
+            registry = registry._parent
+
+        flat: typing.Dict[str, Extension] = {}
+        for registry in reversed(chain):
+            flat.update((name, value) for name, (value, _) in registry._entries.items())
+        return flat
+
+    def __getitem__(self, name: str) -> Extension:
+        entry = self._entry(name)
+        if entry is None:
+            raise KeyError(name)
+        return entry[0]
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self._flatten())
+
+    def __len__(self) -> int:
+        if self._len is None:
+            self._len = len(self._flatten())
+        return self._len
+
+    def __hash__(self) -> int:
+        # Registries are immutable, and must be hashable to be the default value
+        # of a dataclass field on Python 3.11+; builders are hashed as cache keys,
+        # so the chain of parents is flattened once
+        if self._hash is None:
+            self._hash = hash(frozenset(self._flatten().items()))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"ExtensionRegistry({self._flatten()!r})"
+
+    def __reduce__(self) -> typing.Tuple[typing.Any, ...]:
+        # Memoized lookups are not worth pickling; parents are shared by reference
+        return (
+            ExtensionRegistry,
+            (
+                {name: value for name, (value, _) in self._entries.items()},
+                self._parent,
+            ),
+        )
+
+
+EMPTY_REGISTRY = ExtensionRegistry()
+"""Registry without extensions, shared by builders which were never extended."""
+
+
+def _resolve(value: Extension) -> typing.Any:
+    if isinstance(value, str):
+        return utils.rgb_from_hex_or_named_color(value)
+    if isinstance(value, tuple):
+        return types.Rgb(r=value[0], g=value[1], b=value[2])
+    return value
@@ -0,0 +1,371 @@
+"""
+Highlighting of plain text, as done by log colorizers: by regular expression rules
+(`Highlighter`), or by large sets of literal keywords (`KeywordHighlighter`).
+
+All rules are compiled into a single regular expression, an alternation of the
+rules, so the text is scanned once whatever the number of rules. The alternation
+has no capturing groups, which would slow down every attempt to match; the rule
+which matched is found again only for actual matches, which are rare in logs.
+
+Keywords are searched with an Aho-Corasick automaton instead: a regular expression
+tries every alternative in turn at every position, so its cost grows with the
+number of keywords, while the automaton follows a single transition per character.
+"""
+
+from __future__ import annotations
+
+import codecs
+import re
+import typing
+
+from coloredstrings import color_support, sgr, themes, types
+from coloredstrings.style_builder import StyleBuilder
+
+_DEFAULT_BLOCK_SIZE = 1 << 20
+
+# Inline flags at the start of a rule, which would apply to every rule of the alternation
+_GLOBAL_FLAGS = re.compile(r"\(\?([aiLmsux]+)\)")
+
+Rule = typing.Tuple[str, typing.Union[str, StyleBuilder]]
+"""A regular expression and the style of its matches, as a builder or a specification."""
+
+
+class Highlighter:
+    """
+    Styles every match of a set of rules.
+
+    Rules are tried in order at every position, the first matching one wins, and
+    matches do not overlap. `^` and `$` match at the start and end of every line.
+    Rules must not use numbered backreferences, since their groups are renumbered
+    in the combined expression; named ones work, as long as no two rules use the
+    same group name. Inline flags, like `(?i)`, must be at the start of a rule and
+    only apply to it.
+
+    Raises
+    ------
+    ValueError
+        If a rule has an invalid regular expression or style specification, or
+        rules cannot be combined, like when they reuse a group name.
+    """
+
+    def __init__(
+        self,
+        rules: typing.Iterable[Rule],
+        mode: typing.Optional[types.ColorMode] = None,
+        ignore_case: bool = False,
+    ) -> None:
+        if mode is None:
+            mode = color_support.detected_color_mode()
+        self.mode = mode
+
+        flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+        self._rules: typing.List[typing.Tuple[typing.Pattern[str], str, str]] = []
+        # Rules as groups of the alternation, with their own inline flags
+        alternatives = []
+        for pattern, style in rules:
+            if isinstance(style, str):
+                style = themes.parse_style(style)
+            pair = style.code_pair(mode)
+            alternative = _scoped(pattern)
+            try:
+                compiled = re.compile(pattern, flags)
+                scoped = re.compile(alternative, flags)
+            except re.error as e:
+                raise ValueError(
+                    f"Invalid pattern {pattern!r} of highlighting rule: {e}"
+                ) from None
+            if scoped.flags != re.compile("", flags).flags:
+                raise ValueError(
+                    f"Inline flags of pattern {pattern!r} of highlighting rule "
+                    "must be at its start"
+                )
+            self._rules.append((compiled, pair.start, pair.end))
+            alternatives.append(alternative)
+
+        self._pattern: typing.Optional[typing.Pattern[str]] = None
+        if self._rules:
+            try:
+                combined = re.compile("|".join(alternatives), flags)
+            except re.error as e:
+                raise ValueError(
+                    f"Highlighting rules cannot be combined: {e}"
+                ) from None
+            if mode != types.ColorMode.NO_COLOR:
+                self._pattern = combined
+
+    @property
+    def is_noop(self) -> bool:
+        """Whether highlighting leaves text unchanged (no rules, or no colors)."""
+        return self._pattern is None
+
+    def highlight(self, text: str) -> str:
+        if self._pattern is None:
+            return text
+        return self._pattern.sub(self._replace, text)
+
+    def _replace(self, m: typing.Match[str]) -> str:
+        text = m.group()
+        if not text:
+            return text
+        # Like the alternation, the first rule matching at this position wins
+        string, pos = m.string, m.start()
+        for pattern, start, end in self._rules:
+            if pattern.match(string, pos):
+                return f"{start}{text}{end}"
+        return text  # pragma: no cover
+
+    def highlight_file(
+        self,
+        src: typing.BinaryIO,
+        dst: typing.BinaryIO,
+        block_size: int = _DEFAULT_BLOCK_SIZE,
+        encoding: str = "utf-8",
+    ) -> None:
+        """
+        Copies `src` into `dst`, highlighting it block by block.
+
+        Blocks are cut at line ends, so matches never span two lines. Bytes which
+        are not valid in `encoding` are passed through unchanged.
+        """
+        if self._pattern is None:
+            _copy(src, dst, block_size)
+        else:
+            _highlight_file(self.highlight, src, dst, block_size, encoding)
+
+
+def _scoped(pattern: str) -> str:
+    """Returns `pattern` as a group, with its leading inline flags scoped to it."""
+    letters = []
+    pos = 0
+    m = _GLOBAL_FLAGS.match(pattern)
+    while m is not None:
+        letters.append(m.group(1))
+        pos = m.end()
+        m = _GLOBAL_FLAGS.match(pattern, pos)
+    flags = "".join(letters)
+    # In verbose mode, a comment at the end would swallow the closing parenthesis
+    end = "\n)" if "x" in flags else ")"
+    return f"(?{flags}:{pattern[pos:]}{end}"
+
+
+class KeywordHighlighter:
+    """
+    Styles every occurrence of a set of literal keywords, like known host names or
+    error codes, in time linear in the length of the text whatever their number.
+
+    Among overlapping occurrences, the leftmost one wins, then the longest one.
+    With `whole_words`, occurrences next to a letter, digit or underscore are
+    ignored. Adjacent occurrences are joined by the shortest sequence switching
+    from a style to the next, rather than closing one and opening the other.
+    """
+
+    def __init__(
+        self,
+        keywords: typing.Mapping[str, typing.Union[str, StyleBuilder]],
+        mode: typing.Optional[types.ColorMode] = None,
+        whole_words: bool = False,
+    ) -> None:
+        if mode is None:
+            mode = color_support.detected_color_mode()
+        self.mode = mode
+        self.whole_words = whole_words
+
+        # Per keyword: its length, the terminal state its style sets, and the
+        # sequences opening and closing it; styles are parsed once each
+        self._keywords: typing.List[typing.Tuple[int, sgr.SgrState, str, str]] = []
+        styles: typing.Dict[typing.Any, typing.Tuple[sgr.SgrState, str, str]] = {}
+        for keyword, style in keywords.items():
+            if not keyword:
+                raise ValueError("Keywords must not be empty")
+            compiled = styles.get(style)
+            if compiled is None:
+                builder = themes.parse_style(style) if isinstance(style, str) else style
+                pair = builder.code_pair(mode)
+                state = sgr.state_after(pair.start)
+                compiled = styles[style] = (state, pair.start, pair.end)
+            self._keywords.append((len(keyword), *compiled))
+
+        # The automaton: a trie of the keywords, where `_fail[n]` is the node of the
+        # longest proper suffix of node `n` in the trie, and `_outputs[n]` the indices
+        # of the keywords ending at node `n`, including through its suffixes
+        self._goto: typing.List[typing.Dict[str, int]] = [{}]
+        self._fail = [0]
+        self._outputs: typing.List[typing.Tuple[int, ...]] = [()]
+        if mode != types.ColorMode.NO_COLOR and keywords:
+            self._build(keywords)
+            self._first_chars = re.compile(
+                "[" + "".join(re.escape(char) for char in self._goto[0]) + "]"
+            )
+
+    def _build(self, keywords: typing.Iterable[str]) -> None:
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        for index, keyword in enumerate(keywords):
+            node = 0
+            for char in keyword:
+                child = goto[node].get(char)
+                if child is None:
+                    child = goto[node][char] = len(goto)
+                    goto.append({})
+                    fail.append(0)
+                    outputs.append(())
+                node = child
+            outputs[node] += (index,)
+
+        # Breadth first, so that the suffixes of a node are done before it
+        queue = list(goto[0].values())
+        for node in queue:
+            for char, child in goto[node].items():
+                suffix = fail[node]
+                while char not in goto[suffix] and suffix:
+                    suffix = fail[suffix]
+                fail[child] = goto[suffix].get(char, 0)
+                outputs[child] += outputs[fail[child]]
+                queue.append(child)
+
+    @property
+    def is_noop(self) -> bool:
+        """Whether highlighting leaves text unchanged (no keywords, or no colors)."""
+        return not self._goto[0]
+
+    def highlight(self, text: str) -> str:
+        if not self._goto[0]:
+            return text
+
+        goto, fail, outputs, keywords = (
+            self._goto,
+            self._fail,
+            self._outputs,
+            self._keywords,
+        )
+        found: typing.List[typing.Tuple[int, int, int]] = []
+        node = 0
+        pos = 0
+        length = len(text)
+        # At the root, skip to the next character starting a keyword in one search
+        skip = self._first_chars.search
+        while pos < length:
+            if not node:
+                m = skip(text, pos)
+                if m is None:
+                    break
+                pos = m.start()
+            char = text[pos]
+            pos += 1
+            child = goto[node].get(char)
+            while child is None and node:
+                node = fail[node]
+                child = goto[node].get(char)
+            node = child or 0
+            if outputs[node]:
+                found.extend((pos - keywords[i][0], pos, i) for i in outputs[node])
+        if not found:
+            return text
+
+        found.sort(key=lambda f: (f[0], -f[1]))
+        out = []
+        pos = 0
+        # Style of the occurrence just written, still open
+        state: typing.Optional[sgr.SgrState] = None
+        close = ""
+        for start, end, index in found:
+            if start < pos or (self.whole_words and not _is_word(text, start, end)):
+                continue
+            next_state, open_, next_close = keywords[index][1:]
+            if state is not None and start == pos:
+                out.append(sgr.transition(state, next_state))
+            else:
+                out.append(close)
+                out.append(text[pos:start])
+                out.append(open_)
+            out.append(text[start:end])
+            pos = end
+            state, close = next_state, next_close
+
+        out.append(close)
+        out.append(text[pos:])
+        return "".join(out)
+
+    def highlight_file(
+        self,
+        src: typing.BinaryIO,
+        dst: typing.BinaryIO,
+        block_size: int = _DEFAULT_BLOCK_SIZE,
+        encoding: str = "utf-8",
+    ) -> None:
+        """
+        Copies `src` into `dst`, highlighting it block by block.
+
+        Blocks are cut at line ends, so keywords spanning two lines are not found.
+        Bytes which are not valid in `encoding` are passed through unchanged.
+        """
+        if not self._goto[0]:
+            _copy(src, dst, block_size)
+        else:
+            _highlight_file(self.highlight, src, dst, block_size, encoding)
+
+
+def _is_word(text: str, start: int, end: int) -> bool:
+    before = text[start - 1] if start else " "
+    after = text[end] if end < len(text) else " "
+    return not (before.isalnum() or before == "_" or after.isalnum() or after == "_")
+
+
+def _copy(src: typing.BinaryIO, dst: typing.BinaryIO, block_size: int) -> None:
+    read = src.read
+    write = dst.write
+    for block in iter(lambda: read(block_size), b""):
+        write(block)
+
+
+def _highlight_file(
+    highlight: typing.Callable[[str], str],
+    src: typing.BinaryIO,
+    dst: typing.BinaryIO,
+    block_size: int,
+    encoding: str,
+) -> None:
+    read = src.read
+    write = dst.write
+    decoder = codecs.getincrementaldecoder(encoding)("surrogateescape")
+    rest = ""
+    for block in iter(lambda: read(block_size), b""):
+        text = rest + decoder.decode(block)
+        cut = text.rfind("\n") + 1
+        rest = text[cut:]
+        if cut:
+            write(highlight(text[:cut]).encode(encoding, "surrogateescape"))
+
+    rest += decoder.decode(b"", final=True)
+    if rest:
+        write(highlight(rest).encode(encoding, "surrogateescape"))
+
+
+def load_rules(path: themes._Path) -> typing.List[Rule]:
+    """
+    Loads highlighting rules from a JSON or TOML file: a list of tables with
+    a `pattern` and a `style` specification (see `themes.parse_style`).
+    In TOML, the list is named `rule`:
+
+    ```toml
+    [[rule]]
+    pattern = '\\bERROR\\b'
+    style = "bold red"
+    ```
+
+    Raises
+    ------
+    ValueError
+        If the file does not have this structure.
+    """
+    data = themes.read_file(path)
+    if isinstance(data, dict):
+        data = data.get("rule")
+
+    if not isinstance(data, list) or not all(
+        isinstance(rule, dict)
+        and isinstance(rule.get("pattern"), str)
+        and isinstance(rule.get("style"), str)
+        for rule in data
+    ):
+        raise ValueError(f"{path}: expected a list of rules with a pattern and a style")
+    return [(rule["pattern"], rule["style"]) for rule in data]
@@ -0,0 +1,155 @@
+"""
+Colored output for the standard `logging` module.
+
+Styles are turned into escape sequences once, when the formatter is created: each
+level gets its own format string with the codes baked around the styled fields, so
+formatting a record costs a single dictionary lookup on top of `logging.Formatter`.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import re
+import sys
+import typing
+
+from coloredstrings import color_support, types
+from coloredstrings.style_builder import StyleBuilder
+
+_style = StyleBuilder(mode=types.ColorMode.TRUE_COLOR)
+
+DEFAULT_LEVEL_STYLES: typing.Dict[int, StyleBuilder] = {
+    logging.DEBUG: _style.dim,
+    logging.INFO: _style.green,
+    logging.WARNING: _style.yellow,
+    logging.ERROR: _style.red,
+    logging.CRITICAL: _style.red.bold,
+}
+"""Styles used for levels when none are given."""
+
+del _style
+
+# Placeholders of a single field, capturing its name, for each of the `style`s
+# supported by `logging.Formatter`.
+_FIELDS = {
+    "%": re.compile(
+        r"%\((\w+)\)[#0+ -]*(?:\*|\d+)?(?:\.(?:\*|\d+))?[diouxXeEfFgGcrsa]"
+    ),
+    "{": re.compile(r"(?<!\{)\{(\w+)(?:![rsa])?(?::[^{}]*)?\}"),
+    "$": re.compile(r"\$(?:(\w+)|\{(\w+)\})"),
+}
+
+
+class ColoredFormatter(logging.Formatter):
+    """
+    `logging.Formatter` which styles fields of the format string.
+
+    The fields named in `level_fields` (by default, only `levelname`) are styled
+    according to the level of the record: levels without a style of their own use
+    the style of the closest lower level. `field_styles` maps other field names,
+    such as `asctime` or `name`, to styles used for every record.
+
+    The color mode is detected on `stream` unless `mode` is given. With
+    `ColorMode.NO_COLOR`, records are formatted by `logging.Formatter` as is.
+    """
+
+    def __init__(
+        self,
+        fmt: typing.Optional[str] = None,
+        datefmt: typing.Optional[str] = None,
+        style: str = "%",
+        validate: bool = True,
+        *,
+        level_styles: typing.Optional[typing.Mapping[int, StyleBuilder]] = None,
+        field_styles: typing.Optional[typing.Mapping[str, StyleBuilder]] = None,
+        level_fields: typing.Iterable[str] = ("levelname",),
+        mode: typing.Optional[types.ColorMode] = None,
+        stream: typing.Optional[typing.TextIO] = None,
+    ) -> None:
+        super().__init__(fmt, datefmt, style, validate)  # type: ignore[arg-type]
+
+        if mode is None:
+            mode = color_support.detect_color_support(
+                sys.stderr if stream is None else stream
+            )
+        self.mode = mode
+
+        # Formatting styles (in the `logging` sense) keyed by level number;
+        # `None` when records are formatted without colors.
+        self._level_formats: typing.Optional[typing.Dict[int, logging.PercentStyle]]
+        self._level_formats = None
+        if mode == types.ColorMode.NO_COLOR:
+            return
+
+        if level_styles is None:
+            level_styles = DEFAULT_LEVEL_STYLES
+        field_codes = {
+            name: s.code_pair(mode) for name, s in (field_styles or {}).items()
+        }
+        level_fields = frozenset(level_fields)
+
+        self._levels = sorted(level_styles)
+        self._level_formats = {}
+        for level in self._levels:
+            codes = dict(field_codes)
+            codes.update(
+                (name, level_styles[level].code_pair(mode)) for name in level_fields
+            )
+            self._level_formats[level] = self._compile(style, codes)
+        self._default_format = self._compile(style, field_codes)
+
+    def _compile(
+        self, style: str, codes: typing.Mapping[str, types.CodePair]
+    ) -> logging.PercentStyle:
+        def wrap(m: typing.Match[str]) -> str:
+            pair = codes.get(m.group(m.lastindex or 1))
+            if pair is None:
+                return m.group()
+            return f"{pair.start}{m.group()}{pair.end}"
+
+        fmt = _FIELDS[style].sub(wrap, self._style._fmt)
+        defaults = getattr(self._style, "_defaults", None)
+        if defaults:
+            # Python 3.10+: keep default values of fields given to the formatter
+            return type(self._style)(fmt, defaults=defaults)  # type: ignore[call-arg]
+        return type(self._style)(fmt)
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        formats = self._level_formats
+        if formats is None:
+            return self._style.format(record)
+
+        level_format = formats.get(record.levelno)
+        if level_format is None:
+            level_format = self._level_format(record.levelno)
+        return level_format.format(record)
+
+    def _level_format(self, levelno: int) -> logging.PercentStyle:
+        assert self._level_formats is not None
+        i = bisect.bisect_right(self._levels, levelno)
+        level_format = (
+            self._level_formats[self._levels[i - 1]] if i else self._default_format
+        )
+        # Custom levels are few, so they are memoized like the configured ones
+        self._level_formats[levelno] = level_format
+        return level_format
+
+
+class ColoredHandler(logging.StreamHandler):  # type: ignore[type-arg]
+    """
+    `logging.StreamHandler` using a `ColoredFormatter`
+    whose color mode is detected on the handler's stream.
+    """
+
+    def __init__(
+        self,
+        stream: typing.Optional[typing.TextIO] = None,
+        fmt: typing.Optional[str] = None,
+        datefmt: typing.Optional[str] = None,
+        style: str = "%",
+        **formatter_options: typing.Any,
+    ) -> None:
+        super().__init__(stream)
+        formatter_options.setdefault("stream", self.stream)
+        self.setFormatter(ColoredFormatter(fmt, datefmt, style, **formatter_options))
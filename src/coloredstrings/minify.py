@@ -0,0 +1,133 @@
+"""
+Removal of redundant SGR sequences from already styled text.
+
+Nested styling leaves runs like `ESC[39mESC[31mESC[39m` which do not change what
+is rendered. The minifier tracks the state the terminal would be in and only emits
+a single, shortest sequence right before text that is rendered in a different state.
+"""
+
+from __future__ import annotations
+
+import typing
+
+from coloredstrings import sgr
+
+_DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+class Minifier:
+    """
+    Streaming SGR minifier.
+
+    Pending style changes are emitted right before the next visible character or
+    non-SGR escape sequence (which may depend on the current colors, like erasing),
+    and once more when the input is closed, so the rendered result is unchanged.
+
+    Sequences with parameters the state does not track, like underline colors or
+    fonts, are kept as they are, and so are the following ones until the input
+    resets the terminal, since the shortest transitions could reset them too.
+    """
+
+    def __init__(self) -> None:
+        self.bytes_in = 0
+        """Size of the text fed so far, in bytes once encoded in UTF-8."""
+        self.bytes_out = 0
+        """Size of the text produced so far, in bytes once encoded in UTF-8."""
+        self._pending = ""
+        self._desired = sgr.DEFAULT_STATE
+        self._emitted = sgr.DEFAULT_STATE
+        # Whether the terminal may be in a state set by untracked parameters
+        self._untracked = False
+
+    @property
+    def saved(self) -> int:
+        """Number of bytes removed so far."""
+        return self.bytes_in - self.bytes_out
+
+    def feed(self, chunk: str) -> str:
+        """Minifies the next chunk of text, keeping back pending style changes."""
+        self.bytes_in += _size(chunk)
+        data, self._pending = sgr.split_incomplete(self._pending + chunk)
+        out = self._minify(data)
+        self.bytes_out += _size(out)
+        return out
+
+    def close(self) -> str:
+        """Flushes the end of the input, leaving the terminal in its final state."""
+        out = self._minify(self._pending) + self._flush()
+        self._pending = ""
+        self.bytes_out += _size(out)
+        return out
+
+    def _flush(self) -> str:
+        sequence = sgr.transition(self._emitted, self._desired)
+        self._emitted = self._desired
+        return sequence
+
+    def _minify(self, data: str) -> str:
+        if "\x1b" not in data:
+            return self._flush() + data if data else ""
+
+        out = []
+        pos = 0
+        for m in sgr.ESCAPE.finditer(data):
+            start = m.start()
+            if start > pos:
+                if self._desired is not self._emitted:
+                    out.append(self._flush())
+                out.append(data[pos:start])
+            pos = m.end()
+
+            params = m.group(1)
+            if params is None:
+                if self._desired is not self._emitted:
+                    out.append(self._flush())
+                out.append(m.group())
+            elif self._untracked or not sgr.is_tracked(params):
+                if self._desired is not self._emitted:
+                    out.append(self._flush())
+                out.append(m.group())
+                self._desired = self._emitted = self._desired.apply(params)
+                self._untracked = not (
+                    sgr.is_tracked(params)
+                    and any(n == 0 for _, n, _ in sgr.parse_params(params))
+                )
+            else:
+                self._desired = self._desired.apply(params)
+
+        if pos < len(data):
+            if self._desired is not self._emitted:
+                out.append(self._flush())
+            out.append(data[pos:])
+        return "".join(out)
+
+
+def _size(text: str) -> int:
+    return len(text) if text.isascii() else len(text.encode("utf-8", "surrogatepass"))
+
+
+def minify(text: str) -> str:
+    """Returns `text` without SGR sequences which do not change how it is rendered."""
+    minifier = Minifier()
+    return minifier.feed(text) + minifier.close()
+
+
+def minify_stream(chunks: typing.Iterable[str]) -> typing.Iterator[str]:
+    """Lazily minifies a stream of text chunks."""
+    minifier = Minifier()
+    for chunk in chunks:
+        out = minifier.feed(chunk)
+        if out:
+            yield out
+    out = minifier.close()
+    if out:
+        yield out
+
+
+def minify_file(
+    src: typing.TextIO, dst: typing.TextIO, chunk_size: int = _DEFAULT_CHUNK_SIZE
+) -> None:
+    """Copies `src` into `dst`, minifying it chunk by chunk."""
+    chunks = iter(lambda: src.read(chunk_size), "")
+    for out in minify_stream(chunks):
+        dst.write(out)
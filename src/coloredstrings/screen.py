@@ -0,0 +1,275 @@
+"""
+Screens of styled text redrawn in place, for live dashboards.
+
+A `Screen` is a grid of cells, each holding a character and the index of its style.
+Styles are registered once and stored as terminal states, so comparing cells is
+comparing integers. The screen is double-buffered: cells are written to a back
+buffer, and `render` diffs it against the frame last rendered, emitting only the
+changed cells, with the shortest cursor movements and the smallest SGR transitions
+between styles. Redrawing a dashboard where a few numbers changed costs a few dozen
+bytes instead of the whole screen.
+
+Characters are assumed to be one column wide, and the screen to be drawn at the
+top left corner of the terminal.
+"""
+
+from __future__ import annotations
+
+import typing
+
+from coloredstrings import color_support, sgr, types
+from coloredstrings.style_builder import StyleBuilder
+
+_CLEAR = f"{sgr.SGR_RESET}\x1b[H\x1b[2J"
+
+_ERASE_LINE = "\x1b[K"
+
+# Unchanged cells are rewritten rather than moved over when they are at most this
+# many, since a cursor movement takes at least four bytes
+_MAX_BRIDGE = 4
+
+Style = typing.Union[int, StyleBuilder, None]
+"""A style of cells: the index returned by `Screen.style`, a builder, or `None` for none."""
+
+
+class Screen:
+    """
+    Grid of `width` by `height` cells rendered for `mode` (by default, the detected
+    mode), redrawing only what changed since the previous frame.
+
+    ```python
+    screen = Screen(80, 24)
+    ok = screen.style(cs.green.bold)
+    screen.put(0, 0, "status:")
+    screen.put(8, 0, "OK", ok)
+    sys.stdout.write(screen.render())  # draws the whole screen
+    screen.put(8, 0, "KO", screen.style(cs.red.bold))
+    sys.stdout.write(screen.render())  # rewrites two cells
+    ```
+
+    Cells keep their content between frames, so a frame only needs to write
+    what changed; `clear` blanks the back buffer for frames drawn from scratch.
+    """
+
+    def __init__(
+        self, width: int, height: int, mode: typing.Optional[types.ColorMode] = None
+    ) -> None:
+        if width <= 0 or height <= 0:
+            raise ValueError(f"Invalid screen size {width}x{height}")
+
+        self.mode = color_support.detected_color_mode() if mode is None else mode
+        # Terminal states of styles, by index; index 0 is the default state
+        self._states: typing.List[sgr.SgrState] = [sgr.DEFAULT_STATE]
+        self._indices: typing.Dict[sgr.SgrState, int] = {sgr.DEFAULT_STATE: 0}
+        self._builders: typing.Dict[StyleBuilder, int] = {}
+        # Frame last rendered; `None` when the terminal must be cleared first
+        self._front_chars: typing.Optional[typing.List[typing.List[str]]] = None
+        self._front_styles: typing.List[typing.List[int]] = []
+        self._resize(width, height)
+
+    def style(self, style: typing.Union[StyleBuilder, sgr.SgrState]) -> int:
+        """
+        Returns the index of a style, to pass to `put`, registering it on first use.
+        Builders rendering to the same escape sequences share an index.
+        """
+        if isinstance(style, StyleBuilder):
+            index = self._builders.get(style)
+            if index is None:
+                state = sgr.state_after(style.code_pair(self.mode).start)
+                index = self._builders[style] = self.style(state)
+            return index
+
+        index = self._indices.get(style)
+        if index is None:
+            index = self._indices[style] = len(self._states)
+            self._states.append(style)
+        return index
+
+    def put(self, x: int, y: int, text: str, style: Style = None) -> None:
+        """
+        Writes `text`, a single line of plain text, at column `x` of row `y` in the
+        given style. Text out of the screen is cut off.
+        """
+        if not 0 <= y < self.height or x >= self.width:
+            return
+        index = self._index(style)
+        if x < 0:
+            text = text[-x:]
+            x = 0
+        text = text[: self.width - x]
+        if not text:
+            return
+        self._chars[y][x : x + len(text)] = text
+        self._styles[y][x : x + len(text)] = [index] * len(text)
+
+    def write(self, x: int, y: int, text: str) -> None:
+        """
+        Writes `text`, a single line styled with escape sequences like builders
+        render, at column `x` of row `y`. Text out of the screen is cut off.
+        """
+        for span in sgr.tokenize(text):
+            self.put(x, y, span.text, self.style(span.state))
+            x += len(span.text)
+
+    def fill(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        char: str = " ",
+        style: Style = None,
+    ) -> None:
+        """Fills a rectangle with `char` in the given style."""
+        for row in range(max(y, 0), min(y + height, self.height)):
+            self.put(x, row, char * width, style)
+
+    def clear(self) -> None:
+        """Blanks the back buffer; the terminal is updated by the next `render`."""
+        self._chars = [[" "] * self.width for _ in range(self.height)]
+        self._styles = [[0] * self.width for _ in range(self.height)]
+
+    def resize(self, width: int, height: int) -> None:
+        """Changes the size of the screen, keeping cells which still fit; the next frame is drawn in full."""
+        if width <= 0 or height <= 0:
+            raise ValueError(f"Invalid screen size {width}x{height}")
+        chars, styles = self._chars, self._styles
+        self._resize(width, height)
+        kept = min(width, len(chars[0]))
+        for y, (row, row_styles) in enumerate(zip(chars[:height], styles)):
+            self._chars[y][:kept] = row[:kept]
+            self._styles[y][:kept] = row_styles[:kept]
+
+    def invalidate(self) -> None:
+        """Makes the next `render` clear the terminal and draw the whole screen."""
+        self._front_chars = None
+
+    def render(self) -> str:
+        """
+        Returns the escape sequences and text updating the terminal from the previous
+        frame to the current one. The first frame clears the terminal, and every
+        frame leaves it in the default style.
+        """
+        out = []
+        width = self.width
+        states = self._states
+        front_chars, front_styles = self._front_chars, self._front_styles
+        if front_chars is None:
+            out.append(_CLEAR)
+            front_chars = [[" "] * width for _ in range(self.height)]
+            front_styles = [[0] * width for _ in range(self.height)]
+            cursor: typing.Optional[typing.Tuple[int, int]] = (0, 0)
+        else:
+            # The program may have moved the cursor since the previous frame
+            cursor = None
+        current = 0
+
+        for y, (chars, styles) in enumerate(zip(self._chars, self._styles)):
+            old_chars, old_styles = front_chars[y], front_styles[y]
+            if chars == old_chars and styles == old_styles:
+                continue
+
+            # Cells from `blank` on are blank in the default style
+            blank = width
+            while blank and chars[blank - 1] == " " and not styles[blank - 1]:
+                blank -= 1
+
+            for x in range(width):
+                if chars[x] == old_chars[x] and styles[x] == old_styles[x]:
+                    continue
+
+                if cursor != (x, y):
+                    move = _move(cursor, x, y, width)
+                    gap = cursor[0] if cursor is not None and cursor[1] == y else x
+                    if _bridgeable(styles, gap, x, len(move), current):
+                        # Cheaper to write the unchanged cells again than to skip them
+                        if styles[gap] != current:
+                            out.append(
+                                sgr.transition(states[current], states[styles[gap]])
+                            )
+                            current = styles[gap]
+                        out.append("".join(chars[gap:x]))
+                    else:
+                        out.append(move)
+
+                if x >= blank and width - x > len(_ERASE_LINE):
+                    if current:
+                        out.append(sgr.transition(states[current], sgr.DEFAULT_STATE))
+                        current = 0
+                    out.append(_ERASE_LINE)
+                    cursor = (x, y)
+                    break
+
+                if styles[x] != current:
+                    out.append(sgr.transition(states[current], states[styles[x]]))
+                    current = styles[x]
+                out.append(chars[x])
+                # After the last column, the cursor waits there to wrap on the next character
+                cursor = (x + 1, y)
+
+            front_chars[y] = chars[:]
+            front_styles[y] = styles[:]
+
+        if current:
+            out.append(sgr.SGR_RESET)
+        self._front_chars, self._front_styles = front_chars, front_styles
+        return "".join(out)
+
+    def _resize(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.clear()
+        self._front_chars = None
+
+    def _index(self, style: Style) -> int:
+        if style is None:
+            return 0
+        if isinstance(style, StyleBuilder):
+            return self.style(style)
+        if not 0 <= style < len(self._states):
+            raise ValueError(f"Unknown style index {style!r}")
+        return style
+
+
+def _bridgeable(
+    styles: typing.List[int], start: int, end: int, move: int, current: int
+) -> bool:
+    """
+    Returns whether the unchanged cells from `start` to `end` are worth writing again
+    instead of a cursor movement of `move` bytes: they are few, and written in the
+    current style or the style of the next changed cell, without switching styles.
+    """
+    if not 0 < end - start <= min(move, _MAX_BRIDGE):
+        return False
+    style = styles[start]
+    return style in (current, styles[end]) and all(
+        s == style for s in styles[start:end]
+    )
+
+
+def _move(
+    cursor: typing.Optional[typing.Tuple[int, int]], x: int, y: int, width: int
+) -> str:
+    """
+    Returns the shortest sequence moving the cursor from `cursor` (`None` when
+    unknown) to `x`, `y` on a screen `width` columns wide.
+    """
+    absolute = f"\x1b[{y + 1};{x + 1}H" if x else f"\x1b[{y + 1}H"
+    if cursor is None:
+        return absolute
+
+    cx, cy = cursor
+    if y == cy:
+        if x == 0:
+            return "\r"
+        if cx >= width:
+            # Waiting to wrap after the last column, where relative moves differ between terminals
+            return absolute
+        relative = f"\x1b[{x - cx}C" if x > cx else f"\x1b[{cx - x}D"
+    elif x == 0 and 0 < y - cy <= 2:
+        relative = "\r\n" * (y - cy)
+    elif x == cx and y > cy and cx < width:
+        relative = f"\x1b[{y - cy}B"
+    else:
+        return absolute
+    return relative if len(relative) < len(absolute) else absolute
@@ -0,0 +1,433 @@
+"""
+Tracking of the terminal state set by SGR ("Select Graphic Rendition") escape sequences,
+i.e. the `ESC[...m` sequences emitted by `stylize`, and parsing of styled text back
+into spans of text sharing the same style.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import re
+import typing
+
+from coloredstrings import types, utils
+
+SGR_RESET = "\x1b[0m"
+
+# Matches a complete SGR sequence and captures its parameters.
+SGR = re.compile(r"\x1b\[([0-9;:]*)m")
+
+# Matches any escape sequence, capturing parameters of SGR ones.
+ESCAPE = re.compile(rf"{SGR.pattern}|{utils._ANSI_ESCAPE.pattern}", re.VERBOSE)
+
+# Matches a trailing prefix of an escape sequence which may be completed by the next chunk.
+_INCOMPLETE_ESCAPE = re.compile(r"\x1b(?:\[[0-?]*[ -/]*)?\Z")
+
+# Longest incomplete escape sequence kept back between chunks;
+# anything longer is not a real escape sequence and is treated as text.
+_MAX_PENDING = 256
+
+# Number of memoized transitions kept per state, and of distinct states interned.
+# These memos are plain dictionaries read and written with single, atomic operations,
+# so they are shared between threads without a lock.
+_MAX_TRANSITIONS = 64
+_MAX_INTERNED = 4096
+
+_FG_16 = {color.value.start: color for color in types.Ansi16Color}
+_BG_16 = {color.as_bg().start: color for color in types.Ansi16Color}
+_ATTR_ON = {
+    attr.value.start: attr
+    for attr in types.Attribute
+    if attr is not types.Attribute.RESET
+}
+_ATTR_OFF: typing.Dict[int, typing.FrozenSet[types.Attribute]] = {}
+for _attr in _ATTR_ON.values():
+    _ATTR_OFF[_attr.value.end] = _ATTR_OFF.get(_attr.value.end, frozenset()) | {_attr}
+del _attr
+
+# Codes introducing an extended color: foreground, background and underline ones
+_EXTENDED_COLORS = (38, 48, 58)
+
+# Codes tracked by `SgrState`, besides extended foreground and background colors
+_TRACKED = {0, types.FG_RESET, types.BG_RESET, *_FG_16, *_BG_16, *_ATTR_ON, *_ATTR_OFF}
+
+# Whether `SgrState` tracks every parameter of a sequence, by parameters
+_tracked: utils._ConcurrentCache[str, bool] = utils._ConcurrentCache(
+    "sgr.tracked", maxsize=1024
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class SgrState:
+    """
+    Immutable snapshot of the graphic rendition a terminal is in.
+    The default instance corresponds to the state after `ESC[0m`.
+
+    Only colors and the attributes of `types.Attribute` are tracked; other
+    parameters, like underline colors or fonts, are ignored (see `is_tracked`).
+    """
+
+    fg: typing.Optional[types.Color] = None
+    bg: typing.Optional[types.Color] = None
+    attrs: typing.FrozenSet[types.Attribute] = frozenset()
+
+    # Memoized results of `apply`: real-world text keeps switching between a handful
+    # of states with the same few sequences, so parsing each of them once is enough.
+    _transitions: typing.Dict[str, SgrState] = dataclasses.field(
+        default_factory=dict, init=False, repr=False, compare=False, hash=False
+    )
+    # Memoized results of `transition` from this state, keyed by the target state.
+    _sequences: typing.Dict[SgrState, str] = dataclasses.field(
+        default_factory=dict, init=False, repr=False, compare=False, hash=False
+    )
+    _hash: typing.Optional[int] = dataclasses.field(
+        default=None, init=False, repr=False, compare=False, hash=False
+    )
+
+    def __hash__(self) -> int:
+        # States are used as keys of hot caches, and hashing enum members is slow
+        h = self._hash
+        if h is None:
+            h = hash((self.fg, self.bg, self.attrs))
+            object.__setattr__(self, "_hash", h)
+        return h
+
+    @property
+    def is_default(self) -> bool:
+        return self.fg is None and self.bg is None and not self.attrs
+
+    def apply(self, params: str) -> SgrState:
+        """
+        Returns the state after the terminal processed `ESC[<params>m`.
+        Unknown or malformed parameters are ignored, as terminals do.
+        """
+        state = self._transitions.get(params)
+        if state is None:
+            if len(self._transitions) >= _MAX_TRANSITIONS:
+                self._transitions.clear()
+            state = self._apply(params)
+            if state is not self:
+                # Intern the result, so that its own memoized transitions are reused
+                state = _intern(state)
+            self._transitions[params] = state
+        return state
+
+    def _apply(self, params: str) -> SgrState:
+        fg = self.fg
+        bg = self.bg
+        attrs = self.attrs
+
+        for _, n, color in parse_params(params):
+            if n == 0:
+                fg = bg = None
+                attrs = frozenset()
+            elif n in _FG_16:
+                fg = _FG_16[n]
+            elif n in _BG_16:
+                bg = _BG_16[n]
+            elif n == types.FG_RESET:
+                fg = None
+            elif n == types.BG_RESET:
+                bg = None
+            elif n in _ATTR_ON:
+                attrs = attrs | {_ATTR_ON[n]}
+            elif n in _ATTR_OFF:
+                attrs = attrs - _ATTR_OFF[n]
+            elif color is not None and n == 38:
+                fg = color
+            elif color is not None and n == 48:
+                bg = color
+
+        if fg is self.fg and bg is self.bg and attrs is self.attrs:
+            return self
+        return SgrState(fg=fg, bg=bg, attrs=attrs)
+
+    def layer(self, above: SgrState) -> SgrState:
+        """
+        Returns the state of `above` drawn over this one: the colors of `above`
+        win where it sets them, and attributes of both combine.
+        """
+        if self.is_default:
+            return above
+        state = SgrState(
+            fg=self.fg if above.fg is None else above.fg,
+            bg=self.bg if above.bg is None else above.bg,
+            attrs=self.attrs | above.attrs,
+        )
+        return _intern(state)
+
+    def params(self) -> typing.List[str]:
+        """Returns SGR parameters which bring a reset terminal into this state."""
+        result = [str(a.value.start) for a in sorted(self.attrs, key=_attr_order)]
+        if self.fg is not None:
+            result.append(color_params(self.fg, is_bg=False))
+        if self.bg is not None:
+            result.append(color_params(self.bg, is_bg=True))
+        return result
+
+    def sequence(self) -> str:
+        """Returns a single escape sequence which brings a reset terminal into this state."""
+        if self.is_default:
+            return ""
+        return f"\x1b[{';'.join(self.params())}m"
+
+
+DEFAULT_STATE = SgrState()
+
+_INTERNED: typing.Dict[SgrState, SgrState] = {DEFAULT_STATE: DEFAULT_STATE}
+
+
+def _intern(state: SgrState) -> SgrState:
+    if len(_INTERNED) >= _MAX_INTERNED:
+        _INTERNED.clear()
+    return _INTERNED.setdefault(state, state)
+
+
+def state_after(text: str, state: SgrState = DEFAULT_STATE) -> SgrState:
+    """Returns the state a terminal in `state` is in after printing `text`."""
+    for m in SGR.finditer(text):
+        state = state.apply(m.group(1))
+    return state
+
+
+@dataclasses.dataclass(frozen=True)
+class Span:
+    """A run of visible text rendered with the same style."""
+
+    text: str
+    state: SgrState
+
+    @property
+    def fg(self) -> typing.Optional[types.Color]:
+        return self.state.fg
+
+    @property
+    def bg(self) -> typing.Optional[types.Color]:
+        return self.state.bg
+
+    @property
+    def attrs(self) -> typing.FrozenSet[types.Attribute]:
+        return self.state.attrs
+
+
+class SgrTokenizer:
+    """
+    Incremental parser turning styled text into `Span`s.
+
+    Text can be fed in chunks of any size: escape sequences split between two chunks
+    are kept back until they are complete. Escape sequences other than SGR ones
+    (cursor movement, erasing, etc.) are zero-width and dropped.
+    """
+
+    def __init__(self, state: SgrState = DEFAULT_STATE) -> None:
+        self.state = state
+        """SGR state after the text fed so far."""
+        self._pending = ""
+
+    def feed(self, chunk: str) -> typing.Iterator[Span]:
+        """
+        Parses the next chunk of text, lazily yielding the spans it completes.
+        The returned iterator must be exhausted before feeding the next chunk.
+        """
+        data, self._pending = split_incomplete(self._pending + chunk)
+        return self._spans(data)
+
+    def close(self) -> typing.Iterator[Span]:
+        """Flushes text kept back at the end of the input."""
+        data = self._pending
+        self._pending = ""
+        return self._spans(data)
+
+    def _spans(self, data: str) -> typing.Iterator[Span]:
+        state = self.state
+        text: typing.List[str] = []
+        pos = 0
+
+        for m in ESCAPE.finditer(data):
+            start = m.start()
+            if start > pos:
+                text.append(data[pos:start])
+            pos = m.end()
+
+            params = m.group(1)
+            if params is None:
+                continue
+
+            new_state = state.apply(params)
+            if new_state is not state:
+                if text:
+                    yield Span("".join(text), state)
+                    text = []
+                state = self.state = new_state
+
+        if pos < len(data):
+            text.append(data[pos:])
+        if text:
+            yield Span("".join(text), state)
+
+
+def tokenize(
+    text: typing.Union[str, typing.Iterable[str]],
+    state: SgrState = DEFAULT_STATE,
+) -> typing.Iterator[Span]:
+    """
+    Lazily parses styled text into `Span`s.
+
+    `text` is either a string or an iterable of chunks (for example, an open file),
+    so arbitrarily large inputs are processed with constant memory.
+    """
+    tokenizer = SgrTokenizer(state)
+    chunks = (text,) if isinstance(text, str) else text
+    for chunk in chunks:
+        yield from tokenizer.feed(chunk)
+    yield from tokenizer.close()
+
+
+def transition(old: SgrState, new: SgrState) -> str:
+    """
+    Returns the shortest escape sequence switching a terminal from `old` to `new`:
+    either the parameters which actually change, or a reset followed by `new`.
+    """
+    if old is new:
+        return ""
+
+    sequence = old._sequences.get(new)
+    if sequence is None:
+        if len(old._sequences) >= _MAX_TRANSITIONS:
+            old._sequences.clear()
+        sequence = old._sequences[new] = _transition(old, new)
+    return sequence
+
+
+def _transition(old: SgrState, new: SgrState) -> str:
+    if old == new:
+        return ""
+    if new.is_default:
+        return SGR_RESET
+
+    # Off codes may clear several attributes at once (22 clears both bold and dim),
+    # so attributes sharing an off code with a removed one must be turned on again.
+    off_codes = {a.value.end for a in old.attrs - new.attrs}
+    cleared = frozenset().union(*(_ATTR_OFF[code] for code in off_codes))
+    on_attrs = (new.attrs - old.attrs) | (new.attrs & cleared)
+
+    changes = [str(code) for code in sorted(off_codes)]
+    changes.extend(str(a.value.start) for a in sorted(on_attrs, key=_attr_order))
+    if new.fg != old.fg:
+        changes.append(
+            str(types.FG_RESET) if new.fg is None else color_params(new.fg, is_bg=False)
+        )
+    if new.bg != old.bg:
+        changes.append(
+            str(types.BG_RESET) if new.bg is None else color_params(new.bg, is_bg=True)
+        )
+
+    incremental = ";".join(changes)
+    from_reset = ";".join(["0", *new.params()])
+    if len(from_reset) < len(incremental):
+        return f"\x1b[{from_reset}m"
+    return f"\x1b[{incremental}m"
+
+
+def parse_params(
+    params: str,
+) -> typing.Iterator[typing.Tuple[str, int, typing.Optional[types.Color]]]:
+    """
+    Splits parameters of an SGR sequence into `(raw, code, color)` triples.
+
+    `raw` is the text of a single parameter, `code` is its numeric value.
+    Extended colors (`38;5;n`, `48;2;r;g;b`, underline colors `58;5;n` and their
+    `:`-separated forms) are yielded as a single triple whose `raw` spans all of
+    their parts and whose `color` is the selected color, or `None` if it is malformed.
+    """
+    codes = params.split(";")
+    i = 0
+    while i < len(codes):
+        code = codes[i]
+        i += 1
+
+        if ":" in code:
+            # ITU T.416 form: 38:5:n, 38:2:r:g:b or 38:2::r:g:b
+            sub = code.split(":")
+            n = int(sub[0]) if sub[0] else 0
+            color = None
+            if n in _EXTENDED_COLORS:
+                color = _extended_color([s for s in sub[2:] if s], sub[1])
+            yield code, n, color
+            continue
+
+        n = int(code) if code else 0
+        if n in _EXTENDED_COLORS and i < len(codes):
+            kind = codes[i]
+            size = 1 if kind == "5" else 3 if kind == "2" else 0
+            start = i - 1
+            color = _extended_color(codes[i + 1 : i + 1 + size], kind)
+            i += 1 + size
+            yield ";".join(codes[start:i]), n, color
+            continue
+
+        yield code, n, None
+
+
+def is_tracked(params: str) -> bool:
+    """
+    Returns whether `SgrState` tracks the effect of every parameter of `ESC[<params>m`,
+    so that the sequence can be replaced by a transition between states.
+    """
+    tracked = _tracked.get(params)
+    if tracked is None:
+        tracked = _tracked.put(
+            params,
+            all(
+                n in _TRACKED or (n in (38, 48) and color is not None)
+                for _, n, color in parse_params(params)
+            ),
+        )
+    return tracked
+
+
+def split_incomplete(data: str) -> typing.Tuple[str, str]:
+    """
+    Splits a chunk of streamed text into the part which can be processed now and
+    a trailing incomplete escape sequence which must wait for the next chunk.
+    """
+    tail = data.rfind("\x1b")
+    if (
+        tail != -1
+        and len(data) - tail <= _MAX_PENDING
+        and _INCOMPLETE_ESCAPE.match(data, tail)
+    ):
+        return data[:tail], data[tail:]
+    return data, ""
+
+
+def color_params(color: types.Color, is_bg: bool) -> str:
+    """Returns the SGR parameters selecting `color`, keeping its original precision."""
+    if isinstance(color, types.Ansi16Color):
+        return str((color.as_bg() if is_bg else color.value).start)
+
+    prefix = "48" if is_bg else "38"
+    if isinstance(color, types.Extended256):
+        return f"{prefix};5;{color.index}"
+    return f"{prefix};2;{color.r};{color.g};{color.b}"
+
+
+def _extended_color(
+    values: typing.Sequence[str], kind: str
+) -> typing.Optional[types.Color]:
+    try:
+        components = [int(v) for v in values]
+    except ValueError:
+        return None
+
+    if not all(0 <= c <= 255 for c in components):
+        return None
+    if kind == "5" and len(components) == 1:
+        return types.Extended256(index=components[0])
+    if kind == "2" and len(components) == 3:
+        return types.Rgb(*components)
+    return None
+
+
+def _attr_order(attr: types.Attribute) -> int:
+    return attr.value.start
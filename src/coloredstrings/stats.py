@@ -0,0 +1,100 @@
+"""
+Opt-in instrumentation of rendering.
+
+Collection is disabled by default and costs a single flag check per `stylize` call
+until `enable` is called. Counters are updated without locks, so with many threads
+rendering at once they may slightly undercount.
+
+```python
+from coloredstrings import stats
+
+stats.enable()
+...
+metrics.publish(stats.snapshot())
+stats.reset()
+```
+"""
+
+from __future__ import annotations
+
+import time
+import typing
+
+from coloredstrings import utils
+
+enabled = False
+"""Whether counters are collected; use `enable` and `disable` to change it."""
+
+
+class _Counters:
+    stylize_calls = 0
+    chars_in = 0
+    chars_out = 0
+    time_ns = 0
+
+
+def enable() -> None:
+    """Starts collecting counters."""
+    global enabled
+    enabled = True
+    utils._ConcurrentCache.counting = True
+
+
+def disable() -> None:
+    """Stops collecting counters, keeping the values collected so far."""
+    global enabled
+    enabled = False
+    utils._ConcurrentCache.counting = False
+
+
+def reset() -> None:
+    """Sets every counter back to zero."""
+    _Counters.stylize_calls = 0
+    _Counters.chars_in = 0
+    _Counters.chars_out = 0
+    _Counters.time_ns = 0
+    for cache in utils._CACHES.values():
+        cache.hits = 0
+        cache.misses = 0
+
+
+def snapshot() -> typing.Dict[str, typing.Any]:
+    """
+    Returns the counters as a dictionary of plain values:
+
+    - `stylize_calls`: number of rendered texts,
+    - `chars_in`, `chars_out`: characters of text before and after rendering,
+    - `overhead_ratio`: characters added by escape codes per character of text,
+    - `time_seconds`: time spent rendering,
+    - `caches`: for every internal cache, its `size`, `maxsize`, `hits`, `misses`
+      and `hit_rate`.
+    """
+    chars_in = _Counters.chars_in
+    chars_out = _Counters.chars_out
+    caches = {}
+    for name, cache in utils._CACHES.items():
+        lookups = cache.hits + cache.misses
+        caches[name] = {
+            "size": len(cache),
+            "maxsize": cache.maxsize,
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "hit_rate": cache.hits / lookups if lookups else 0.0,
+        }
+
+    return {
+        "enabled": enabled,
+        "stylize_calls": _Counters.stylize_calls,
+        "chars_in": chars_in,
+        "chars_out": chars_out,
+        "overhead_ratio": (chars_out - chars_in) / chars_in if chars_in else 0.0,
+        "time_seconds": _Counters.time_ns / 1e9,
+        "caches": caches,
+    }
+
+
+def _record_stylize(chars_in: int, chars_out: int, start_ns: int) -> None:
+    _Counters.time_ns += time.perf_counter_ns() - start_ns
+    _Counters.stylize_calls += 1
+    _Counters.chars_in += chars_in
+    _Counters.chars_out += chars_out
@@ -12,6 +12,7 @@ from typing import (
 )
 
 from coloredstrings import color_support, stylize, types, utils
+from coloredstrings.extensions import EMPTY_REGISTRY, ExtensionRegistry
 
 
 @dataclasses.dataclass(frozen=True)
@@ -28,20 +29,29 @@ class StyleBuilder:
     next_color_for_bg: bool = False
     """Whether the next `color` method should be treated as setting the background color."""
 
-    mode: types.ColorMode = dataclasses.field(
-        default_factory=color_support.detect_color_support
-    )
-    """Color mode."""
+    mode: Optional[types.ColorMode] = None
+    """Color mode; when `None`, it is detected on the first render (see `resolved_mode`)."""
 
     only_visible_if_colors_enabled: bool = False
     """Used for `visible` style: whether the text should be replaced with an empty string when colors are not available."""
 
-    # This annotation hurts me very much...
-    extensions: Dict[str, Union[str, Tuple[int, int, int], StyleBuilder]] = (
-        dataclasses.field(default_factory=dict)
-    )
+    extensions: ExtensionRegistry = EMPTY_REGISTRY
     """User-defined extension styles."""
 
+    _codes: Dict[types.ColorMode, stylize.CompiledCodes] = dataclasses.field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    """
+    Codes of the style by mode, filled on first render in each mode. They only
+    depend on colors and attributes, so builders differing in nothing else share
+    them; dictionary reads and writes are atomic, so threads need no lock.
+    """
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.extensions, ExtensionRegistry):
+            # A plain mapping given by the caller
+            object.__setattr__(self, "extensions", ExtensionRegistry(self.extensions))
+
     def __call__(
         self,
         *args: Any,
@@ -49,7 +59,7 @@ class StyleBuilder:
         mode: Optional[types.ColorMode] = None,
     ) -> str:
         if mode is None:
-            mode = self.mode
+            mode = self._mode()
 
         text = sep.join(str(a) for a in args)
         return stylize.stylize(
@@ -59,14 +69,153 @@ class StyleBuilder:
             bg=self.bg,
             attrs=self.attrs,
             only_visible_if_colors_enabled=self.only_visible_if_colors_enabled,
+            codes=self._compiled(mode),
+        )
+
+    def render_pair(
+        self,
+        *args: Any,
+        sep: str = " ",
+        mode: Optional[types.ColorMode] = None,
+    ) -> Tuple[str, str]:
+        """
+        Returns both the styled and the plain form of the text, for writing the same
+        message to a terminal and to a file.
+
+        The plain form is the text without any escape codes, like `strip_ansi` would
+        return it, without the cost of matching escape codes when the arguments
+        contain none. For a `visible` builder, the plain form is always empty, as
+        text written without colors is: only the styled form shows the text, when
+        colors are enabled.
+        """
+        if mode is None:
+            mode = self._mode()
+
+        text = sep.join(str(a) for a in args)
+        styled = stylize.stylize(
+            text=text,
+            mode=mode,
+            fg=self.fg,
+            bg=self.bg,
+            attrs=self.attrs,
+            only_visible_if_colors_enabled=self.only_visible_if_colors_enabled,
+            codes=self._compiled(mode),
+        )
+
+        if self.only_visible_if_colors_enabled:
+            plain = ""
+        elif "\x1b" in text:
+            plain = utils.strip_ansi(text)
+        else:
+            plain = text
+        return styled, plain
+
+    def code_pair(self, mode: Optional[types.ColorMode] = None) -> types.CodePair:
+        """
+        Returns the escape sequences which open and close this style.
+
+        Useful to style text by plain string concatenation, when the text is known
+        to contain no styles of its own. Both sequences are empty when `mode`
+        (by default, the mode of the builder) is `ColorMode.NO_COLOR`.
+        """
+        if mode is None:
+            mode = self._mode()
+
+        codes = self._compiled(mode)
+        return types.CodePair(start=codes.start, end=codes.end)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Pickled as a few integers: builders are sent to worker processes a lot,
+        # and the extension registry, shared by all builders derived from the same
+        # `extend` call, is then pickled once per payload thanks to the pickle memo.
+        flags = self.next_color_for_bg | self.only_visible_if_colors_enabled << 1
+        return (
+            _restore,
+            (
+                _attrs_to_mask(self.attrs),
+                _color_to_code(self.fg),
+                _color_to_code(self.bg),
+                -1 if self.mode is None else int(self.mode),
+                flags,
+                None if self.extensions is EMPTY_REGISTRY else self.extensions,
+            ),
+        )
+
+    def __or__(self, other: Any) -> StyleBuilder:
+        """
+        Combines two builders into one, without rendering anything.
+
+        Example:
+
+        ```python
+        from coloredstrings import style
+
+        base = style.bold
+        accent = style.white.on.blue
+        print((base | accent)("Bold white on blue"))
+        ```
+
+        Colors of the right builder win where it sets them, and attributes of both
+        are combined. So are extensions, the right ones overriding the left ones.
+        The mode of the right builder is used, unless it is `None`.
+
+        The result is an ordinary builder: rendering it costs the same as rendering
+        the equivalent chain, unlike nesting one builder's output in the other.
+        """
+        if not isinstance(other, StyleBuilder):
+            return NotImplemented
+
+        extensions = self.extensions
+        if other.extensions is not extensions and other.extensions:
+            extensions = (
+                other.extensions
+                if not extensions
+                else extensions.extend(other.extensions)
+            )
+        return StyleBuilder(
+            fg=self.fg if other.fg is None else other.fg,
+            bg=self.bg if other.bg is None else other.bg,
+            attrs=self.attrs | other.attrs,
+            mode=self.mode if other.mode is None else other.mode,
+            only_visible_if_colors_enabled=self.only_visible_if_colors_enabled
+            or other.only_visible_if_colors_enabled,
+            extensions=extensions,
         )
 
+    @property
+    def resolved_mode(self) -> types.ColorMode:
+        """
+        Color mode renders use: `mode`, or the detected mode when it is `None`.
+        Detection happens once per process, see `color_support.reset_detected_mode`.
+        """
+        return self._mode()
+
+    def _mode(self) -> types.ColorMode:
+        mode = self.mode
+        if mode is None:
+            return color_support.detected_color_mode()
+        return mode
+
+    def _compiled(self, mode: types.ColorMode) -> stylize.CompiledCodes:
+        codes = self._codes.get(mode)
+        if codes is None:
+            codes = self._codes.setdefault(
+                mode, stylize.compile_codes(mode, self.fg, self.bg, self.attrs)
+            )
+        return codes
+
+    def _replace_keeping_codes(self, **changes: Any) -> StyleBuilder:
+        """Like `dataclasses.replace`, for changes which leave colors and attributes alone."""
+        builder = dataclasses.replace(self, **changes)
+        object.__setattr__(builder, "_codes", self._codes)
+        return builder
+
     def color_mode(self, mode: types.ColorMode) -> StyleBuilder:
-        return dataclasses.replace(self, mode=mode)
+        return self._replace_keeping_codes(mode=mode)
 
     @property
     def on(self) -> StyleBuilder:
-        return dataclasses.replace(self, next_color_for_bg=True)
+        return self._replace_keeping_codes(next_color_for_bg=True)
 
     @property
     def black(self) -> StyleBuilder:
@@ -202,7 +351,8 @@ class StyleBuilder:
 
         Lookup order:
         1. If `self.extensions` contains `color`, use that value:
-           - `str` or `tuple` -> forwarded to `rgb` and returns a StyleBuilder.
+           - `str` or `tuple` -> applied as a color, like `rgb` would (the color
+             is parsed once, by `extend`) and returns a StyleBuilder.
            - `callable` -> returned as-is (allowing custom helpers).
         2. Otherwise treat `color` as a CSS/named/hex color and return `self.rgb(color)`.
 
@@ -219,11 +369,15 @@ class StyleBuilder:
         >>> s.primary('ok')   # -> styled via rgb('blue')
         >>> s.shout('hey')    # -> calls the registered callable
         """
-        possible_extension = (self.extensions or {}).get(color)
+        if color.startswith("__"):
+            # Special names probed by `pickle`, `copy` and friends are never colors
+            raise AttributeError(color)
+
+        possible_extension = self.extensions.resolve(color)
         if possible_extension is not None:
-            if isinstance(possible_extension, (str, tuple)):
-                return self.rgb(possible_extension)
-            return possible_extension
+            if isinstance(possible_extension, types.Rgb):
+                return self._with_color(possible_extension)
+            return possible_extension  # type: ignore[no-any-return]
 
         return self.rgb(color)
 
@@ -319,7 +473,7 @@ class StyleBuilder:
 
     @property
     def visible(self) -> StyleBuilder:
-        return dataclasses.replace(self, only_visible_if_colors_enabled=True)
+        return self._replace_keeping_codes(only_visible_if_colors_enabled=True)
 
     def extend(
         self,
@@ -362,15 +516,31 @@ class StyleBuilder:
         StyleBuilder
             A new `StyleBuilder` instance with the merged extensions.
         """
-        return dataclasses.replace(
-            self,
-            extensions={
-                **self.extensions,
-                **(style_dict or {}),
-                **styles,
-            },
+        return self._replace_keeping_codes(
+            extensions=self.extensions.extend({**(style_dict or {}), **styles}),
         )
 
+    def markup(self, template: str, /, *args: Any, **kwargs: Any) -> str:
+        """
+        Renders a markup template, substituting fields like `str.format` does.
+
+        Example:
+
+        ```python
+        from coloredstrings import style
+
+        print(style.markup("[bold red]ERROR[/] [dim]{path}[/]", path="/etc/hosts"))
+        ```
+
+        Tags hold style specifications like `bold white on red`, which may name
+        extensions of this builder, and the style of the builder applies to the
+        whole text. Each template is parsed once and cached, see
+        `coloredstrings.templates` for the syntax.
+        """
+        from coloredstrings import templates
+
+        return templates.compile_markup(template, self).format(*args, **kwargs)
+
     def _with_attrs(self, *attrs: types.Attribute) -> StyleBuilder:
         return dataclasses.replace(self, attrs=self.attrs.union(attrs))
 
@@ -390,3 +560,66 @@ class StyleBuilder:
         return dataclasses.replace(
             self, fg=fg, bg=bg, next_color_for_bg=next_color_for_bg
         )
+
+
+# Compact encoding of builders used for pickling
+_ATTRIBUTES = list(types.Attribute)
+_ANSI_16_COLORS = list(types.Ansi16Color)
+_EXTENDED_256_OFFSET = len(_ANSI_16_COLORS)
+_RGB_OFFSET = _EXTENDED_256_OFFSET + 256
+
+
+def _attrs_to_mask(attrs: FrozenSet[types.Attribute]) -> int:
+    mask = 0
+    for attr in attrs:
+        mask |= 1 << _ATTRIBUTES.index(attr)
+    return mask
+
+
+def _mask_to_attrs(mask: int) -> FrozenSet[types.Attribute]:
+    return frozenset(attr for i, attr in enumerate(_ATTRIBUTES) if mask >> i & 1)
+
+
+def _color_to_code(color: Optional[types.Color]) -> int:
+    """
+    Encodes a color as a single integer: -1 for no color, then the 16 ANSI colors,
+    the 256 extended colors and finally 24-bit RGB values.
+    """
+    if color is None:
+        return -1
+    if isinstance(color, types.Ansi16Color):
+        return _ANSI_16_COLORS.index(color)
+    if isinstance(color, types.Extended256):
+        return _EXTENDED_256_OFFSET + color.index
+    return _RGB_OFFSET + (color.r << 16 | color.g << 8 | color.b)
+
+
+def _code_to_color(code: int) -> Optional[types.Color]:
+    if code < 0:
+        return None
+    if code < _EXTENDED_256_OFFSET:
+        return _ANSI_16_COLORS[code]
+    if code < _RGB_OFFSET:
+        return types.Extended256(index=code - _EXTENDED_256_OFFSET)
+    code -= _RGB_OFFSET
+    return types.Rgb(r=code >> 16, g=code >> 8 & 0xFF, b=code & 0xFF)
+
+
+def _restore(
+    attrs: int,
+    fg: int,
+    bg: int,
+    mode: int,
+    flags: int,
+    extensions: Optional[ExtensionRegistry],
+) -> StyleBuilder:
+    """Recreates a pickled `StyleBuilder`."""
+    return StyleBuilder(
+        fg=_code_to_color(fg),
+        bg=_code_to_color(bg),
+        attrs=_mask_to_attrs(attrs),
+        next_color_for_bg=bool(flags & 1),
+        mode=None if mode < 0 else types.ColorMode(mode),
+        only_visible_if_colors_enabled=bool(flags & 2),
+        extensions=EMPTY_REGISTRY if extensions is None else extensions,
+    )
@@ -1,11 +1,19 @@
 import re
+import time
 import typing
 
-from coloredstrings import ansi_conversions, types
+from coloredstrings import ansi_conversions, stats, types, utils
 
 _ESC = "\x1b["
 _RESET = _ESC + "0m"
 
+# Code pairs of colors converted for a mode: RGB conversions are the costly part of
+# rendering, and programs use a small, fixed set of colors.
+_code_pairs: utils._ConcurrentCache[
+    typing.Tuple[typing.Union[types.Attribute, types.Color], bool, types.ColorMode],
+    types.CodePair,
+] = utils._ConcurrentCache("stylize.code_pair", maxsize=4096)
+
 
 _RE_NESTED_RESET = re.compile(
     rf"({re.escape(_ESC)}0m.*?{re.escape(_ESC)}0m)", flags=re.S
@@ -13,6 +21,14 @@ _RE_NESTED_RESET = re.compile(
 _RE_NEWLINE = re.compile(r"(\r?\n)")
 
 
+class CompiledCodes(typing.NamedTuple):
+    """Code pairs of a style for a mode, and the sequences which open and close it."""
+
+    pairs: typing.List[types.CodePair]
+    start: str
+    end: str
+
+
 def stylize(
     text: str,
     mode: types.ColorMode = types.ColorMode.EXTENDED_256,
@@ -20,6 +36,31 @@ def stylize(
     bg: typing.Optional[types.Color] = None,
     attrs: typing.Iterable[types.Attribute] = (),
     only_visible_if_colors_enabled: bool = False,
+    codes: typing.Optional[CompiledCodes] = None,
+) -> str:
+    """
+    Styles `text`. `codes`, when given, are the codes of the style compiled by
+    `compile_codes` for `mode`, which saves looking them up.
+    """
+    if not stats.enabled:
+        return _stylize(
+            text, mode, fg, bg, attrs, only_visible_if_colors_enabled, codes
+        )
+
+    start = time.perf_counter_ns()
+    result = _stylize(text, mode, fg, bg, attrs, only_visible_if_colors_enabled, codes)
+    stats._record_stylize(len(text), len(result), start)
+    return result
+
+
+def _stylize(
+    text: str,
+    mode: types.ColorMode,
+    fg: typing.Optional[types.Color],
+    bg: typing.Optional[types.Color],
+    attrs: typing.Iterable[types.Attribute],
+    only_visible_if_colors_enabled: bool,
+    codes: typing.Optional[CompiledCodes],
 ) -> str:
     if mode == types.ColorMode.NO_COLOR or len(text) == 0:
         if only_visible_if_colors_enabled:
@@ -32,20 +73,12 @@ def stylize(
         if types.Attribute.RESET not in attrs:
             return text
 
-    pairs = []
-    if fg is not None:
-        pairs.append(code_pair(fg, is_bg=False, mode=mode))
-    if bg is not None:
-        pairs.append(code_pair(bg, is_bg=True, mode=mode))
-    pairs.extend(code_pair(a, False, mode) for a in attrs)
-
+    if codes is None:
+        codes = compile_codes(mode, fg, bg, attrs)
+    pairs, start, end = codes
     if not pairs:
         return text
 
-    start = "".join(p.start for p in pairs)
-    # Close in reverse order to properly nest styles
-    end = "".join(p.end for p in reversed(pairs))
-
     # For robustness: after any specific off-code in the text, re-enable by appending its on code.
     if "\u001b" in text:
         for p in pairs:
@@ -64,6 +97,41 @@ def stylize(
     return f"{start}{text}{end}"
 
 
+def code_pairs(
+    mode: types.ColorMode,
+    fg: typing.Optional[types.Color] = None,
+    bg: typing.Optional[types.Color] = None,
+    attrs: typing.Iterable[types.Attribute] = (),
+) -> typing.List[types.CodePair]:
+    """Returns code pairs of a style in the order `stylize` opens them."""
+    if mode == types.ColorMode.NO_COLOR:
+        return []
+
+    pairs = []
+    if fg is not None:
+        pairs.append(code_pair(fg, is_bg=False, mode=mode))
+    if bg is not None:
+        pairs.append(code_pair(bg, is_bg=True, mode=mode))
+    pairs.extend(code_pair(a, False, mode) for a in attrs)
+    return pairs
+
+
+def compile_codes(
+    mode: types.ColorMode,
+    fg: typing.Optional[types.Color] = None,
+    bg: typing.Optional[types.Color] = None,
+    attrs: typing.Iterable[types.Attribute] = (),
+) -> CompiledCodes:
+    """Returns the code pairs of a style, see `code_pairs`, with the joined sequences."""
+    pairs = code_pairs(mode, fg, bg, attrs)
+    return CompiledCodes(
+        pairs=pairs,
+        start="".join(p.start for p in pairs),
+        # Close in reverse order to properly nest styles
+        end="".join(p.end for p in reversed(pairs)),
+    )
+
+
 def code_pair(
     style: typing.Union[types.Attribute, types.Color],
     is_bg: bool = False,
@@ -71,6 +139,18 @@ def code_pair(
 ) -> types.CodePair:
     assert mode != types.ColorMode.NO_COLOR
 
+    key = (style, is_bg, mode)
+    pair = _code_pairs.get(key)
+    if pair is None:
+        pair = _code_pairs.put(key, _code_pair(style, is_bg, mode))
+    return pair
+
+
+def _code_pair(
+    style: typing.Union[types.Attribute, types.Color],
+    is_bg: bool,
+    mode: types.ColorMode,
+) -> types.CodePair:
     if isinstance(style, types.Attribute):
         if style == types.Attribute.RESET:
             return types.CodePair(start=f"{_ESC}0m", end="")
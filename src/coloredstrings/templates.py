@@ -0,0 +1,382 @@
+"""
+Templates with styles: markup like `"[bold red]ERROR[/] [dim]{path}[/]"` instead of
+nested builder calls, and format strings with styled fields (`Formatter`).
+
+A template is compiled once, for a builder and a color mode, into a `str.format`
+string with the escape sequences of its tags already in place, so rendering it is
+a single `str.format` call. Compiled templates are cached by template string.
+
+Tags hold style specifications (see `themes.parse_style`), which may also name
+extensions of the builder. `[/]` closes the last opened tag, `[/spec]` the last one
+opened with this specification, and tags still open at the end are closed. Styles of
+nested tags are layered: inner colors win, attributes combine. Write `\\[` for a
+literal bracket. Substituted values are never parsed as markup.
+"""
+
+from __future__ import annotations
+
+import re
+import string
+import typing
+
+from coloredstrings import sgr, themes, types, utils
+from coloredstrings.style_builder import StyleBuilder
+
+_TAG = re.compile(r"\\\[|\[(/?)([^\[\]]*)\]")
+
+_FORMATTER = string.Formatter()
+
+# Standard format specification, taken as such rather than as a style when a
+# `Formatter` field has no colon separating them
+_FORMAT_SPEC = re.compile(
+    r"(?:.?[<>=^])?[-+ ]?z?#?0?[0-9]*[_,]?(?:\.[0-9]+)?[bcdeEfFgGnosxX%]?", re.S
+)
+
+# Number of templates compiled by a `Formatter` kept at once
+_MAX_FORMATS = 1024
+
+_templates: utils._ConcurrentCache[
+    typing.Tuple[str, StyleBuilder, types.ColorMode], MarkupTemplate
+] = utils._ConcurrentCache("templates.markup", maxsize=1024)
+
+
+class _Field(typing.NamedTuple):
+    name: str
+    conversion: typing.Optional[str]
+    spec: str
+    # Terminal state the field is rendered in
+    state: sgr.SgrState
+
+
+class MarkupTemplate:
+    """A markup template compiled for a builder and a color mode."""
+
+    def __init__(
+        self, template: str, builder: StyleBuilder, mode: types.ColorMode
+    ) -> None:
+        self.template = template
+        self.mode = mode
+
+        # The template split into text with escape sequences, and fields
+        self._parts: typing.List[typing.Union[str, _Field]] = []
+        # Number of escape characters in the rendered text, when values have none
+        self._escapes = 0
+        # Whether a field is rendered in a non-default state, so that escape
+        # sequences in its value may change the state of what follows
+        self._styled_fields = False
+
+        base = sgr.state_after(builder.code_pair(mode).start)
+        plain = StyleBuilder(mode=mode, extensions=builder.extensions)
+        # Open tags, as their specification and the state they set
+        stack: typing.List[typing.Tuple[str, sgr.SgrState]] = []
+        emitted = sgr.DEFAULT_STATE
+        desired = base
+        numbering = _Numbering()
+
+        for literal, name, spec, conversion in _FORMATTER.parse(template):
+            pos = 0
+            for m in _TAG.finditer(literal):
+                if m.start() > pos:
+                    self._text(sgr.transition(emitted, desired))
+                    self._text(literal[pos : m.start()])
+                    emitted = desired
+                pos = m.end()
+
+                if m.group(1) is None:
+                    # An escaped bracket
+                    self._text(sgr.transition(emitted, desired) + "[")
+                    emitted = desired
+                    continue
+
+                tag = " ".join(m.group(2).split())
+                if m.group(1):
+                    stack = _close(stack, tag, m.group())
+                else:
+                    style = _parse(tag, m.group(), plain)
+                    stack.append((tag, sgr.state_after(style.code_pair(mode).start)))
+
+                desired = base
+                for _, layer in stack:
+                    desired = desired.layer(layer)
+
+            if pos < len(literal):
+                self._text(sgr.transition(emitted, desired))
+                self._text(literal[pos:])
+                emitted = desired
+
+            if name is not None:
+                name = numbering(name)
+                self._text(sgr.transition(emitted, desired))
+                emitted = desired
+                self._parts.append(_Field(name, conversion, spec or "", desired))
+                self._styled_fields = self._styled_fields or not desired.is_default
+
+        self._text(sgr.transition(emitted, sgr.DEFAULT_STATE))
+        self._format = "".join(
+            part.replace("{", "{{").replace("}", "}}")
+            if isinstance(part, str)
+            else _field_format(part)
+            for part in self._parts
+        ).format
+
+    def _text(self, text: str) -> None:
+        if text:
+            self._escapes += text.count("\x1b")
+            self._parts.append(text)
+
+    def format(self, *args: typing.Any, **kwargs: typing.Any) -> str:
+        """Renders the template with fields substituted, like `str.format`."""
+        text = self._format(*args, **kwargs)
+        if self._styled_fields and text.count("\x1b") != self._escapes:
+            # A value brought its own styles: restore the style of the tag after it
+            return self._format_styled(args, kwargs)
+        return text
+
+    def _format_styled(
+        self, args: typing.Sequence[typing.Any], kwargs: typing.Mapping[str, typing.Any]
+    ) -> str:
+        out = []
+        for part in self._parts:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+            text = _format_field(part, args, kwargs)
+            out.append(text)
+            if "\x1b" in text:
+                out.append(
+                    sgr.transition(sgr.state_after(text, part.state), part.state)
+                )
+        return "".join(out)
+
+
+def compile_markup(
+    template: str,
+    builder: typing.Optional[StyleBuilder] = None,
+    mode: typing.Optional[types.ColorMode] = None,
+) -> MarkupTemplate:
+    """
+    Returns `template` compiled for `builder` (by default, a plain builder), whose
+    style applies to the whole text and whose extensions can be used in tags,
+    and for `mode` (by default, the mode of the builder). Compiled templates are
+    cached, so this is cheap to call for every rendered text.
+
+    Raises
+    ------
+    ValueError
+        If a tag is not a valid style specification or closes no open tag, or
+        fields are both numbered and not.
+    """
+    if builder is None:
+        builder = _PLAIN
+    if mode is None:
+        mode = builder._mode()
+
+    key = (template, builder, mode)
+    compiled = _templates.get(key)
+    if compiled is None:
+        compiled = _templates.put(key, MarkupTemplate(template, builder, mode))
+    return compiled
+
+
+class Formatter(string.Formatter):
+    """
+    `string.Formatter` whose fields may be styled: a field's format specification
+    may end with a style, chained with dots like builders are, after a colon when
+    there is a format specification too, as in `"{user:red.bold} {n:>8:green}"`.
+
+    When the text after the last colon is not a style, like in `"{t:%H:%M}"`, the
+    whole is a format specification, and so is a specification without a colon
+    which is a standard one, like in `"{n:10d}"` or `"{n:100}"`. Styles may name
+    extensions of `builder`, whose mode is used for rendering.
+
+    Templates are parsed once and cached, and rendered by a single `str.format`
+    call when values contain no styles or line breaks of their own. Subclasses
+    overriding how fields are looked up or formatted are rendered field by field.
+    """
+
+    def __init__(self, builder: typing.Optional[StyleBuilder] = None) -> None:
+        self.builder = _PLAIN if builder is None else builder
+        # Compiled templates, read and written with single, atomic operations,
+        # so that a formatter can be shared between threads without a lock
+        self._templates: typing.Dict[
+            typing.Tuple[str, types.ColorMode], _FormatTemplate
+        ] = {}
+        cls = type(self)
+        self._compiled = all(
+            getattr(cls, hook) is getattr(Formatter, hook)
+            for hook in ("get_value", "get_field", "convert_field", "format_field")
+        )
+
+    def vformat(
+        self,
+        format_string: str,
+        args: typing.Sequence[typing.Any],
+        kwargs: typing.Mapping[str, typing.Any],
+    ) -> str:
+        if not self._compiled:
+            return super().vformat(format_string, args, kwargs)
+
+        mode = self.builder._mode()
+        compiled = self._templates.get((format_string, mode))
+        if compiled is None:
+            compiled = _FormatTemplate(format_string, self.builder, mode)
+            if len(self._templates) >= _MAX_FORMATS:
+                self._templates.clear()
+            self._templates[format_string, mode] = compiled
+        return compiled.format(args, kwargs)
+
+    def format_field(self, value: typing.Any, format_spec: str) -> str:
+        spec, style = _split_style(format_spec, self.builder)
+        text = format(value, spec)
+        return text if style is None else style(text, mode=self.builder._mode())
+
+
+class _FormatTemplate:
+    """A format string of a `Formatter`, compiled for a builder and a color mode."""
+
+    def __init__(
+        self, template: str, builder: StyleBuilder, mode: types.ColorMode
+    ) -> None:
+        # Text, and fields with their style if any
+        self._parts: typing.List[
+            typing.Union[str, typing.Tuple[_Field, typing.Optional[StyleBuilder]]]
+        ] = []
+        fast = []
+        numbering = _Numbering()
+        # Whether values with escape sequences or line breaks need `stylize`
+        self._styled = False
+        # Whether some style renders differently than by concatenation
+        self._always_slow = False
+
+        for literal, name, spec, conversion in _FORMATTER.parse(template):
+            if literal:
+                self._parts.append(literal)
+                fast.append(literal.replace("{", "{{").replace("}", "}}"))
+            if name is None:
+                continue
+
+            spec, style = _split_style(spec or "", builder)
+            field = _Field(numbering(name), conversion, spec, sgr.DEFAULT_STATE)
+            self._parts.append((field, style))
+            if style is None:
+                fast.append(_field_format(field))
+            else:
+                pair = style.code_pair(mode)
+                fast.append(f"{pair.start}{_field_format(field)}{pair.end}")
+                self._styled = True
+                self._always_slow |= style.only_visible_if_colors_enabled
+
+        self.mode = mode
+        fast_template = "".join(fast)
+        self._format = fast_template.format
+        # Escape characters and line breaks in the rendered text, when values have none
+        self._escapes = fast_template.count("\x1b")
+        self._newlines = fast_template.count("\n")
+
+    def format(
+        self, args: typing.Sequence[typing.Any], kwargs: typing.Mapping[str, typing.Any]
+    ) -> str:
+        if self._always_slow:
+            return self._format_fields(args, kwargs)
+        text = self._format(*args, **kwargs)
+        if self._styled and (
+            text.count("\x1b") != self._escapes or text.count("\n") != self._newlines
+        ):
+            return self._format_fields(args, kwargs)
+        return text
+
+    def _format_fields(
+        self, args: typing.Sequence[typing.Any], kwargs: typing.Mapping[str, typing.Any]
+    ) -> str:
+        out = []
+        for part in self._parts:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+            field, style = part
+            text = _format_field(field, args, kwargs)
+            out.append(text if style is None else style(text, mode=self.mode))
+        return "".join(out)
+
+
+_PLAIN = StyleBuilder()
+
+
+class _Numbering:
+    """Numbers automatic fields like `str.format`, so that fields can be rendered one by one."""
+
+    def __init__(self) -> None:
+        self._next = 0
+        self._manual = False
+
+    def __call__(self, name: str) -> str:
+        if name == "" or name[0] in ".[":
+            if self._manual:
+                raise ValueError(
+                    "cannot switch from manual field specification "
+                    "to automatic field numbering"
+                )
+            name = f"{self._next}{name}"
+            self._next += 1
+        elif name[0].isdigit():
+            if self._next:
+                raise ValueError(
+                    "cannot switch from automatic field numbering "
+                    "to manual field specification"
+                )
+            self._manual = True
+        return name
+
+
+def _format_field(
+    field: _Field,
+    args: typing.Sequence[typing.Any],
+    kwargs: typing.Mapping[str, typing.Any],
+) -> str:
+    value, _ = _FORMATTER.get_field(field.name, args, kwargs)
+    if field.conversion:
+        value = _FORMATTER.convert_field(value, field.conversion)
+    spec = field.spec
+    if "{" in spec:
+        spec = _FORMATTER.vformat(spec, args, kwargs)
+    return format(value, spec)
+
+
+def _split_style(
+    spec: str, builder: StyleBuilder
+) -> typing.Tuple[str, typing.Optional[StyleBuilder]]:
+    """Splits a format specification into the plain one and a style, if any."""
+    head, colon, tail = spec.rpartition(":")
+    if not tail or "{" in tail or (not colon and _FORMAT_SPEC.fullmatch(tail)):
+        return spec, None
+    try:
+        style = themes.parse_style(
+            tail.replace(".", " "), StyleBuilder(extensions=builder.extensions)
+        )
+    except ValueError:
+        return spec, None
+    return head, style
+
+
+def _parse(tag: str, source: str, builder: StyleBuilder) -> StyleBuilder:
+    try:
+        return themes.parse_style(tag, builder)
+    except ValueError:
+        raise ValueError(
+            f"Invalid markup tag {source!r}; write '\\[' for a literal bracket"
+        ) from None
+
+
+def _close(
+    stack: typing.List[typing.Tuple[str, sgr.SgrState]], tag: str, source: str
+) -> typing.List[typing.Tuple[str, sgr.SgrState]]:
+    for i in range(len(stack) - 1, -1, -1):
+        if not tag or stack[i][0] == tag:
+            return stack[:i] + stack[i + 1 :]
+    raise ValueError(f"Markup tag {source!r} closes no open tag")
+
+
+def _field_format(field: _Field) -> str:
+    conversion = f"!{field.conversion}" if field.conversion else ""
+    spec = f":{field.spec}" if field.spec else ""
+    return f"{{{field.name}{conversion}{spec}}}"
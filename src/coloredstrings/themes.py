@@ -0,0 +1,309 @@
+"""
+Themes: named styles loaded from JSON or TOML files.
+
+Every style of a theme is compiled once into the escape sequences opening and
+closing it in each `ColorMode`, so rendering a themed text is a concatenation.
+Compiled themes can be saved to a cache file, which later processes load without
+parsing style specifications or converting colors again.
+
+A theme file maps names to style specifications, written the way builders are chained:
+
+```toml
+error = "bold red"
+warning = "yellow on #202020"
+path = "underline rgb(120, 200, 255)"
+muted = "dim color256(245)"
+```
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import re
+import typing
+
+from coloredstrings import color_support, style_builder, types
+from coloredstrings.style_builder import StyleBuilder
+
+# Version of the cache file format, bumped whenever it changes
+_CACHE_FORMAT = 1
+
+_MODES = tuple(types.ColorMode)
+
+_Path = typing.Union[str, "os.PathLike[str]"]
+
+# A call like `rgb(1, 2, 3)`, a hex color or a single word
+_TOKEN = re.compile(r"\w+\([^)]*\)|#\w+|[^\s(]+")
+_CALL = re.compile(r"(\w+)\(([^)]*)\)")
+
+
+def parse_style(
+    spec: str, builder: typing.Optional[StyleBuilder] = None
+) -> StyleBuilder:
+    """
+    Parses a style specification into a builder.
+
+    A specification is a whitespace-separated chain of what can follow a builder:
+    attributes (`bold`), ANSI and CSS color names (`red`, `pink`), hex colors
+    (`#ff69b4`), `rgb(r, g, b)` and `color256(n)` calls, and `on` making the next
+    color the background one, like in `bold white on red`. The chain starts from
+    `builder`, so that its extensions can be used too; by default, from a plain
+    builder in `ColorMode.TRUE_COLOR`.
+
+    Raises
+    ------
+    ValueError
+        If the specification is empty or contains an unknown token.
+    """
+    if builder is None:
+        builder = StyleBuilder(mode=types.ColorMode.TRUE_COLOR)
+    tokens = _TOKEN.findall(spec)
+    if not tokens:
+        raise ValueError(f"Empty style specification: {spec!r}")
+
+    for token in tokens:
+        call = _CALL.fullmatch(token)
+        try:
+            if call is not None:
+                name, arguments = call.groups()
+                args = [int(a) for a in arguments.split(",")]
+                if name == "rgb" and len(args) == 3:
+                    builder = builder.rgb(*args)
+                elif name == "color256" and len(args) == 1:
+                    builder = builder.color256(args[0])
+                else:
+                    raise ValueError
+            elif token.startswith("#"):
+                builder = builder.rgb(token)
+            else:
+                attribute = getattr(builder, token)
+                if not isinstance(attribute, StyleBuilder):
+                    raise ValueError
+                builder = attribute
+        except (ValueError, AttributeError):
+            raise ValueError(
+                f"Invalid token {token!r} in style specification {spec!r}"
+            ) from None
+
+    return builder
+
+
+@dataclasses.dataclass(frozen=True)
+class ThemeStyle:
+    """A style of a `Theme`, compiled for every `ColorMode`."""
+
+    builder: StyleBuilder
+    """Builder the style was compiled from."""
+
+    codes: typing.Tuple[types.CodePair, ...]
+    """Escape sequences opening and closing the style, indexed by `ColorMode`."""
+
+    mode: typing.Optional[types.ColorMode] = None
+    """Color mode; when `None`, it is detected on the first render."""
+
+    @classmethod
+    def compile(cls, builder: StyleBuilder) -> ThemeStyle:
+        return cls(builder=builder, codes=tuple(builder.code_pair(m) for m in _MODES))
+
+    def __call__(
+        self,
+        *args: typing.Any,
+        sep: str = " ",
+        mode: typing.Optional[types.ColorMode] = None,
+    ) -> str:
+        if mode is None:
+            mode = self.mode
+            if mode is None:
+                mode = color_support.detected_color_mode()
+
+        text = sep.join(str(a) for a in args)
+        if (
+            "\x1b" in text
+            or "\n" in text
+            or not text
+            or self.builder.only_visible_if_colors_enabled
+        ):
+            # Nested styles and line breaks need `stylize` to keep styles balanced
+            return self.builder(text, mode=mode)
+
+        codes = self.codes[mode]
+        return f"{codes.start}{text}{codes.end}"
+
+    def code_pair(
+        self, mode: typing.Optional[types.ColorMode] = None
+    ) -> types.CodePair:
+        """Returns the escape sequences which open and close this style."""
+        if mode is None:
+            mode = self.mode
+            if mode is None:
+                mode = color_support.detected_color_mode()
+        return self.codes[mode]
+
+
+class Theme(typing.Mapping[str, ThemeStyle]):
+    """
+    Read-only collection of named styles, available both as items and attributes:
+    `theme.error("text")` or `theme["error"]("text")`. Styles named like methods of
+    the theme (`keys`, `get`, `mode`, ...) are only available as items.
+    """
+
+    def __init__(
+        self,
+        styles: typing.Mapping[str, typing.Union[str, StyleBuilder, ThemeStyle]],
+        mode: typing.Optional[types.ColorMode] = None,
+    ) -> None:
+        self.mode = mode
+        self._styles: typing.Dict[str, ThemeStyle] = {}
+        for name, style in styles.items():
+            if isinstance(style, str):
+                style = ThemeStyle.compile(parse_style(style))
+            elif isinstance(style, StyleBuilder):
+                style = ThemeStyle.compile(style)
+            if style.mode != mode:
+                style = dataclasses.replace(style, mode=mode)
+            self._styles[name] = style
+
+    def __getitem__(self, name: str) -> ThemeStyle:
+        return self._styles[name]
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self._styles)
+
+    def __len__(self) -> int:
+        return len(self._styles)
+
+    def __getattr__(self, name: str) -> ThemeStyle:
+        try:
+            return self.__dict__["_styles"][name]
+        except KeyError:
+            raise AttributeError(f"Theme has no style {name!r}") from None
+
+    def __dir__(self) -> typing.Iterable[str]:
+        return [*super().__dir__(), *self._styles]
+
+    def color_mode(self, mode: types.ColorMode) -> Theme:
+        """Returns the same theme rendering in `mode`, sharing compiled styles."""
+        return Theme(self._styles, mode=mode)
+
+    def save_cache(
+        self,
+        path: _Path,
+        source: typing.Optional[_Path] = None,
+    ) -> None:
+        """
+        Writes the compiled styles to `path`.
+        When given, the size and modification time of the `source` theme file are
+        recorded, so that `load_theme` notices when the cache is outdated.
+        """
+        styles = {}
+        for name, style in self._styles.items():
+            builder = style.builder
+            codes = [s for pair in style.codes for s in (pair.start, pair.end)]
+            styles[name] = [
+                style_builder._attrs_to_mask(builder.attrs),
+                style_builder._color_to_code(builder.fg),
+                style_builder._color_to_code(builder.bg),
+                builder.only_visible_if_colors_enabled,
+                codes,
+            ]
+        data = {
+            "format": _CACHE_FORMAT,
+            "source": None if source is None else _file_signature(source),
+            "styles": styles,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load_cache(
+        cls,
+        path: _Path,
+        source: typing.Optional[_Path] = None,
+        mode: typing.Optional[types.ColorMode] = None,
+    ) -> typing.Optional[Theme]:
+        """
+        Loads a theme saved by `save_cache`. Returns `None` if the cache is missing,
+        unreadable, or was made from a different version of the `source` file.
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get("format") != _CACHE_FORMAT:
+            return None
+        if source is not None and data.get("source") != _file_signature(source):
+            return None
+
+        styles = {}
+        for name, (attrs, fg, bg, visible, codes) in data["styles"].items():
+            builder = style_builder._restore(
+                attrs, fg, bg, int(types.ColorMode.TRUE_COLOR), visible << 1, None
+            )
+            pairs = tuple(
+                types.CodePair(start=codes[i], end=codes[i + 1])
+                for i in range(0, len(codes), 2)
+            )
+            styles[name] = ThemeStyle(builder=builder, codes=pairs)
+        return cls(styles, mode=mode)
+
+
+def load_theme(
+    path: _Path,
+    cache: typing.Optional[_Path] = None,
+    mode: typing.Optional[types.ColorMode] = None,
+) -> Theme:
+    """
+    Loads a theme from a `.json` or `.toml` file.
+
+    With `cache`, the compiled theme is read from that file when it is up to date
+    with `path`, and written to it otherwise.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a flat table of style specifications, or a specification
+        is invalid.
+    """
+    if cache is not None:
+        theme = Theme.load_cache(cache, source=path, mode=mode)
+        if theme is not None:
+            return theme
+
+    specs = read_file(path)
+    if not isinstance(specs, dict) or not all(
+        isinstance(spec, str) for spec in specs.values()
+    ):
+        raise ValueError(f"{os.fspath(path)}: expected a table of style specifications")
+
+    theme = Theme(specs, mode=mode)
+    if cache is not None:
+        theme.save_cache(cache, source=path)
+    return theme
+
+
+def read_file(path: _Path) -> typing.Any:
+    """
+    Reads a `.toml` file (Python 3.11 or newer) or, for other extensions,
+    a JSON file.
+    """
+    if os.fspath(path).endswith(".toml"):
+        try:
+            import tomllib  # type: ignore[import-not-found]
+        except ImportError:
+            raise ValueError("TOML files require Python 3.11 or newer") from None
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _file_signature(
+    path: _Path,
+) -> typing.List[int]:
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
@@ -1,4 +1,6 @@
 import re
+import threading
+import typing
 
 from coloredstrings import types
 
@@ -18,157 +20,26 @@ _ANSI_ESCAPE = re.compile(
 )
 
 
-# Taken from: https://drafts.csswg.org/css-color/#named-colors
-_NAMED_COLORS = {
-    "aliceblue": (240, 248, 255),
-    "antiquewhite": (250, 235, 215),
-    "aqua": (0, 255, 255),
-    "aquamarine": (127, 255, 212),
-    "azure": (240, 255, 255),
-    "beige": (245, 245, 220),
-    "bisque": (255, 228, 196),
-    "black": (0, 0, 0),
-    "blanchedalmond": (255, 235, 205),
-    "blue": (0, 0, 255),
-    "blueviolet": (138, 43, 226),
-    "brown": (165, 42, 42),
-    "burlywood": (222, 184, 135),
-    "cadetblue": (95, 158, 160),
-    "chartreuse": (127, 255, 0),
-    "chocolate": (210, 105, 30),
-    "coral": (255, 127, 80),
-    "cornflowerblue": (100, 149, 237),
-    "cornsilk": (255, 248, 220),
-    "crimson": (220, 20, 60),
-    "cyan": (0, 255, 255),
-    "darkblue": (0, 0, 139),
-    "darkcyan": (0, 139, 139),
-    "darkgoldenrod": (184, 134, 11),
-    "darkgray": (169, 169, 169),
-    "darkgreen": (0, 100, 0),
-    "darkgrey": (169, 169, 169),
-    "darkkhaki": (189, 183, 107),
-    "darkmagenta": (139, 0, 139),
-    "darkolivegreen": (85, 107, 47),
-    "darkorange": (255, 140, 0),
-    "darkorchid": (153, 50, 204),
-    "darkred": (139, 0, 0),
-    "darksalmon": (233, 150, 122),
-    "darkseagreen": (143, 188, 143),
-    "darkslateblue": (72, 61, 139),
-    "darkslategray": (47, 79, 79),
-    "darkslategrey": (47, 79, 79),
-    "darkturquoise": (0, 206, 209),
-    "darkviolet": (148, 0, 211),
-    "deeppink": (255, 20, 147),
-    "deepskyblue": (0, 191, 255),
-    "dimgray": (105, 105, 105),
-    "dimgrey": (105, 105, 105),
-    "dodgerblue": (30, 144, 255),
-    "firebrick": (178, 34, 34),
-    "floralwhite": (255, 250, 240),
-    "forestgreen": (34, 139, 34),
-    "fuchsia": (255, 0, 255),
-    "gainsboro": (220, 220, 220),
-    "ghostwhite": (248, 248, 255),
-    "gold": (255, 215, 0),
-    "goldenrod": (218, 165, 32),
-    "gray": (128, 128, 128),
-    "green": (0, 128, 0),
-    "greenyellow": (173, 255, 47),
-    "grey": (128, 128, 128),
-    "honeydew": (240, 255, 240),
-    "hotpink": (255, 105, 180),
-    "indianred": (205, 92, 92),
-    "indigo": (75, 0, 130),
-    "ivory": (255, 255, 240),
-    "khaki": (240, 230, 140),
-    "lavender": (230, 230, 250),
-    "lavenderblush": (255, 240, 245),
-    "lawngreen": (124, 252, 0),
-    "lemonchiffon": (255, 250, 205),
-    "lightblue": (173, 216, 230),
-    "lightcoral": (240, 128, 128),
-    "lightcyan": (224, 255, 255),
-    "lightgoldenrodyellow": (250, 250, 210),
-    "lightgray": (211, 211, 211),
-    "lightgreen": (144, 238, 144),
-    "lightgrey": (211, 211, 211),
-    "lightpink": (255, 182, 193),
-    "lightsalmon": (255, 160, 122),
-    "lightseagreen": (32, 178, 170),
-    "lightskyblue": (135, 206, 250),
-    "lightslategray": (119, 136, 153),
-    "lightslategrey": (119, 136, 153),
-    "lightsteelblue": (176, 196, 222),
-    "lightyellow": (255, 255, 224),
-    "lime": (0, 255, 0),
-    "limegreen": (50, 205, 50),
-    "linen": (250, 240, 230),
-    "magenta": (255, 0, 255),
-    "maroon": (128, 0, 0),
-    "mediumaquamarine": (102, 205, 170),
-    "mediumblue": (0, 0, 205),
-    "mediumorchid": (186, 85, 211),
-    "mediumpurple": (147, 112, 219),
-    "mediumseagreen": (60, 179, 113),
-    "mediumslateblue": (123, 104, 238),
-    "mediumspringgreen": (0, 250, 154),
-    "mediumturquoise": (72, 209, 204),
-    "mediumvioletred": (199, 21, 133),
-    "midnightblue": (25, 25, 112),
-    "mintcream": (245, 255, 250),
-    "mistyrose": (255, 228, 225),
-    "moccasin": (255, 228, 181),
-    "navajowhite": (255, 222, 173),
-    "navy": (0, 0, 128),
-    "oldlace": (253, 245, 230),
-    "olive": (128, 128, 0),
-    "olivedrab": (107, 142, 35),
-    "orange": (255, 165, 0),
-    "orangered": (255, 69, 0),
-    "orchid": (218, 112, 214),
-    "palegoldenrod": (238, 232, 170),
-    "palegreen": (152, 251, 152),
-    "paleturquoise": (175, 238, 238),
-    "palevioletred": (219, 112, 147),
-    "papayawhip": (255, 239, 213),
-    "peachpuff": (255, 218, 185),
-    "peru": (205, 133, 63),
-    "pink": (255, 192, 203),
-    "plum": (221, 160, 221),
-    "powderblue": (176, 224, 230),
-    "purple": (128, 0, 128),
-    "rebeccapurple": (102, 51, 153),
-    "red": (255, 0, 0),
-    "rosybrown": (188, 143, 143),
-    "royalblue": (65, 105, 225),
-    "saddlebrown": (139, 69, 19),
-    "salmon": (250, 128, 114),
-    "sandybrown": (244, 164, 96),
-    "seagreen": (46, 139, 87),
-    "seashell": (255, 245, 238),
-    "sienna": (160, 82, 45),
-    "silver": (192, 192, 192),
-    "skyblue": (135, 206, 235),
-    "slateblue": (106, 90, 205),
-    "slategray": (112, 128, 144),
-    "slategrey": (112, 128, 144),
-    "snow": (255, 250, 250),
-    "springgreen": (0, 255, 127),
-    "steelblue": (70, 130, 180),
-    "tan": (210, 180, 140),
-    "teal": (0, 128, 128),
-    "thistle": (216, 191, 216),
-    "tomato": (255, 99, 71),
-    "turquoise": (64, 224, 208),
-    "violet": (238, 130, 238),
-    "wheat": (245, 222, 179),
-    "white": (255, 255, 255),
-    "whitesmoke": (245, 245, 245),
-    "yellow": (255, 255, 0),
-    "yellowgreen": (154, 205, 50),
-}
+_named_color_table: typing.Optional[typing.Dict[str, typing.Tuple[int, int, int]]] = (
+    None
+)
+
+
+def _named_colors() -> typing.Dict[str, typing.Tuple[int, int, int]]:
+    global _named_color_table
+    table = _named_color_table
+    if table is None:
+        # Imported on first use, so that `import coloredstrings` stays cheap
+        from coloredstrings._named_colors import NAMED_COLORS
+
+        table = _named_color_table = NAMED_COLORS
+    return table
+
+
+def __getattr__(name: str) -> typing.Any:
+    if name == "_NAMED_COLORS":
+        return _named_colors()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def strip_ansi(colored_text: str) -> str:
@@ -181,11 +52,177 @@ def strip_ansi(colored_text: str) -> str:
     return _ANSI_ESCAPE.sub("", colored_text)
 
 
+_K = typing.TypeVar("_K", bound=typing.Hashable)
+_V = typing.TypeVar("_V")
+
+
+class _ConcurrentCache(typing.Generic[_K, _V]):
+    """
+    Bounded memo dictionary shared between threads without a lock.
+
+    A lookup is a single `dict.get` and a store a single `dict.setdefault`, both atomic
+    on regular and free-threaded CPython, so readers never wait for each other.
+    Threads missing the same key at once may all compute its value, but they agree
+    on whichever is stored first. A full cache is cleared rather than evicting
+    entries one by one, which would need a lock to keep its order consistent.
+    """
+
+    counting = False
+    """Whether lookups are counted in `hits` and `misses`; toggled by `stats.enable`."""
+
+    def __init__(self, name: str, maxsize: int) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: typing.Dict[_K, _V] = {}
+        _CACHES[name] = self
+
+    def get(self, key: _K) -> typing.Optional[_V]:
+        value = self._data.get(key)
+        if self.counting:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def put(self, key: _K, value: _V) -> _V:
+        """Stores `value` unless another thread stored one first, and returns the stored one."""
+        data = self._data
+        if len(data) >= self.maxsize:
+            data.clear()
+        return data.setdefault(key, value)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Every `_ConcurrentCache` by name
+_CACHES: typing.Dict[str, _ConcurrentCache[typing.Any, typing.Any]] = {}
+
+
+# Side of a cell of the grid used by `nearest_named_color`; the RGB cube is split into
+# (256 / _CELL_SIZE) ** 3 cells, each knowing the few named colors that can be nearest
+# to any point inside of it.
+_CELL_SIZE = 32
+_CELLS_PER_AXIS = 256 // _CELL_SIZE
+
+_named_color_by_rgb: typing.Optional[typing.Dict[typing.Tuple[int, int, int], str]] = (
+    None
+)
+_named_color_grid: typing.Optional[typing.List[typing.List[str]]] = None
+# Held only while the index is built, so that concurrent first calls build it once
+_named_color_lock = threading.Lock()
+
+
+def nearest_named_color(
+    rgb: typing.Union[types.Rgb, typing.Tuple[int, int, int]],
+) -> str:
+    """
+    Returns the name of the CSS named color closest (by euclidean distance in RGB)
+    to the given color. Colors having several names (like `aqua` and `cyan`)
+    are reported by the first of them in alphabetical order.
+
+    Lookup tables are built on the first call; after that a lookup is an exact
+    dictionary hit or a scan of the handful of candidates of a single grid cell.
+    """
+    if isinstance(rgb, types.Rgb):
+        r, g, b = rgb.r, rgb.g, rgb.b
+    else:
+        r, g, b = rgb
+
+    by_rgb = _named_color_by_rgb
+    grid = _named_color_grid
+    if by_rgb is None or grid is None:
+        by_rgb, grid = _build_named_color_index()
+
+    name = by_rgb.get((r, g, b))
+    if name is not None:
+        return name
+
+    if not (0 <= r <= 255 and 0 <= g <= 255 and 0 <= b <= 255):
+        r, g, b = (max(0, min(255, c)) for c in (r, g, b))
+    cell = (
+        (r // _CELL_SIZE) * _CELLS_PER_AXIS + g // _CELL_SIZE
+    ) * _CELLS_PER_AXIS + b // _CELL_SIZE
+
+    best = ""
+    best_distance = -1
+    named_colors = _named_colors()
+    for candidate in grid[cell]:
+        cr, cg, cb = named_colors[candidate]
+        distance = (cr - r) ** 2 + (cg - g) ** 2 + (cb - b) ** 2
+        if best_distance < 0 or distance < best_distance:
+            best = candidate
+            best_distance = distance
+    return best
+
+
+def _build_named_color_index() -> typing.Tuple[
+    typing.Dict[typing.Tuple[int, int, int], str], typing.List[typing.List[str]]
+]:
+    global _named_color_by_rgb, _named_color_grid
+
+    with _named_color_lock:
+        if _named_color_by_rgb is not None and _named_color_grid is not None:
+            return _named_color_by_rgb, _named_color_grid
+        by_rgb, grid = _named_color_index()
+        # The grid is published before the dictionary checked first by readers
+        _named_color_grid = grid
+        _named_color_by_rgb = by_rgb
+    return by_rgb, grid
+
+
+def _named_color_index() -> typing.Tuple[
+    typing.Dict[typing.Tuple[int, int, int], str], typing.List[typing.List[str]]
+]:
+    named_colors = _named_colors()
+    by_rgb: typing.Dict[typing.Tuple[int, int, int], str] = {}
+    for name, rgb in named_colors.items():
+        by_rgb.setdefault(rgb, name)
+    names = list(by_rgb.values())
+
+    # For every cell along one axis and every color: the smallest and the largest
+    # squared distance between the color's component and the cell's interval.
+    def axis_bounds(
+        axis: int,
+    ) -> typing.List[typing.Tuple[typing.List[int], typing.List[int]]]:
+        bounds = []
+        for i in range(_CELLS_PER_AXIS):
+            lo = i * _CELL_SIZE
+            hi = lo + _CELL_SIZE - 1
+            components = [named_colors[name][axis] for name in names]
+            nearest = [
+                (lo - c) ** 2 if c < lo else (c - hi) ** 2 if c > hi else 0
+                for c in components
+            ]
+            farthest = [max((c - lo) ** 2, (c - hi) ** 2) for c in components]
+            bounds.append((nearest, farthest))
+        return bounds
+
+    r_bounds, g_bounds, b_bounds = (axis_bounds(axis) for axis in range(3))
+
+    grid: typing.List[typing.List[str]] = []
+    for r_near, r_far in r_bounds:
+        for g_near, g_far in g_bounds:
+            for b_near, b_far in b_bounds:
+                nearest = [sum(d) for d in zip(r_near, g_near, b_near)]
+                # No point of the cell is farther than this from some color,
+                # so colors which cannot get closer than that are never the nearest
+                limit = min(sum(d) for d in zip(r_far, g_far, b_far))
+                grid.append([name for name, d in zip(names, nearest) if d <= limit])
+    return by_rgb, grid
+
+
 def rgb_from_hex_or_named_color(color: str) -> types.Rgb:
     s = color.strip().lower()
 
     # First check if it can be interpreted as a name for a color
-    named_color = _NAMED_COLORS.get(s)
+    named_color = _named_colors().get(s)
     if named_color is not None:
         return types.Rgb(*named_color)
 
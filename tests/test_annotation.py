@@ -0,0 +1,76 @@
+import pytest
+
+from coloredstrings import ColorMode, StyleBuilder, annotate, strip_ansi
+from coloredstrings.annotation import annotate as annotate_
+
+
+@pytest.fixture
+def style() -> StyleBuilder:
+    return StyleBuilder(mode=ColorMode.ANSI_16)
+
+
+def test_annotate(style: StyleBuilder) -> None:
+    text = "def f(): pass"
+    assert (
+        annotate(text, [(0, 3, style.blue), (4, 5, style.yellow)], ColorMode.ANSI_16)
+        == "\x1b[34mdef\x1b[0m \x1b[33mf\x1b[0m(): pass"
+    )
+
+
+def test_annotate_unordered_ranges(style: StyleBuilder) -> None:
+    ranges = [(4, 5, style.yellow), (0, 3, style.blue)]
+    assert annotate("def f", ranges, ColorMode.ANSI_16) == (
+        "\x1b[34mdef\x1b[0m \x1b[33mf\x1b[0m"
+    )
+
+
+def test_annotate_adjacent_ranges(style: StyleBuilder) -> None:
+    ranges = [(0, 1, style.red), (1, 2, style.red.bold), (2, 3, style.red.bold)]
+    assert annotate("abc", ranges, ColorMode.ANSI_16) == "\x1b[31ma\x1b[1mbc\x1b[0m"
+
+
+def test_annotate_layers(style: StyleBuilder) -> None:
+    ranges = [
+        (0, 6, style.red.on.black),
+        (2, 4, style.blue.bold),
+        (3, 5, style.underline),
+    ]
+    assert annotate("abcdef", ranges, ColorMode.ANSI_16) == (
+        "\x1b[31;40mab\x1b[1;34mc\x1b[4md\x1b[22;31me\x1b[24mf\x1b[0m"
+    )
+
+
+def test_annotate_later_ranges_win(style: StyleBuilder) -> None:
+    ranges = [(0, 2, style.blue), (0, 2, style.red)]
+    assert annotate("ab", ranges, ColorMode.ANSI_16) == "\x1b[31mab\x1b[0m"
+
+
+def test_annotate_clips_ranges(style: StyleBuilder) -> None:
+    ranges = [(-5, 1, style.red), (2, 100, style.blue), (1, 1, style.green)]
+    assert annotate("abc", ranges, ColorMode.ANSI_16) == (
+        "\x1b[31ma\x1b[0mb\x1b[34mc\x1b[0m"
+    )
+
+
+def test_annotate_without_ranges_or_colors(style: StyleBuilder) -> None:
+    assert annotate("abc", [], ColorMode.ANSI_16) == "abc"
+    assert annotate("abc", [(0, 3, style.red)], ColorMode.NO_COLOR) == "abc"
+
+
+def test_annotate_keeps_text(style: StyleBuilder) -> None:
+    text = "the quick brown fox"
+    ranges = [(i, i + 3, style.rgb(i, 0, 0)) for i in range(0, len(text), 2)]
+    assert strip_ansi(annotate(text, ranges, ColorMode.TRUE_COLOR)) == text
+
+
+def test_annotate_ranges_from_generator(style: StyleBuilder) -> None:
+    # Builders made on the fly are freed between ranges, so their ids get reused
+    colors = ["red", "green", "blue", "yellow", "magenta", "cyan"]
+    ranges = ((i, i + 1, style | getattr(style, c)) for i, c in enumerate(colors))
+    assert annotate("abcdef", ranges, ColorMode.ANSI_16) == (
+        "\x1b[31ma\x1b[32mb\x1b[34mc\x1b[33md\x1b[35me\x1b[36mf\x1b[0m"
+    )
+
+
+def test_annotate_is_exported() -> None:
+    assert annotate is annotate_
@@ -0,0 +1,78 @@
+import io
+
+import pytest
+
+from coloredstrings import ColorMode, StyleBuilder
+from coloredstrings.ansi_html import AnsiToHtml, color_to_hex, convert_file, to_html
+from coloredstrings.types import Ansi16Color, Extended256, Rgb
+
+
+@pytest.fixture
+def style() -> StyleBuilder:
+    return StyleBuilder(mode=ColorMode.TRUE_COLOR)
+
+
+@pytest.mark.parametrize(
+    "color, expected",
+    [
+        (Ansi16Color.RED, "#cd0000"),
+        (Ansi16Color.BRIGHT_WHITE, "#ffffff"),
+        (Extended256(1), "#cd0000"),
+        (Extended256(196), "#ff0000"),
+        (Extended256(232), "#080808"),
+        (Rgb(1, 2, 255), "#0102ff"),
+    ],
+)
+def test_color_to_hex(color, expected: str) -> None:
+    assert color_to_hex(color) == expected
+
+
+def test_plain_text_is_escaped() -> None:
+    assert to_html("<a> & b") == "&lt;a&gt; &amp; b"
+
+
+def test_inline_styles(style: StyleBuilder) -> None:
+    text = "x " + style.red.bold("<y>") + style.on.rgb(0, 0, 255).underline("z")
+    assert to_html(text) == (
+        'x <span style="color: #cd0000; font-weight: bold">&lt;y&gt;</span>'
+        '<span style="background-color: #0000ff; text-decoration: underline">z</span>'
+    )
+
+
+def test_underline_colors_are_ignored() -> None:
+    assert to_html("\x1b[58;5;1m\x1b[4mx") == (
+        '<span style="text-decoration: underline">x</span>'
+    )
+
+
+def test_inverse_swaps_colors(style: StyleBuilder) -> None:
+    assert to_html(style.red.inverse("x")) == (
+        '<span style="color: Canvas; background-color: #cd0000">x</span>'
+    )
+
+
+def test_class_table_is_deduplicated(style: StyleBuilder) -> None:
+    converter = AnsiToHtml(inline=False)
+    body = converter.feed(style.red("a") + style.green("b") + style.red("c"))
+    body += converter.close()
+    assert body == (
+        '<span class="cs0">a</span><span class="cs1">b</span><span class="cs0">c</span>'
+    )
+    assert converter.stylesheet() == ".cs0 { color: #cd0000 }\n.cs1 { color: #00cd00 }"
+
+
+def test_escape_split_between_chunks(style: StyleBuilder) -> None:
+    text = style.color256(208)("hot")
+    converter = AnsiToHtml()
+    out = "".join(converter.feed(ch) for ch in text) + converter.close()
+    assert out == to_html(text)
+
+
+def test_convert_file(style: StyleBuilder) -> None:
+    src = io.StringIO(style.blue("line 1") + "\nline 2\n")
+    dst = io.StringIO()
+    convert_file(src, dst, inline=False, title="CI <log>", chunk_size=3)
+    document = dst.getvalue()
+    assert "<title>CI &lt;log&gt;</title>" in document
+    assert '<pre><span class="cs0">line 1</span>\nline 2\n</pre>' in document
+    assert ".cs0 { color: #0000ee }" in document
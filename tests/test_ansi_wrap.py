@@ -0,0 +1,78 @@
+import textwrap
+
+import pytest
+from helper import r
+
+from coloredstrings import ColorMode, StyleBuilder, utils
+from coloredstrings.ansi_wrap import AnsiWrapper, fill, wrap, wrap_stream
+
+
+@pytest.fixture
+def style() -> StyleBuilder:
+    return StyleBuilder(mode=ColorMode.ANSI_16)
+
+
+@pytest.mark.parametrize(
+    "text, width",
+    [
+        ("The quick brown fox jumps over the lazy dog", 10),
+        ("  leading and   repeated    whitespace  ", 8),
+        ("a verylongwordhere b", 5),
+        ("ab cd verylongword", 7),
+        ("", 5),
+        ("   ", 5),
+    ],
+)
+def test_plain_text_matches_textwrap(text: str, width: int) -> None:
+    assert wrap(text, width) == textwrap.wrap(text, width)
+
+
+def test_escape_codes_are_zero_width(style: StyleBuilder) -> None:
+    text = style.red("hello") + " " + style.blue("world")
+    assert [utils.strip_ansi(line) for line in wrap(text, 11)] == ["hello world"]
+
+
+def test_state_is_closed_and_reopened_across_lines(style: StyleBuilder) -> None:
+    text = style.red("hello world " + style.bold("this is bold") + " end")
+    assert r(wrap(text, 10)) == r(
+        [
+            "\x1b[31mhello\x1b[0m",
+            "\x1b[31mworld \x1b[1mthis\x1b[0m",
+            "\x1b[1;31mis bold\x1b[22m\x1b[0m",
+            "\x1b[31mend\x1b[39m",
+        ]
+    )
+
+
+def test_long_styled_word_is_broken(style: StyleBuilder) -> None:
+    assert r(wrap(style.green("abcdefgh"), 3)) == r(
+        ["\x1b[32mabc\x1b[0m", "\x1b[32mdef\x1b[0m", "\x1b[32mgh\x1b[39m"]
+    )
+
+
+def test_indents() -> None:
+    assert fill("one two three", 7, initial_indent="* ", subsequent_indent="  ") == (
+        "* one\n  two\n  three"
+    )
+
+
+def test_state_is_carried_between_paragraphs() -> None:
+    wrapper = AnsiWrapper(width=20)
+    assert wrapper.wrap("\x1b[31mfirst") == ["\x1b[31mfirst\x1b[0m"]
+    assert wrapper.wrap("second\x1b[39m") == ["\x1b[31msecond\x1b[39m"]
+    assert wrapper.state.is_default
+
+
+def test_wrap_stream(style: StyleBuilder) -> None:
+    paragraphs = iter(["one two", style.red("three four")])
+    assert list(wrap_stream(paragraphs, 5)) == [
+        "one",
+        "two",
+        "\x1b[31mthree\x1b[0m",
+        "\x1b[31mfour\x1b[39m",
+    ]
+
+
+def test_invalid_width() -> None:
+    with pytest.raises(ValueError):
+        AnsiWrapper(width=0)
@@ -0,0 +1,122 @@
+import io
+import json
+import sys
+import types
+
+import pytest
+
+from coloredstrings import cli
+
+
+@pytest.fixture
+def rules(tmp_path) -> str:
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps([{"pattern": r"\bERROR\b", "style": "red"}]))
+    return str(path)
+
+
+def run(monkeypatch, argv, stdin: bytes = b"") -> bytes:
+    out = io.BytesIO()
+    monkeypatch.setattr(sys, "stdin", types.SimpleNamespace(buffer=io.BytesIO(stdin)))
+    monkeypatch.setattr(
+        sys, "stdout", types.SimpleNamespace(buffer=out, isatty=lambda: False)
+    )
+    assert cli.main(argv) == 0
+    return out.getvalue()
+
+
+def test_highlight_stdin(monkeypatch, rules: str) -> None:
+    output = run(monkeypatch, ["highlight", rules, "--mode", "16"], b"an ERROR\n")
+    assert output == b"an \x1b[31mERROR\x1b[39m\n"
+
+
+def test_highlight_files(monkeypatch, rules: str, tmp_path) -> None:
+    path = tmp_path / "log.txt"
+    path.write_bytes(b"ERROR 1\n")
+    output = run(
+        monkeypatch, ["--mode", "16", "highlight", rules, str(path), "-"], b"ok\n"
+    )
+    assert output == b"\x1b[31mERROR\x1b[39m 1\nok\n"
+
+
+def test_highlight_no_color(monkeypatch, rules: str) -> None:
+    output = run(monkeypatch, ["highlight", "--no-color", rules], b"an ERROR\n")
+    assert output == b"an ERROR\n"
+
+
+def test_highlight_invalid_rules(tmp_path, capsys) -> None:
+    path = tmp_path / "rules.json"
+    path.write_text("{}")
+    with pytest.raises(SystemExit) as e:
+        cli.main(["highlight", str(path)])
+    assert e.value.code == 1
+    assert "expected a list of rules" in capsys.readouterr().err
+
+
+def test_highlight_invalid_pattern(tmp_path, capsys) -> None:
+    path = tmp_path / "rules.json"
+    path.write_text('[{"pattern": "(", "style": "red"}]')
+    with pytest.raises(SystemExit) as e:
+        cli.main(["highlight", str(path)])
+    assert e.value.code == 1
+    assert "Invalid pattern '('" in capsys.readouterr().err
+
+
+def test_highlight_conflicting_rules(tmp_path, capsys) -> None:
+    path = tmp_path / "rules.json"
+    path.write_text(
+        '[{"pattern": "(?P<x>a)", "style": "red"},'
+        ' {"pattern": "(?P<x>b)", "style": "blue"}]'
+    )
+    with pytest.raises(SystemExit) as e:
+        cli.main(["highlight", str(path)])
+    assert e.value.code == 1
+    assert "redefinition of group name 'x'" in capsys.readouterr().err
+
+
+def test_demo(capsys) -> None:
+    assert cli.main(["--no-color"]) == 0
+    output = capsys.readouterr().out
+    assert "Red color" in output
+    assert "\x1b" not in output
+
+
+COLORED = "\x1b[1;38;2;255;105;180mhé\x1b[0m \x1b[31m\x1b[34mx\x1b[31m\x1b[39m\n"
+
+
+@pytest.mark.parametrize("block_size", [3, 1 << 20])
+@pytest.mark.parametrize(
+    "command, expected",
+    [
+        (["strip"], "hé x\n"),
+        (
+            ["downsample", "--mode", "16"],
+            "\x1b[1;95mhé\x1b[0m \x1b[31m\x1b[34mx\x1b[31m\x1b[39m\n",
+        ),
+        (["minify"], "\x1b[1;38;2;255;105;180mhé\x1b[0m \x1b[34mx\x1b[0m\n"),
+    ],
+)
+def test_filters(
+    monkeypatch, tmp_path, command, expected: str, block_size: int
+) -> None:
+    monkeypatch.setattr(cli, "_BLOCK_SIZE", block_size)
+    path = tmp_path / "colored.txt"
+    path.write_bytes(COLORED.encode())
+
+    # A regular file is memory mapped, stdin is read
+    output = run(monkeypatch, [*command, str(path), "-"], COLORED.encode())
+    assert output == (expected * 2).encode()
+
+
+def test_downsample_defaults_to_16_colors(monkeypatch) -> None:
+    output = run(monkeypatch, ["downsample"], COLORED.encode())
+    assert output == b"\x1b[1;95mh\xc3\xa9\x1b[0m \x1b[31m\x1b[34mx\x1b[31m\x1b[39m\n"
+
+
+def test_filter_keeps_invalid_bytes(monkeypatch) -> None:
+    assert run(monkeypatch, ["strip"], b"\xff\x1b[31m\xfe") == b"\xff\xfe"
+
+
+def test_filter_stats(monkeypatch, capsys) -> None:
+    run(monkeypatch, ["strip", "--stats"], b"\x1b[31mab\x1b[39m")
+    assert capsys.readouterr().err.startswith("12 bytes in, 2 bytes out (16.7%), ")
@@ -0,0 +1,84 @@
+import pytest
+
+from coloredstrings import ColorMode, StyleBuilder
+from coloredstrings.colormap import Colormap
+
+
+@pytest.fixture
+def latency() -> Colormap:
+    return Colormap([100, 500], ["green", "yellow", "bold red"], mode=ColorMode.ANSI_16)
+
+
+def test_render(latency: Colormap) -> None:
+    assert latency.render([12, 100, 499.5, 1200], "{:>4}") == [
+        "\x1b[32m  12\x1b[39m",
+        "\x1b[33m 100\x1b[39m",
+        "\x1b[33m499.5\x1b[39m",
+        "\x1b[31m\x1b[1m1200\x1b[22m\x1b[39m",
+    ]
+
+
+def test_index(latency: Colormap) -> None:
+    assert latency.index([-1, 100, 500, float("nan")]) == [0, 1, 2, 2]
+
+
+def test_call_and_code_pair(latency: Colormap) -> None:
+    assert latency(250, ">5") == "\x1b[33m  250\x1b[39m"
+    assert latency.code_pair(250).start == "\x1b[33m"
+    assert latency(250, mode=ColorMode.NO_COLOR) == "250"
+
+
+def test_render_no_color(latency: Colormap) -> None:
+    assert latency.render([1, 1000], "{:.1f}", mode=ColorMode.NO_COLOR) == [
+        "1.0",
+        "1000.0",
+    ]
+
+
+def test_render_builders() -> None:
+    style = StyleBuilder()
+    colormap = Colormap([0], [style.blue, style.on.red], mode=ColorMode.ANSI_16)
+    assert colormap.render(range(-1, 1)) == ["\x1b[34m-1\x1b[39m", "\x1b[41m0\x1b[49m"]
+
+
+def test_gradient() -> None:
+    colormap = Colormap.gradient(
+        ["#000000", (255, 0, 0), "white"], 0, 10, steps=5, mode=ColorMode.TRUE_COLOR
+    )
+    assert colormap.bounds == [2, 4, 6, 8]
+    assert [colormap.code_pair(v).start for v in (-5, 3, 5, 7, 9, 50)] == [
+        "\x1b[38;2;0;0;0m",
+        "\x1b[38;2;128;0;0m",
+        "\x1b[38;2;255;0;0m",
+        "\x1b[38;2;255;128;128m",
+        "\x1b[38;2;255;255;255m",
+        "\x1b[38;2;255;255;255m",
+    ]
+
+
+def test_gradient_base() -> None:
+    colormap = Colormap.gradient(
+        ["black", "white"], 0, 1, steps=2, base=StyleBuilder().bold
+    )
+    assert colormap(0, mode=ColorMode.ANSI_16) == "\x1b[30m\x1b[1m0\x1b[22m\x1b[39m"
+
+
+@pytest.mark.parametrize(
+    "bounds, styles, message",
+    [
+        ([1, 2], ["red", "blue"], "one style more than bounds"),
+        ([2, 1], ["red", "blue", "green"], "must be sorted"),
+    ],
+)
+def test_invalid_colormap(bounds, styles, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        Colormap(bounds, styles)
+
+
+def test_numpy(latency: Colormap) -> None:
+    numpy = pytest.importorskip("numpy")
+    values = numpy.array([12.0, 100.0, 1200.0])
+    assert latency.index(values) == [0, 1, 2]
+    assert latency.render(values, "{:.0f}") == latency.render(
+        [12.0, 100.0, 1200.0], "{:.0f}"
+    )
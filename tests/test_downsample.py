@@ -0,0 +1,65 @@
+import io
+
+import pytest
+from helper import r
+
+from coloredstrings import ColorMode, StyleBuilder
+from coloredstrings.downsample import Downsampler, downsample, downsample_file
+
+
+@pytest.fixture
+def style() -> StyleBuilder:
+    return StyleBuilder(mode=ColorMode.TRUE_COLOR)
+
+
+@pytest.mark.parametrize(
+    "mode",
+    [
+        ColorMode.NO_COLOR,
+        ColorMode.ANSI_16,
+        ColorMode.EXTENDED_256,
+        ColorMode.TRUE_COLOR,
+    ],
+)
+def test_matches_styling_in_target_mode(style: StyleBuilder, mode: ColorMode) -> None:
+    builders = [
+        style.rgb(20, 40, 60),
+        style.on.rgb(255, 105, 180).bold,
+        style.color256(208).on.color256(17),
+        style.red.on.blue.underline,
+    ]
+    for builder in builders:
+        assert r(downsample(builder("foo"), mode)) == r(builder("foo", mode=mode))
+
+
+def test_other_parameters_are_kept() -> None:
+    assert r(downsample("\x1b[1;38;2;255;0;0;4mx\x1b[0m", ColorMode.EXTENDED_256)) == r(
+        "\x1b[1;38;5;196;4mx\x1b[0m"
+    )
+    assert r(downsample("\x1b[38:5:196mx", ColorMode.ANSI_16)) == r("\x1b[91mx")
+
+
+def test_underline_colors() -> None:
+    text = "\x1b[4;58;2;255;0;0mx\x1b[58:5:196my\x1b[59m"
+    assert r(downsample(text, ColorMode.EXTENDED_256)) == r(
+        "\x1b[4;58;5;196mx\x1b[58;5;196my\x1b[59m"
+    )
+    assert r(downsample(text, ColorMode.ANSI_16)) == r("\x1b[4mxy\x1b[59m")
+
+
+def test_other_escapes_are_kept() -> None:
+    assert r(downsample("\x1b[2K\x1b[38;5;196mx", ColorMode.NO_COLOR)) == r("\x1b[2Kx")
+
+
+def test_chunks_split_escape_sequences(style: StyleBuilder) -> None:
+    text = style.rgb(1, 2, 3)("a") + style.on.rgb(200, 100, 0)("b")
+    converter = Downsampler(ColorMode.ANSI_16)
+    out = "".join(converter.feed(ch) for ch in text) + converter.close()
+    assert r(out) == r(downsample(text, ColorMode.ANSI_16))
+
+
+def test_downsample_file(style: StyleBuilder) -> None:
+    src = io.StringIO(style.rgb(255, 0, 0)("red") + "\n" * 3)
+    dst = io.StringIO()
+    downsample_file(src, dst, ColorMode.ANSI_16, chunk_size=4)
+    assert r(dst.getvalue()) == r("\x1b[91mred\x1b[39m\n\n\n")
@@ -0,0 +1,65 @@
+import pickle
+
+import pytest
+
+from coloredstrings import ColorMode, StyleBuilder
+from coloredstrings.extensions import EMPTY_REGISTRY, ExtensionRegistry
+
+
+@pytest.fixture
+def style() -> StyleBuilder:
+    return StyleBuilder(mode=ColorMode.TRUE_COLOR)
+
+
+def test_extend_shares_parent(style: StyleBuilder) -> None:
+    base = style.extend(primary="blue")
+    extended = base.extend(secondary=(1, 2, 3))
+    assert extended.extensions._parent is base.extensions
+    assert dict(extended.extensions) == {"primary": "blue", "secondary": (1, 2, 3)}
+    assert len(extended.extensions) == 2
+
+
+def test_later_entries_override_earlier_ones(style: StyleBuilder) -> None:
+    extended = style.extend(primary="blue").extend(primary="red")
+    assert extended.extensions["primary"] == "red"
+    assert extended.primary.fg == style.rgb("red").fg
+    assert list(extended.extensions) == ["primary"]
+
+
+def test_lookup_returns_ready_builders(style: StyleBuilder) -> None:
+    shout = style.red.bold
+    extended = style.extend(primary="#0000ff", shout=shout).bold
+    assert extended.primary.fg == style.rgb(0, 0, 255).fg
+    assert extended.primary.attrs == extended.attrs
+    assert extended.shout is shout
+    assert extended.pink.fg == style.pink.fg
+
+
+def test_colors_are_parsed_by_extend(style: StyleBuilder) -> None:
+    with pytest.raises(ValueError):
+        style.extend(primary="notacolor")
+
+
+def test_empty_extensions(style: StyleBuilder) -> None:
+    assert style.extensions is EMPTY_REGISTRY
+    assert style.extend() == style
+    assert not style.extensions
+
+
+def test_plain_mapping_is_accepted() -> None:
+    builder = StyleBuilder(mode=ColorMode.TRUE_COLOR, extensions={"primary": "blue"})
+    assert isinstance(builder.extensions, ExtensionRegistry)
+    assert builder.primary == builder.rgb("blue")
+
+
+def test_registry_equality(style: StyleBuilder) -> None:
+    assert style.extend(a="red").extend(b="blue") == style.extend(a="red", b="blue")
+    assert ExtensionRegistry({"a": "red"}) == {"a": "red"}
+
+
+def test_pickled_registry_keeps_chain(style: StyleBuilder) -> None:
+    extended = style.extend(primary="blue").extend(secondary="red")
+    restored = pickle.loads(pickle.dumps(extended))
+    assert restored == extended
+    assert restored.secondary == extended.secondary
+    assert restored.extensions._parent is not None
@@ -0,0 +1,198 @@
+import io
+import json
+
+import pytest
+
+from coloredstrings import ColorMode, StyleBuilder
+from coloredstrings.highlight import Highlighter, KeywordHighlighter, load_rules
+
+RULES = [
+    (r"\b(?:ERROR|FATAL)\b", "bold red"),
+    (r"\bWARN(?:ING)?\b", "yellow"),
+    (r"\b\d+\b", "cyan"),
+    (r"\d+ms$", "green"),
+]
+
+
+@pytest.fixture
+def highlighter() -> Highlighter:
+    return Highlighter(RULES, mode=ColorMode.ANSI_16)
+
+
+def test_highlight(highlighter: Highlighter) -> None:
+    assert (
+        highlighter.highlight("ERROR in 3 tasks, WARNING")
+        == "\x1b[31m\x1b[1mERROR\x1b[22m\x1b[39m in \x1b[36m3\x1b[39m tasks, "
+        "\x1b[33mWARNING\x1b[39m"
+    )
+
+
+def test_highlight_first_rule_wins(highlighter: Highlighter) -> None:
+    # `\b\d+\b` does not match `12ms`, while the later `\d+ms$` does
+    assert highlighter.highlight("took 12ms") == "took \x1b[32m12ms\x1b[39m"
+    assert highlighter.highlight("12") == "\x1b[36m12\x1b[39m"
+
+
+def test_highlight_anchors_match_every_line(highlighter: Highlighter) -> None:
+    assert (
+        highlighter.highlight("a 1ms\nb 2ms\n")
+        == "a \x1b[32m1ms\x1b[39m\nb \x1b[32m2ms\x1b[39m\n"
+    )
+
+
+def test_highlight_builders_and_groups() -> None:
+    highlighter = Highlighter(
+        [(r"(?P<key>\w+)=(\w+)", StyleBuilder().blue), ("x", "red")],
+        mode=ColorMode.ANSI_16,
+    )
+    assert highlighter.highlight("a=b x") == "\x1b[34ma=b\x1b[39m \x1b[31mx\x1b[39m"
+
+
+def test_highlight_ignore_case() -> None:
+    highlighter = Highlighter(RULES, mode=ColorMode.ANSI_16, ignore_case=True)
+    assert highlighter.highlight("warn") == "\x1b[33mwarn\x1b[39m"
+
+
+def test_highlight_empty_matches_are_skipped() -> None:
+    highlighter = Highlighter([("x*", "red")], mode=ColorMode.ANSI_16)
+    assert highlighter.highlight("axb") == "a\x1b[31mx\x1b[39mb"
+
+
+@pytest.mark.parametrize(
+    "rules, mode", [([], ColorMode.ANSI_16), (RULES, ColorMode.NO_COLOR)]
+)
+def test_highlight_noop(rules, mode: ColorMode) -> None:
+    highlighter = Highlighter(rules, mode=mode)
+    assert highlighter.is_noop
+    assert highlighter.highlight("ERROR 1") == "ERROR 1"
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 1 << 20])
+def test_highlight_file(highlighter: Highlighter, block_size: int) -> None:
+    data = "ERROR 42\nnothing\nWARN é \xff\nno newline 7".encode(
+        "utf-8", "surrogateescape"
+    )
+    dst = io.BytesIO()
+    highlighter.highlight_file(io.BytesIO(data), dst, block_size=block_size)
+
+    expected = highlighter.highlight(data.decode("utf-8", "surrogateescape"))
+    assert dst.getvalue() == expected.encode("utf-8", "surrogateescape")
+
+
+def test_highlight_file_passthrough() -> None:
+    data = b"ERROR \xff\n" * 10
+    dst = io.BytesIO()
+    Highlighter(RULES, mode=ColorMode.NO_COLOR).highlight_file(io.BytesIO(data), dst)
+    assert dst.getvalue() == data
+
+
+def test_invalid_pattern() -> None:
+    with pytest.raises(ValueError, match="Invalid pattern"):
+        Highlighter([("ERROR", "red"), ("(", "blue")], mode=ColorMode.ANSI_16)
+
+
+def test_duplicate_group_names() -> None:
+    rules = [("(?P<x>a)", "red"), ("(?P<x>b)", "blue")]
+    with pytest.raises(ValueError, match="cannot be combined.*group name 'x'"):
+        Highlighter(rules, mode=ColorMode.ANSI_16)
+
+
+def test_inline_flags_are_scoped_to_their_rule() -> None:
+    highlighter = Highlighter(
+        [("(?i)error", "red"), ("warn", "blue"), ("(?x) ok  # comment", "green")],
+        mode=ColorMode.ANSI_16,
+    )
+    assert highlighter.highlight("ERROR WARN warn ok") == (
+        "\x1b[31mERROR\x1b[39m WARN \x1b[34mwarn\x1b[39m \x1b[32mok\x1b[39m"
+    )
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_inline_flags_not_at_start() -> None:
+    with pytest.raises(ValueError, match="pattern 'a\\(\\?i\\)b'"):
+        Highlighter([("a(?i)b", "red")], mode=ColorMode.ANSI_16)
+
+
+def test_load_rules_json(tmp_path) -> None:
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps([{"pattern": "ERROR", "style": "red"}]))
+    assert load_rules(path) == [("ERROR", "red")]
+
+
+@pytest.mark.parametrize(
+    "data", [{"pattern": "ERROR"}, [{"pattern": "ERROR"}], [{"style": "red"}]]
+)
+def test_load_rules_invalid(tmp_path, data) -> None:
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(data))
+    with pytest.raises(ValueError, match="expected a list of rules"):
+        load_rules(path)
+
+
+KEYWORDS = {"he": "red", "she": "blue", "hers": "green", "his": "bold red"}
+
+
+@pytest.fixture
+def keywords() -> KeywordHighlighter:
+    return KeywordHighlighter(KEYWORDS, mode=ColorMode.ANSI_16)
+
+
+def test_keywords(keywords: KeywordHighlighter) -> None:
+    assert (
+        keywords.highlight("that is his")
+        == "that is \x1b[31m\x1b[1mhis\x1b[22m\x1b[39m"
+    )
+    # Keywords are found inside words too
+    assert keywords.highlight("this") == "t\x1b[31m\x1b[1mhis\x1b[22m\x1b[39m"
+    assert keywords.highlight("nothing") == "nothing"
+
+
+def test_keywords_leftmost_longest(keywords: KeywordHighlighter) -> None:
+    # `she` starts before `he` and `hers`, which overlap it
+    assert keywords.highlight("ushers") == "u\x1b[34mshe\x1b[39mrs"
+    assert keywords.highlight("hers") == "\x1b[32mhers\x1b[39m"
+
+
+def test_keywords_merge_adjacent(keywords: KeywordHighlighter) -> None:
+    # Switching from red to bold red only needs to turn bold on
+    assert keywords.highlight("hehis!") == ("\x1b[31mhe\x1b[1mhis\x1b[22m\x1b[39m!")
+    assert keywords.highlight("hehe") == "\x1b[31mhehe\x1b[39m"
+
+
+def test_keywords_whole_words() -> None:
+    highlighter = KeywordHighlighter(
+        {"user1": "cyan", "user12": "yellow"}, mode=ColorMode.ANSI_16, whole_words=True
+    )
+    assert (
+        highlighter.highlight("user12 user123 user1_ user1.")
+        == "\x1b[33muser12\x1b[39m user123 user1_ \x1b[36muser1\x1b[39m."
+    )
+
+
+def test_keywords_builders() -> None:
+    highlighter = KeywordHighlighter(
+        {"é": StyleBuilder().rgb(255, 0, 0)}, mode=ColorMode.TRUE_COLOR
+    )
+    assert highlighter.highlight("café") == "caf\x1b[38;2;255;0;0mé\x1b[39m"
+
+
+@pytest.mark.parametrize(
+    "keywords, mode", [({}, ColorMode.ANSI_16), (KEYWORDS, ColorMode.NO_COLOR)]
+)
+def test_keywords_noop(keywords, mode: ColorMode) -> None:
+    highlighter = KeywordHighlighter(keywords, mode=mode)
+    assert highlighter.is_noop
+    assert highlighter.highlight("his") == "his"
+
+
+def test_keywords_empty() -> None:
+    with pytest.raises(ValueError, match="empty"):
+        KeywordHighlighter({"": "red"}, mode=ColorMode.ANSI_16)
+
+
+def test_keywords_file(keywords: KeywordHighlighter) -> None:
+    dst = io.BytesIO()
+    keywords.highlight_file(io.BytesIO(b"she\nhis \xff"), dst, block_size=2)
+    assert dst.getvalue() == (
+        b"\x1b[34mshe\x1b[39m\n\x1b[31m\x1b[1mhis\x1b[22m\x1b[39m \xff"
+    )
@@ -0,0 +1,72 @@
+import subprocess
+import sys
+
+import pytest
+from helper import r
+
+import coloredstrings
+from coloredstrings import ColorMode, StyleBuilder, color_support
+
+
+def run(code: str) -> str:
+    return subprocess.check_output([sys.executable, "-c", code], text=True).strip()
+
+
+def test_import_does_not_detect_colors_or_build_styles() -> None:
+    code = (
+        "import sys, coloredstrings; "
+        "print('platform' in sys.modules, 'coloredstrings._named_colors' in sys.modules, "
+        "'red' in vars(coloredstrings), "
+        "coloredstrings.color_support._detected_mode)"
+    )
+    assert run(code) == "False False False None"
+
+
+def test_submodules_can_be_imported_from_the_package() -> None:
+    code = (
+        "from coloredstrings import minify, sgr; print(minify.__name__, sgr.__name__)"
+    )
+    assert run(code) == "coloredstrings.minify coloredstrings.sgr"
+
+
+def test_module_level_builders_are_created_once() -> None:
+    assert coloredstrings.red is coloredstrings.red
+    assert coloredstrings.gray == coloredstrings.style.bright_black
+    assert coloredstrings.color_mode(ColorMode.ANSI_16).red("x") == "\x1b[31mx\x1b[39m"
+
+
+def test_unknown_names_are_colors() -> None:
+    assert coloredstrings.pink.fg == StyleBuilder().pink.fg
+    with pytest.raises(AttributeError):
+        coloredstrings.__wrapped__  # noqa: B018
+
+
+def test_mode_is_detected_on_first_render(monkeypatch) -> None:
+    monkeypatch.setattr(color_support, "_detected_mode", None)
+    monkeypatch.setattr(
+        color_support, "detect_color_support", lambda stream: ColorMode.ANSI_16
+    )
+    builder = StyleBuilder().red
+    assert builder.mode is None
+    assert r(builder("x")) == r("\x1b[31mx\x1b[39m")
+    assert color_support._detected_mode == ColorMode.ANSI_16
+    assert builder.resolved_mode == ColorMode.ANSI_16
+
+
+def test_detection_after_reset(monkeypatch) -> None:
+    monkeypatch.setattr(color_support, "_detected_mode", None)
+    monkeypatch.setattr(sys, "argv", ["program"])
+    monkeypatch.delenv("NO_COLOR", raising=False)
+    monkeypatch.setenv("FORCE_COLOR", "0")
+    builder = StyleBuilder().red
+    assert builder("x") == "x"
+
+    # Detection is not repeated until it is reset
+    monkeypatch.setenv("FORCE_COLOR", "3")
+    assert builder("x") == "x"
+    assert builder.resolved_mode == ColorMode.NO_COLOR
+
+    color_support.reset_detected_mode()
+    assert r(builder("x")) == r("\x1b[31mx\x1b[39m")
+    assert builder.resolved_mode == ColorMode.TRUE_COLOR
+    assert builder.color_mode(ColorMode.ANSI_16).resolved_mode == ColorMode.ANSI_16
@@ -0,0 +1,94 @@
+import io
+import logging
+import sys
+
+import pytest
+from helper import r
+
+from coloredstrings import ColorMode, StyleBuilder
+from coloredstrings.log_formatter import ColoredFormatter, ColoredHandler
+
+
+@pytest.fixture
+def style() -> StyleBuilder:
+    return StyleBuilder(mode=ColorMode.ANSI_16)
+
+
+def make_record(level: int = logging.INFO, msg: str = "hello") -> logging.LogRecord:
+    return logging.LogRecord("app", level, __file__, 1, msg, None, None)
+
+
+def test_level_styles(style: StyleBuilder) -> None:
+    formatter = ColoredFormatter(
+        "%(levelname)s: %(message)s",
+        mode=ColorMode.ANSI_16,
+        level_styles={logging.INFO: style.green, logging.ERROR: style.red.bold},
+    )
+    assert r(formatter.format(make_record(logging.INFO))) == r(
+        "\x1b[32mINFO\x1b[39m: hello"
+    )
+    assert r(formatter.format(make_record(logging.ERROR))) == r(
+        "\x1b[31m\x1b[1mERROR\x1b[22m\x1b[39m: hello"
+    )
+
+
+def test_levels_without_style_use_closest_lower_level(style: StyleBuilder) -> None:
+    formatter = ColoredFormatter(
+        "%(levelname)s",
+        mode=ColorMode.ANSI_16,
+        level_styles={logging.INFO: style.green},
+    )
+    assert formatter.format(make_record(logging.WARNING)) == "\x1b[32mWARNING\x1b[39m"
+    assert formatter.format(make_record(logging.DEBUG)) == "DEBUG"
+
+
+@pytest.mark.parametrize(
+    "fmt, style_char",
+    [
+        ("%(name)-5s|%(levelname)s|%(message)s", "%"),
+        ("{name:<5}|{levelname}|{message}", "{"),
+        ("${name}|$levelname|$message", "$"),
+    ],
+)
+def test_field_styles(style: StyleBuilder, fmt: str, style_char: str) -> None:
+    formatter = ColoredFormatter(
+        fmt,
+        style=style_char,
+        mode=ColorMode.ANSI_16,
+        level_styles={logging.INFO: style.green},
+        field_styles={"name": style.blue},
+        level_fields=("levelname", "message"),
+    )
+    name = "app  " if style_char != "$" else "app"
+    assert r(formatter.format(make_record())) == r(
+        f"\x1b[34m{name}\x1b[39m|\x1b[32mINFO\x1b[39m|\x1b[32mhello\x1b[39m"
+    )
+
+
+def test_no_color_matches_plain_formatter() -> None:
+    fmt = "%(asctime)s %(levelname)s %(message)s"
+    record = make_record(logging.ERROR)
+    formatter = ColoredFormatter(fmt, mode=ColorMode.NO_COLOR)
+    assert formatter.format(record) == logging.Formatter(fmt).format(record)
+
+
+def test_exception_text_is_not_styled(style: StyleBuilder) -> None:
+    formatter = ColoredFormatter(
+        "%(levelname)s", mode=ColorMode.ANSI_16, level_styles={0: style.red}
+    )
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        record = logging.LogRecord(
+            "app", logging.ERROR, __file__, 1, "msg", None, sys.exc_info()
+        )
+    lines = formatter.format(record).splitlines()
+    assert lines[0] == "\x1b[31mERROR\x1b[39m"
+    assert lines[-1] == "RuntimeError: boom"
+
+
+def test_handler_detects_mode_on_its_stream() -> None:
+    stream = io.StringIO()
+    handler = ColoredHandler(stream, "%(levelname)s %(message)s")
+    handler.handle(make_record())
+    assert stream.getvalue() == "INFO hello\n"
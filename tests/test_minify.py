@@ -0,0 +1,83 @@
+import io
+
+import pytest
+from helper import r
+
+from coloredstrings import ColorMode, StyleBuilder
+from coloredstrings.minify import Minifier, minify, minify_file
+from coloredstrings.sgr import tokenize
+
+
+@pytest.fixture
+def style() -> StyleBuilder:
+    return StyleBuilder(mode=ColorMode.ANSI_16)
+
+
+def _rendered(text: str):
+    """Visible characters paired with the state they are rendered in."""
+    return [(ch, span.state) for span in tokenize(text) for ch in span.text]
+
+
+def test_nested_styles(style: StyleBuilder) -> None:
+    text = style.red(" a " + style.yellow(" b " + style.green(" c ") + " b ") + " a ")
+    assert r(minify(text)) == r(
+        "\x1b[31m a \x1b[33m b \x1b[32m c \x1b[33m b \x1b[31m a \x1b[0m"
+    )
+
+
+def test_sequences_are_merged(style: StyleBuilder) -> None:
+    assert r(minify(style.bold.red.on.blue("a\nb"))) == r(
+        "\x1b[1;31;44ma\x1b[0m\n\x1b[1;31;44mb\x1b[0m"
+    )
+
+
+def test_no_op_sequences_are_removed() -> None:
+    assert minify("\x1b[39m\x1b[31m\x1b[39mplain") == "plain"
+    assert minify("plain\x1b[0m") == "plain"
+
+
+def test_other_escapes_see_pending_state() -> None:
+    # Erasing uses the current background, so it must be applied before it
+    assert r(minify("\x1b[41m\x1b[2Kx\x1b[49m")) == r("\x1b[41m\x1b[2Kx\x1b[0m")
+
+
+def test_untracked_parameters_are_kept() -> None:
+    # Parts of underline colors are not taken for bold or blink
+    assert minify("\x1b[58;5;1m\x1b[4mx") == "\x1b[58;5;1m\x1b[4mx"
+    assert minify("\x1b[31m\x1b[58:2::1:2:3;1mx\x1b[39;59m") == (
+        "\x1b[31m\x1b[58:2::1:2:3;1mx\x1b[39;59m"
+    )
+    # Until the input resets the terminal, shorter transitions could reset them too
+    assert minify("\x1b[11mx\x1b[39m\x1b[31my\x1b[0m\x1b[1m\x1b[22mz") == (
+        "\x1b[11mx\x1b[39m\x1b[31my\x1b[0mz"
+    )
+
+
+def test_rendering_is_preserved(style: StyleBuilder) -> None:
+    text = (
+        style.red("a " + style.bold.italic("b " + style.dim("c")) + " d")
+        + style.rgb(1, 2, 3).on.color256(17).underline("e\r\nf")
+        + style.reset()
+        + "g"
+        + style.bold.dim.red("h")
+    )
+    result = minify(text)
+    assert len(result) < len(text)
+    assert _rendered(result) == _rendered(text)
+
+
+def test_chunks_and_stats(style: StyleBuilder) -> None:
+    text = style.red("é" + style.blue("b") + "c") * 3
+    minifier = Minifier()
+    out = "".join(minifier.feed(ch) for ch in text) + minifier.close()
+    assert out == minify(text)
+    assert minifier.bytes_in == len(text.encode())
+    assert minifier.bytes_out == len(out.encode())
+    assert minifier.saved == len(text.encode()) - len(out.encode())
+
+
+def test_minify_file(style: StyleBuilder) -> None:
+    src = io.StringIO(style.red("a" + style.blue("b")) + "\n")
+    dst = io.StringIO()
+    minify_file(src, dst, chunk_size=2)
+    assert dst.getvalue() == minify(src.getvalue())
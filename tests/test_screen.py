@@ -0,0 +1,173 @@
+import random
+import re
+import typing
+
+import pytest
+
+from coloredstrings import ColorMode, StyleBuilder, sgr
+from coloredstrings.screen import Screen
+
+_CONTROL = re.compile(r"\x1b\[([0-9;]*)([A-Za-z])|\r|\n|.", re.S)
+
+
+class Terminal:
+    """Just enough of a terminal to replay what screens render."""
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.cells = [[(" ", sgr.DEFAULT_STATE)] * width for _ in range(height)]
+        self.x = self.y = 0
+        self.state = sgr.DEFAULT_STATE
+
+    def feed(self, data: str) -> None:
+        for m in _CONTROL.finditer(data):
+            params, command = m.group(1), m.group(2)
+            n = [int(p) for p in params.split(";") if p] if params is not None else []
+            if command == "m":
+                self.state = self.state.apply(params)
+            elif command == "H":
+                self.y = (n[0] if n else 1) - 1
+                self.x = (n[1] if len(n) > 1 else 1) - 1
+            elif command in ("B", "C", "D"):
+                dx, dy = {"B": (0, 1), "C": (1, 0), "D": (-1, 0)}[command]
+                self.x += dx * (n[0] if n else 1)
+                self.y += dy * (n[0] if n else 1)
+            elif command == "J":
+                self.cells = [[(" ", self.state)] * self.width for _ in self.cells]
+            elif command == "K":
+                self.cells[self.y][self.x :] = [(" ", self.state)] * (
+                    self.width - self.x
+                )
+            elif m.group() == "\r":
+                self.x = 0
+            elif m.group() == "\n":
+                self.y += 1
+            else:
+                if self.x == self.width:
+                    # Wrap pending after the last column
+                    self.x, self.y = 0, self.y + 1
+                self.cells[self.y][self.x] = (m.group(), self.state)
+                self.x += 1
+            assert 0 <= self.y < self.height and 0 <= self.x <= self.width
+
+
+def expected(
+    screen: Screen,
+) -> typing.List[typing.List[typing.Tuple[str, sgr.SgrState]]]:
+    return [
+        [(c, screen._states[s]) for c, s in zip(chars, styles)]
+        for chars, styles in zip(screen._chars, screen._styles)
+    ]
+
+
+@pytest.fixture
+def style() -> StyleBuilder:
+    return StyleBuilder(mode=ColorMode.ANSI_16)
+
+
+def test_first_frame_clears(style: StyleBuilder) -> None:
+    screen = Screen(20, 2, ColorMode.ANSI_16)
+    screen.put(0, 0, "status:")
+    screen.put(8, 0, "OK", style.green.bold)
+    assert screen.render() == ("\x1b[0m\x1b[H\x1b[2Jstatus: \x1b[1;32mOK\x1b[0m")
+
+
+def test_only_changes_are_rendered(style: StyleBuilder) -> None:
+    screen = Screen(20, 3, ColorMode.ANSI_16)
+    screen.put(0, 0, "status:")
+    screen.put(8, 0, "OK", style.green.bold)
+    screen.render()
+    assert screen.render() == ""
+
+    screen.put(8, 0, "KO", style.red.bold)
+    assert screen.render() == "\x1b[1;9H\x1b[1;31mKO\x1b[0m"
+    screen.put(0, 2, "hi")
+    screen.put(5, 2, "x")
+    # Three unchanged blanks are cheaper to write again than to skip
+    assert screen.render() == "\x1b[3Hhi   x"
+
+
+def test_cleared_lines_are_erased(style: StyleBuilder) -> None:
+    screen = Screen(20, 2, ColorMode.ANSI_16)
+    screen.put(0, 0, "a long line of text", style.red)
+    screen.put(0, 1, "short")
+    screen.render()
+    screen.clear()
+    assert screen.render() == "\x1b[1H\x1b[K\r\n\x1b[K"
+
+
+def test_write_styled_text(style: StyleBuilder) -> None:
+    screen = Screen(10, 1, ColorMode.ANSI_16)
+    screen.write(0, 0, style.red("a") + " b " + style.blue.on.white("c"))
+    assert screen.render().endswith("\x1b[31ma\x1b[0m b \x1b[34;47mc\x1b[0m")
+    assert screen.style(style.red) == screen.style(sgr.state_after("\x1b[31m"))
+
+
+def test_styles_share_indices(style: StyleBuilder) -> None:
+    screen = Screen(10, 1, ColorMode.ANSI_16)
+    # Both are downsampled to the same 16 colors
+    assert screen.style(style.rgb(250, 0, 0)) == screen.style(style.bright_red)
+    assert screen.style(style.red) != screen.style(style.bright_red)
+    assert screen.style(StyleBuilder()) == 0
+
+
+def test_no_color() -> None:
+    screen = Screen(10, 1, ColorMode.NO_COLOR)
+    screen.put(0, 0, "plain", StyleBuilder().red.bold)
+    assert screen.render() == "\x1b[0m\x1b[H\x1b[2Jplain"
+
+
+def test_clipping(style: StyleBuilder) -> None:
+    screen = Screen(5, 2, ColorMode.ANSI_16)
+    screen.put(-2, 0, "abcdefgh")
+    screen.put(3, 1, "xyz")
+    screen.put(7, 1, "out")
+    screen.put(0, 2, "out")
+    screen.fill(3, -1, 10, 10, "#", style.red)
+    assert ["".join(row) for row in screen._chars] == ["cde##", "   ##"]
+
+
+def test_unknown_style() -> None:
+    with pytest.raises(ValueError):
+        Screen(5, 1).put(0, 0, "x", 1)
+
+
+def test_invalid_size() -> None:
+    with pytest.raises(ValueError):
+        Screen(0, 10)
+    with pytest.raises(ValueError):
+        Screen(10, 10).resize(10, 0)
+
+
+def test_resize_and_invalidate(style: StyleBuilder) -> None:
+    screen = Screen(6, 2, ColorMode.ANSI_16)
+    screen.put(0, 0, "abcdef")
+    screen.put(0, 1, "ghijkl")
+    screen.render()
+    screen.resize(4, 3)
+    assert ["".join(row) for row in screen._chars] == ["abcd", "ghij", "    "]
+    assert screen.render().startswith("\x1b[0m\x1b[H\x1b[2J")
+
+    screen.invalidate()
+    assert screen.render() == "\x1b[0m\x1b[H\x1b[2Jabcd\r\nghij"
+
+
+def test_frames_replay(style: StyleBuilder) -> None:
+    rng = random.Random(0)
+    screen = Screen(30, 8, ColorMode.ANSI_16)
+    terminal = Terminal(30, 8)
+    styles = [None, style.red, style.bold, style.blue.on.white, style.red.dim]
+    for frame in range(200):
+        if frame % 50 == 49:
+            screen.clear()
+        for _ in range(rng.randrange(1, 6)):
+            screen.put(
+                rng.randrange(-3, 30),
+                rng.randrange(8),
+                "".join(rng.choice("ab  ") for _ in range(rng.randrange(1, 12))),
+                rng.choice(styles),
+            )
+        terminal.feed(screen.render())
+        assert terminal.cells == expected(screen)
+        assert terminal.state.is_default
@@ -0,0 +1,175 @@
+import pytest
+
+from coloredstrings import ColorMode, StyleBuilder
+from coloredstrings.sgr import (
+    DEFAULT_STATE,
+    SgrState,
+    SgrTokenizer,
+    Span,
+    is_tracked,
+    state_after,
+    tokenize,
+    transition,
+)
+from coloredstrings.types import Ansi16Color, Attribute, Extended256, Rgb
+
+
+@pytest.fixture
+def style() -> StyleBuilder:
+    return StyleBuilder(mode=ColorMode.TRUE_COLOR)
+
+
+@pytest.mark.parametrize(
+    "params, expected",
+    [
+        ("31", SgrState(fg=Ansi16Color.RED)),
+        ("101", SgrState(bg=Ansi16Color.BRIGHT_RED)),
+        ("1;4", SgrState(attrs=frozenset({Attribute.BOLD, Attribute.UNDERLINE}))),
+        ("38;5;208", SgrState(fg=Extended256(208))),
+        ("48;2;1;2;3", SgrState(bg=Rgb(1, 2, 3))),
+        ("38:2::1:2:3", SgrState(fg=Rgb(1, 2, 3))),
+        ("38:5:17", SgrState(fg=Extended256(17))),
+        ("", DEFAULT_STATE),
+        # malformed extended colors are ignored
+        ("38;5;300", DEFAULT_STATE),
+        ("38;2;1", DEFAULT_STATE),
+        # underline colors are not tracked, and their parts are not other codes
+        ("58;5;1;4", SgrState(attrs=frozenset({Attribute.UNDERLINE}))),
+        ("58;2;1;3;9", DEFAULT_STATE),
+        ("58:5:1", DEFAULT_STATE),
+    ],
+)
+def test_apply(params: str, expected: SgrState) -> None:
+    assert DEFAULT_STATE.apply(params) == expected
+
+
+@pytest.mark.parametrize(
+    "params, expected",
+    [
+        ("", True),
+        ("0;1;31;48;5;17", True),
+        ("38:2::1:2:3", True),
+        ("58;5;1", False),
+        ("4;58:2::1:2:3", False),
+        ("59", False),
+        ("11", False),
+        ("38;5;300", False),
+    ],
+)
+def test_is_tracked(params: str, expected: bool) -> None:
+    assert is_tracked(params) is expected
+
+
+def test_apply_off_codes() -> None:
+    state = DEFAULT_STATE.apply("1;2;3;31;44")
+    assert state.apply("22").attrs == frozenset({Attribute.ITALIC})
+    assert state.apply("39").fg is None
+    assert state.apply("49").bg is None
+    assert state.apply("0") == DEFAULT_STATE
+    assert state.apply("39;49;22;23") == DEFAULT_STATE
+
+
+def test_apply_returns_same_state_when_unchanged() -> None:
+    state = SgrState(fg=Ansi16Color.RED)
+    assert state.apply("31") is state
+
+
+def test_layer() -> None:
+    below = SgrState(
+        fg=Ansi16Color.RED, bg=Ansi16Color.BLACK, attrs=frozenset({Attribute.BOLD})
+    )
+    above = SgrState(fg=Ansi16Color.BLUE, attrs=frozenset({Attribute.ITALIC}))
+    assert below.layer(above) == SgrState(
+        fg=Ansi16Color.BLUE,
+        bg=Ansi16Color.BLACK,
+        attrs=frozenset({Attribute.BOLD, Attribute.ITALIC}),
+    )
+    assert DEFAULT_STATE.layer(above) is above
+
+
+def test_state_after(style: StyleBuilder) -> None:
+    assert state_after(style.bold.red("x")) == DEFAULT_STATE
+    assert state_after(style.bold.red.code_pair().start) == DEFAULT_STATE.apply("1;31")
+    assert state_after("\x1b[4mx", DEFAULT_STATE.apply("1")) == DEFAULT_STATE.apply(
+        "1;4"
+    )
+
+
+def test_sequence_round_trip() -> None:
+    state = DEFAULT_STATE.apply("1;38;2;10;20;30;48;5;17")
+    assert state.sequence() == "\x1b[1;38;2;10;20;30;48;5;17m"
+    assert DEFAULT_STATE.apply(state.sequence()[2:-1]) == state
+    assert DEFAULT_STATE.sequence() == ""
+
+
+def test_tokenize_styled_text(style: StyleBuilder) -> None:
+    text = (
+        "a "
+        + style.red("b " + style.bold("c"))
+        + style.rgb(1, 2, 3).on.color256(7)("d")
+    )
+    assert [(s.text, s.fg, s.bg, s.attrs) for s in tokenize(text)] == [
+        ("a ", None, None, frozenset()),
+        ("b ", Ansi16Color.RED, None, frozenset()),
+        ("c", Ansi16Color.RED, None, frozenset({Attribute.BOLD})),
+        ("d", Rgb(1, 2, 3), Extended256(7), frozenset()),
+    ]
+
+
+def test_tokenize_drops_other_escapes() -> None:
+    assert list(tokenize("a\x1b[2Kb\x1bKc")) == [Span("abc", DEFAULT_STATE)]
+
+
+def _merged(spans):
+    result = []
+    for span in spans:
+        if result and result[-1][1] == span.state:
+            result[-1] = (result[-1][0] + span.text, span.state)
+        else:
+            result.append((span.text, span.state))
+    return result
+
+
+def test_tokenize_chunks_split_escape_sequences(style: StyleBuilder) -> None:
+    text = style.red("hello") + " " + style.on.rgb(100, 150, 200).italic("world")
+    expected = _merged(tokenize(text))
+    for size in range(1, 8):
+        chunks = [text[i : i + size] for i in range(0, len(text), size)]
+        assert _merged(tokenize(chunks)) == expected
+
+
+def test_tokenizer_keeps_state_between_feeds() -> None:
+    tokenizer = SgrTokenizer()
+    assert list(tokenizer.feed("\x1b[3")) == []
+    assert list(tokenizer.feed("1mred")) == [Span("red", SgrState(fg=Ansi16Color.RED))]
+    assert tokenizer.state == SgrState(fg=Ansi16Color.RED)
+
+
+def test_incomplete_escape_is_flushed_as_text_on_close() -> None:
+    tokenizer = SgrTokenizer()
+    assert list(tokenizer.feed("tail\x1b[")) == [Span("tail", DEFAULT_STATE)]
+    assert list(tokenizer.close()) == [Span("\x1b[", DEFAULT_STATE)]
+
+
+@pytest.mark.parametrize(
+    "old, new, expected",
+    [
+        ("31", "31", ""),
+        ("31", "", "\x1b[0m"),
+        ("31", "32", "\x1b[32m"),
+        ("", "1;31", "\x1b[1;31m"),
+        ("1;31", "31", "\x1b[22m"),
+        # 22 turns off both bold and dim, so dim is turned on again
+        ("1;2;31", "2;31", "\x1b[22;2m"),
+        # resetting is shorter than turning everything off one by one
+        ("1;3;4;31;44", "9", "\x1b[0;9m"),
+        ("31;44", "38;5;208;44", "\x1b[38;5;208m"),
+    ],
+)
+def test_transition(old: str, new: str, expected: str) -> None:
+    old_state = DEFAULT_STATE.apply(old)
+    new_state = DEFAULT_STATE.apply(new)
+    sequence = transition(old_state, new_state)
+    assert sequence == expected
+    if sequence:
+        assert old_state.apply(sequence[2:-1]) == new_state
@@ -0,0 +1,61 @@
+import typing
+
+import pytest
+
+from coloredstrings import ColorMode, StyleBuilder, stats
+
+
+@pytest.fixture(autouse=True)
+def clean_stats() -> typing.Iterator[None]:
+    stats.reset()
+    yield
+    stats.disable()
+    stats.reset()
+
+
+def test_disabled_by_default() -> None:
+    StyleBuilder(mode=ColorMode.ANSI_16).red("text")
+    snapshot = stats.snapshot()
+    assert snapshot["enabled"] is False
+    assert snapshot["stylize_calls"] == 0
+
+
+def test_counts_rendered_text() -> None:
+    stats.enable()
+    style = StyleBuilder(mode=ColorMode.ANSI_16)
+    style.red("abcd")
+    style.blue("ef", mode=ColorMode.NO_COLOR)
+
+    snapshot = stats.snapshot()
+    assert snapshot["stylize_calls"] == 2
+    assert snapshot["chars_in"] == 6
+    # "\x1b[31m" and "\x1b[39m" around the first text
+    assert snapshot["chars_out"] == 16
+    assert snapshot["overhead_ratio"] == pytest.approx(10 / 6)
+    assert snapshot["time_seconds"] > 0
+
+
+def test_cache_hit_rates() -> None:
+    stats.enable()
+    # Separate builders, as a builder keeps its own codes after the first render
+    StyleBuilder(mode=ColorMode.TRUE_COLOR).rgb(1, 2, 254)("a")
+    StyleBuilder(mode=ColorMode.TRUE_COLOR).rgb(1, 2, 254)("b")
+
+    cache = stats.snapshot()["caches"]["stylize.code_pair"]
+    assert cache["hits"] >= 1
+    assert cache["hits"] + cache["misses"] == 2
+    assert 0 < cache["hit_rate"] <= 1
+    assert cache["size"] <= cache["maxsize"]
+
+
+def test_reset_and_disable() -> None:
+    stats.enable()
+    StyleBuilder(mode=ColorMode.ANSI_16).red("text")
+    stats.disable()
+    StyleBuilder(mode=ColorMode.ANSI_16).red("text")
+    assert stats.snapshot()["stylize_calls"] == 1
+
+    stats.reset()
+    snapshot = stats.snapshot()
+    assert snapshot["stylize_calls"] == snapshot["chars_out"] == 0
+    assert all(c["hits"] == c["misses"] == 0 for c in snapshot["caches"].values())
@@ -0,0 +1,128 @@
+import copy
+import pickle
+
+import pytest
+from helper import r
+
+from coloredstrings import ColorMode, StyleBuilder
+
+
+@pytest.fixture
+def style() -> StyleBuilder:
+    return StyleBuilder(mode=ColorMode.ANSI_16)
+
+
+def test_code_pair(style: StyleBuilder) -> None:
+    pair = style.red.on.blue.bold.code_pair()
+    assert r(pair.start) == r("\x1b[31m\x1b[44m\x1b[1m")
+    assert r(pair.end) == r("\x1b[22m\x1b[49m\x1b[39m")
+    assert pair.start + "text" + pair.end == style.red.on.blue.bold("text")
+
+
+def test_code_pair_without_colors(style: StyleBuilder) -> None:
+    pair = style.red.code_pair(ColorMode.NO_COLOR)
+    assert pair.start == pair.end == ""
+
+
+def test_render_pair(style: StyleBuilder) -> None:
+    styled, plain = style.red.render_pair("a", style.bold("b"), 1)
+    assert r(styled) == r(style.red("a", style.bold("b"), 1))
+    assert plain == "a b 1"
+
+
+def test_render_pair_without_colors(style: StyleBuilder) -> None:
+    assert style.red.render_pair("a", mode=ColorMode.NO_COLOR) == ("a", "a")
+
+
+def test_render_pair_visible(style: StyleBuilder) -> None:
+    assert style.visible.render_pair("a") == ("a", "")
+    # Unlike `strip_ansi` of the styled form, which keeps the text
+    styled, plain = style.red.visible.render_pair("a")
+    assert r(styled) == r("\x1b[31ma\x1b[39m")
+    assert plain == ""
+    assert style.visible.render_pair("a", mode=ColorMode.NO_COLOR) == ("", "")
+
+
+@pytest.mark.parametrize(
+    "builder",
+    [
+        StyleBuilder(mode=ColorMode.ANSI_16),
+        StyleBuilder(mode=ColorMode.ANSI_16).red.on.bright_white.bold.italic,
+        StyleBuilder(mode=ColorMode.EXTENDED_256).color256(200).on,
+        StyleBuilder(mode=ColorMode.TRUE_COLOR).rgb(255, 0, 128).on.rgb(1, 2, 3),
+        StyleBuilder(mode=ColorMode.NO_COLOR).visible.strike,
+    ],
+)
+def test_pickle_round_trip(builder: StyleBuilder) -> None:
+    assert pickle.loads(pickle.dumps(builder)) == builder
+    assert copy.deepcopy(builder) == builder
+
+
+def test_pickle_shares_extensions(style: StyleBuilder) -> None:
+    extended = style.extend(primary="blue", shout=style.red.bold)
+    builders = [extended.red, extended.green.underline]
+    restored = pickle.loads(pickle.dumps(builders))
+    assert restored == builders
+    assert restored[0].extensions is restored[1].extensions
+    assert r(restored[1].shout("hey")) == r(style.red.bold("hey"))
+
+
+def test_pickle_is_compact(style: StyleBuilder) -> None:
+    assert len(pickle.dumps(style.red.on.blue.bold)) < 100
+
+
+def test_or(style: StyleBuilder) -> None:
+    combined = style.bold | style.white.on.blue
+    assert combined == style.bold.white.on.blue
+    assert r(combined("x")) == r(style.white.on.blue.bold("x"))
+
+
+def test_or_right_colors_win(style: StyleBuilder) -> None:
+    assert (style.red.on.green | style.blue).fg == style.blue.fg
+    assert (style.red.on.green | style.blue).bg == style.on.green.bg
+    assert (style.red.italic | style.underline) == style.red.italic.underline
+
+
+def test_or_mode_and_flags(style: StyleBuilder) -> None:
+    plain = StyleBuilder()
+    assert (style.red | plain.bold).mode == ColorMode.ANSI_16
+    assert (
+        plain.red | style.bold.color_mode(ColorMode.NO_COLOR)
+    ).mode == ColorMode.NO_COLOR
+    assert (style.on | style.red).next_color_for_bg is False
+    assert (style.red | style.visible).only_visible_if_colors_enabled
+
+
+def test_or_extensions(style: StyleBuilder) -> None:
+    left = style.extend(primary="red", shared="blue")
+    right = style.extend(shared="green")
+    assert dict((left | right).extensions) == {"primary": "red", "shared": "green"}
+    assert (left | style.bold).extensions is left.extensions
+    assert (style.bold | right).extensions is right.extensions
+
+
+def test_or_other_types(style: StyleBuilder) -> None:
+    with pytest.raises(TypeError):
+        style.red | "bold"  # noqa: B018
+
+
+def test_code_pair_by_mode() -> None:
+    styled = StyleBuilder().rgb(255, 105, 180).on.color256(236)
+    assert styled.code_pair(ColorMode.TRUE_COLOR).start == (
+        "\x1b[38;2;255;105;180m\x1b[48;5;236m"
+    )
+    assert (
+        styled.code_pair(ColorMode.EXTENDED_256).start == "\x1b[38;5;212m\x1b[48;5;236m"
+    )
+    assert styled.code_pair(ColorMode.ANSI_16).start == "\x1b[95m\x1b[40m"
+    assert styled("x", mode=ColorMode.ANSI_16) == "\x1b[95m\x1b[40mx\x1b[49m\x1b[39m"
+
+
+def test_codes_shared_by_mode_changes(style: StyleBuilder) -> None:
+    styled = style.red.bold
+    styled("x", mode=ColorMode.TRUE_COLOR)
+    assert styled.color_mode(ColorMode.TRUE_COLOR)._codes is styled._codes
+    assert styled.visible._codes is styled._codes
+    assert styled.on._codes is styled._codes
+    assert styled.on.blue._codes is not styled._codes
+    assert styled.on.blue("x", mode=ColorMode.TRUE_COLOR).startswith("\x1b[31m\x1b[44m")
@@ -0,0 +1,186 @@
+import datetime
+
+import pytest
+
+import coloredstrings
+from coloredstrings import ColorMode, Formatter, StyleBuilder, utils
+from coloredstrings.templates import compile_markup
+
+
+@pytest.fixture
+def style() -> StyleBuilder:
+    return StyleBuilder(mode=ColorMode.ANSI_16)
+
+
+def test_markup(style: StyleBuilder) -> None:
+    assert (
+        style.markup("[bold red]ERROR[/] [dim]{path}[/]", path="/etc")
+        == "\x1b[1;31mERROR\x1b[0m \x1b[2m/etc\x1b[0m"
+    )
+
+
+def test_markup_fields(style: StyleBuilder) -> None:
+    assert style.markup("{} {!r} {:>3} {.real}", 1, "a", 2, 3) == "1 'a'   2 3"
+    assert style.markup("{x[0]} {{braces}}", x=[5]) == "5 {braces}"
+    assert style.markup("{:{width}}|", "a", width=3) == "a  |"
+
+
+def test_markup_nested_tags_layer(style: StyleBuilder) -> None:
+    assert (
+        style.markup("[red on black]a [bold blue]b[/] c[/]")
+        == "\x1b[31;40ma \x1b[1;34mb\x1b[22;31m c\x1b[0m"
+    )
+
+
+def test_markup_close_by_name(style: StyleBuilder) -> None:
+    assert (
+        style.markup("[red]a [bold]b[/red] c") == "\x1b[31ma \x1b[1mb\x1b[39m c\x1b[0m"
+    )
+
+
+def test_markup_unclosed_tags_are_closed(style: StyleBuilder) -> None:
+    assert style.markup("[green]ok") == "\x1b[32mok\x1b[0m"
+
+
+def test_markup_escaped_bracket(style: StyleBuilder) -> None:
+    assert style.markup(r"\[red] [red]x[/]") == "[red] \x1b[31mx\x1b[0m"
+
+
+def test_markup_colors_and_extensions(style: StyleBuilder) -> None:
+    themed = style.color_mode(ColorMode.TRUE_COLOR).extend(primary=(1, 2, 3))
+    assert (
+        themed.markup("[primary]a[/] [rgb(4, 5, 6)]b[/] [color256(7)]c[/] [#0a0b0c]d")
+        == "\x1b[38;2;1;2;3ma\x1b[0m \x1b[38;2;4;5;6mb\x1b[0m "
+        "\x1b[38;5;7mc\x1b[0m \x1b[38;2;10;11;12md\x1b[0m"
+    )
+
+
+def test_markup_builder_style_is_the_base(style: StyleBuilder) -> None:
+    assert style.red.markup("a [bold]b") == "\x1b[31ma \x1b[1mb\x1b[0m"
+
+
+def test_markup_values_are_not_markup(style: StyleBuilder) -> None:
+    assert style.markup("[red]{}", "[bold]x") == "\x1b[31m[bold]x\x1b[0m"
+
+
+def test_markup_restores_style_after_styled_values(style: StyleBuilder) -> None:
+    assert (
+        style.markup("[red]<{}>[/]", style.blue("v"))
+        == "\x1b[31m<\x1b[34mv\x1b[39m\x1b[31m>\x1b[0m"
+    )
+
+
+def test_markup_no_color(style: StyleBuilder) -> None:
+    no_color = style.color_mode(ColorMode.NO_COLOR)
+    assert no_color.markup("[bold red]ERROR[/] {}", 1) == "ERROR 1"
+
+
+@pytest.mark.parametrize(
+    "template, message",
+    [
+        ("[INFO] x", "Invalid markup tag '\\[INFO\\]'"),
+        ("[/] x", "closes no open tag"),
+        ("[red]x[/blue]", "closes no open tag"),
+        ("{} {0}", "cannot switch"),
+        ("{0} {}", "cannot switch"),
+    ],
+)
+def test_markup_errors(style: StyleBuilder, template: str, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        style.markup(template, 1, 2)
+
+
+def test_compiled_templates_are_cached(style: StyleBuilder) -> None:
+    compiled = compile_markup("[red]{}[/]", style)
+    assert compile_markup("[red]{}[/]", style) is compiled
+    assert compile_markup("[red]{}[/]", style, ColorMode.NO_COLOR) is not compiled
+    assert compiled.format(1) == "\x1b[31m1\x1b[0m"
+    assert "templates.markup" in utils._CACHES
+
+
+def test_module_level_markup() -> None:
+    assert coloredstrings.markup("[red]x") == coloredstrings.style.markup("[red]x")
+
+
+@pytest.fixture
+def formatter(style: StyleBuilder) -> Formatter:
+    return Formatter(style)
+
+
+def test_formatter(formatter: Formatter) -> None:
+    assert (
+        formatter.format("{user:red.bold} {n:>4:green} {{}}", user="bob", n=3)
+        == "\x1b[31m\x1b[1mbob\x1b[22m\x1b[39m \x1b[32m   3\x1b[39m {}"
+    )
+
+
+@pytest.mark.parametrize(
+    "template, expected",
+    [
+        ("{:>4}", "   1"),
+        ("{:.2f}", "1.00"),
+        ("{:x}", "1"),
+        ("{:>{width}}", "  1"),
+        ("{0:on.blue}", "\x1b[44m1\x1b[49m"),
+        ("{:>2:rgb(1, 2, 3)}", "\x1b[30m 1\x1b[39m"),
+    ],
+)
+def test_formatter_specs(formatter: Formatter, template: str, expected: str) -> None:
+    assert formatter.format(template, 1, width=3) == expected
+
+
+def test_formatter_keeps_colons_of_format_specs(formatter: Formatter) -> None:
+    assert formatter.format("{:%H:%M}", datetime.time(1, 2)) == "01:02"
+    assert formatter.format("{:%H:%M:red}", datetime.time(1, 2)) == (
+        "\x1b[31m01:02\x1b[39m"
+    )
+
+
+@pytest.mark.parametrize("mode", list(ColorMode))
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("10d", "         5"),
+        ("02d", "05"),
+        ("08b", "00000101"),
+        ("010", "0000000005"),
+        ("100", " " * 99 + "5"),
+    ],
+)
+def test_formatter_specs_looking_like_hex_colors(
+    style: StyleBuilder, mode: ColorMode, spec: str, expected: str
+) -> None:
+    formatter = Formatter(style.color_mode(mode))
+    assert formatter.format(f"{{:{spec}}}", 5) == expected
+    assert formatter.format_field(5, spec) == expected
+    # After a colon, it is a style
+    assert formatter.format("{:1:100}", 5) == StyleBuilder(mode=mode).rgb("#100")("5")
+
+
+def test_formatter_styled_values(formatter: Formatter, style: StyleBuilder) -> None:
+    assert formatter.format("{:red}", style.blue("a") + "b") == style.red(
+        style.blue("a") + "b"
+    )
+    assert formatter.format("{:red}", "a\nb") == style.red("a\nb")
+
+
+def test_formatter_extensions_and_mode(style: StyleBuilder) -> None:
+    formatter = Formatter(style.extend(primary=style.blue.bold))
+    assert formatter.format("{:primary}", 1) == "\x1b[34m\x1b[1m1\x1b[22m\x1b[39m"
+    no_color = Formatter(style.color_mode(ColorMode.NO_COLOR))
+    assert no_color.format("{:red} {:red.visible}", 1, 2) == "1 "
+
+
+def test_formatter_subclass_hooks(style: StyleBuilder) -> None:
+    class Upper(Formatter):
+        def convert_field(self, value, conversion):
+            return str(value).upper()
+
+    assert Upper(style).format("{:red}", "a") == "\x1b[31mA\x1b[39m"
+
+
+def test_formatter_caches_templates(formatter: Formatter) -> None:
+    formatter.format("{:red}", 1)
+    compiled = formatter._templates["{:red}", ColorMode.ANSI_16]
+    formatter.format("{:red}", 2)
+    assert formatter._templates["{:red}", ColorMode.ANSI_16] is compiled
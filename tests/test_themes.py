@@ -0,0 +1,108 @@
+import json
+import os
+
+import pytest
+from helper import r
+
+from coloredstrings import ColorMode, StyleBuilder
+from coloredstrings.themes import Theme, ThemeStyle, load_theme, parse_style
+
+
+@pytest.fixture
+def style() -> StyleBuilder:
+    return StyleBuilder(mode=ColorMode.TRUE_COLOR)
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("bold red", lambda s: s.bold.red),
+        ("white on red", lambda s: s.white.on.red),
+        ("yellow on #202020", lambda s: s.yellow.on.rgb("#202020")),
+        ("underline rgb(120, 200, 255)", lambda s: s.underline.rgb(120, 200, 255)),
+        ("dim color256(245)", lambda s: s.dim.color256(245)),
+        ("  pink   italic ", lambda s: s.pink.italic),
+    ],
+)
+def test_parse_style(style: StyleBuilder, spec: str, expected) -> None:
+    assert parse_style(spec) == expected(style)
+
+
+@pytest.mark.parametrize(
+    "spec", ["", "bold nonsense", "rgb(1, 2)", "extend", "code_pair", "foo(1)"]
+)
+def test_parse_invalid_style(spec: str) -> None:
+    with pytest.raises(ValueError):
+        parse_style(spec)
+
+
+def test_theme_renders_in_every_mode(style: StyleBuilder) -> None:
+    theme = Theme({"error": "bold red", "path": style.rgb(255, 0, 0)})
+    for mode in ColorMode:
+        assert r(theme.error("x", mode=mode)) == r(style.bold.red("x", mode=mode))
+        assert r(theme["path"]("x", mode=mode)) == r(
+            style.rgb(255, 0, 0)("x", mode=mode)
+        )
+
+
+def test_theme_mode() -> None:
+    theme = Theme({"error": "red"}, mode=ColorMode.ANSI_16)
+    assert theme.error("x") == "\x1b[31mx\x1b[39m"
+    assert theme.color_mode(ColorMode.NO_COLOR).error("x") == "x"
+
+
+def test_nested_and_multiline_text_is_balanced(style: StyleBuilder) -> None:
+    theme = Theme({"error": "red"}, mode=ColorMode.ANSI_16)
+    text = "a\n" + style.blue("b", mode=ColorMode.ANSI_16)
+    assert r(theme.error(text)) == r(style.red(text, mode=ColorMode.ANSI_16))
+
+
+def test_theme_is_a_mapping() -> None:
+    theme = Theme({"error": "red", "keys": "blue"})
+    assert list(theme) == ["error", "keys"]
+    assert len(theme) == 2
+    assert isinstance(theme["keys"], ThemeStyle)
+    with pytest.raises(AttributeError):
+        theme.missing  # noqa: B018
+
+
+def test_load_json_theme_with_cache(tmp_path) -> None:
+    source = tmp_path / "theme.json"
+    source.write_text(json.dumps({"error": "bold red", "muted": "dim"}))
+    cache = tmp_path / "theme.cache"
+
+    theme = load_theme(source, cache=cache, mode=ColorMode.ANSI_16)
+    assert cache.exists()
+    cached = load_theme(source, cache=cache, mode=ColorMode.ANSI_16)
+    assert dict(cached) == dict(theme)
+    assert cached.error("x") == theme.error("x")
+
+    # An outdated cache is rebuilt
+    source.write_text(json.dumps({"error": "blue"}))
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_theme(source, cache=cache, mode=ColorMode.ANSI_16).error("x") == (
+        "\x1b[34mx\x1b[39m"
+    )
+
+
+def test_load_cache_rejects_missing_or_broken_files(tmp_path) -> None:
+    assert Theme.load_cache(tmp_path / "missing") is None
+    (tmp_path / "broken").write_text("{")
+    assert Theme.load_cache(tmp_path / "broken") is None
+
+
+def test_load_toml_theme(tmp_path) -> None:
+    pytest.importorskip("tomllib")
+    source = tmp_path / "theme.toml"
+    source.write_text('error = "bold red"\n')
+    assert load_theme(source, mode=ColorMode.ANSI_16).error("x") == (
+        StyleBuilder(mode=ColorMode.ANSI_16).bold.red("x")
+    )
+
+
+def test_load_invalid_theme(tmp_path) -> None:
+    source = tmp_path / "theme.json"
+    source.write_text(json.dumps({"error": {"fg": "red"}}))
+    with pytest.raises(ValueError):
+        load_theme(source)
@@ -1,6 +1,9 @@
+import random
+import threading
+
 import pytest
 
-from coloredstrings import utils
+from coloredstrings import types, utils
 
 
 @pytest.mark.parametrize(
@@ -47,3 +50,78 @@ def test_multiple_mixed_sequences_removed_completely():
 
 def test_strip_ansi_accepts_empty_string():
     assert utils.strip_ansi("") == ""
+
+
+def _nearest_by_scan(r: int, g: int, b: int) -> str:
+    return min(
+        utils._NAMED_COLORS,
+        key=lambda name: sum(
+            (x - y) ** 2 for x, y in zip(utils._NAMED_COLORS[name], (r, g, b))
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    "rgb, expected",
+    [
+        ((255, 0, 0), "red"),
+        # aliases are reported by their first name
+        ((0, 255, 255), "aqua"),
+        ((128, 128, 128), "gray"),
+        (types.Rgb(250, 1, 2), "red"),
+        ((254, 105, 181), "hotpink"),
+        # out of range components are clamped
+        ((300, -5, -5), "red"),
+    ],
+)
+def test_nearest_named_color(rgb, expected: str) -> None:
+    assert utils.nearest_named_color(rgb) == expected
+
+
+def test_nearest_named_color_index_is_built_once(monkeypatch) -> None:
+    monkeypatch.setattr(utils, "_named_color_by_rgb", None)
+    monkeypatch.setattr(utils, "_named_color_grid", None)
+    builds = []
+    build = utils._named_color_index
+
+    def counting_build():
+        builds.append(1)
+        return build()
+
+    monkeypatch.setattr(utils, "_named_color_index", counting_build)
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(utils.nearest_named_color((1, 2, 3)))
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["black"] * 8
+    assert len(builds) == 1
+
+
+def test_concurrent_cache() -> None:
+    cache = utils._ConcurrentCache("test", maxsize=2)
+    assert utils._CACHES["test"] is cache
+    assert cache.get("a") is None
+    assert cache.put("a", 1) == 1
+    # The first stored value wins
+    assert cache.put("a", 2) == 1
+    cache.put("b", 2)
+    # A full cache is cleared before storing
+    cache.put("c", 3)
+    assert len(cache) == 1
+    assert cache.get("c") == 3
+    del utils._CACHES["test"]
+
+
+def test_nearest_named_color_matches_linear_scan() -> None:
+    rng = random.Random(0)
+    for _ in range(500):
+        rgb = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        assert utils.nearest_named_color(rgb) == _nearest_by_scan(*rgb)